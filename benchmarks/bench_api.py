@@ -0,0 +1,137 @@
+"""Ritual API throughput and latency on keep-alive connections.
+
+Starts ``python -m lbrp_engine serve`` on a free local port and drives it
+with an asyncio client: ``connections`` keep-alive connections each issue
+requests back to back for ``seconds``. Targets are drawn from single steps,
+step ranges, whole sequences and the index; about half ask for gzip, and
+``revalidate`` of them send the ETag of an earlier response in
+``If-None-Match`` the way a browser cache would. The client runs on the same
+machine, so the figures include its own cost.
+
+Usage:
+    python benchmarks/bench_api.py [--connections N] [--seconds S] [--revalidate FRACTION]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lbrp_engine.simulator import RITUAL_TYPES, get_step_catalog  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _targets() -> list:
+    targets = ["/rituals"]
+    for ritual_type in RITUAL_TYPES:
+        total = len(get_step_catalog(ritual_type))
+        targets.append(f"/rituals/{ritual_type}")
+        targets += [f"/rituals/{ritual_type}/steps/{index}" for index in range(total)]
+        targets += [f"/rituals/{ritual_type}/steps?start={start}&stop={start + 5}" for start in range(0, total, 5)]
+    return targets
+
+
+async def _read_response(reader: asyncio.StreamReader):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split(" ")[1])
+    headers = dict(line.split(": ", 1) for line in head[1:] if line)
+    body = await reader.readexactly(int(headers.get("Content-Length", 0)))
+    return status, headers, body
+
+
+async def _client(port: int, targets: list, deadline: float, revalidate: float, rng: random.Random,
+                  latencies: list, statuses: dict, etags: dict) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            target = rng.choice(targets)
+            gzipped = rng.random() < 0.5
+            headers = "Accept-Encoding: gzip\r\n" if gzipped else ""
+            etag = etags.get((target, gzipped))
+            if etag and rng.random() < revalidate:
+                headers += f"If-None-Match: {etag}\r\n"
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode("latin-1"))
+            status, response_headers, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if "ETag" in response_headers:
+                etags[(target, gzipped)] = response_headers["ETag"]
+    finally:
+        writer.close()
+
+
+async def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def _run(port: int, connections: int, seconds: float, revalidate: float) -> dict:
+    await _wait_ready(port)
+    targets = _targets()
+    latencies, statuses, etags = [], {}, {}
+    rng = random.Random(5)
+    # Prime the ETags so revalidation has something to send from the start
+    await _client(port, targets, time.perf_counter() + 0.5, 0.0, rng, [], {}, etags)
+    start = time.perf_counter()
+    deadline = start + seconds
+    await asyncio.gather(*(
+        _client(port, targets, deadline, revalidate, random.Random(n), latencies, statuses, etags)
+        for n in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {"requests": len(latencies), "seconds": elapsed, "statuses": statuses,
+            "p50_ms": statistics.median(latencies) * 1e3, "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=32, help="Keep-alive connections")
+    parser.add_argument("--seconds", type=float, default=5.0, help="How long to send requests")
+    parser.add_argument("--revalidate", type=float, default=0.5,
+                        help="Share of requests revalidating an earlier ETag")
+    args = parser.parse_args(argv)
+    connections, seconds, revalidate = args.connections, args.seconds, args.revalidate
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "lbrp_engine", "serve", "--port", str(port)],
+        cwd=ROOT, stderr=subprocess.DEVNULL
+    )
+    try:
+        result = asyncio.run(_run(port, connections, seconds, revalidate))
+    finally:
+        server.terminate()
+        server.wait()
+
+    requests = result["requests"]
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(result["statuses"].items()))
+    print(f"{connections} keep-alive connections for {result['seconds']:.1f} s, revalidating {revalidate:.0%}")
+    print(f"{requests} requests, {requests / result['seconds']:.0f} req/s "
+          f"(server and client sharing {os.cpu_count()} CPU)")
+    print(f"latency p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    print(f"statuses: {statuses}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
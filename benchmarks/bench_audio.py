@@ -0,0 +1,85 @@
+"""Vibration audio: synthesis time and memory with and without the shared cache.
+
+Synthesizes every distinct tone of every ritual once (cold), then simulates
+``sessions`` sessions each playing every vibration step. "per-session" has
+each session synthesize and hold its own WAV; "cached" takes the shared
+buffer from ``render_tone``. Heap retained by the sessions is measured with
+``tracemalloc``; the cached buffers are also handed to Streamlit's in-memory
+media storage, which must keep one file per tone rather than one per session.
+
+Usage:
+    python benchmarks/bench_audio.py [--sessions N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lbrp_engine import audio  # noqa: E402
+from lbrp_engine.simulator import RITUAL_TYPES  # noqa: E402
+
+
+def _specs() -> list:
+    return [spec for ritual_type in RITUAL_TYPES for spec in audio.tone_catalog(ritual_type) if spec is not None]
+
+
+def _sessions(sessions: int, play) -> dict:
+    specs = _specs()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    held = [[play(spec) for spec in specs] for _ in range(sessions)]
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return {"plays": sum(map(len, held)), "seconds": elapsed, "retained_mib": retained / 2**20}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10, help="Simulated sessions")
+    args = parser.parse_args(argv)
+    sessions = args.sessions
+    specs = _specs()
+    distinct = list(dict.fromkeys(specs))
+
+    start = time.perf_counter()
+    for spec in distinct:
+        audio.render_tone(spec)
+    cold = time.perf_counter() - start
+    info = audio.get_audio_cache().cache_info()
+    audio_seconds = sum(spec.seconds for spec in distinct)
+    print(f"{len(specs)} vibration steps, {len(distinct)} distinct tones ({audio_seconds:.0f} s of audio)")
+    print(f"cold synthesis: {cold * 1e3:.0f} ms ({cold / audio_seconds * 1e3:.1f} ms per audio second), "
+          f"cache {info.bytes / 2**20:.1f} MiB in {info.currsize} buffers")
+
+    print(f"\n{sessions} sessions playing every vibration step")
+    print(f"{'mode':>12} {'plays':>7} {'seconds':>9} {'heap MiB':>9}")
+    for name, play in (
+        ("per-session", lambda spec: audio.wav_bytes(audio.synthesize(spec))),
+        ("cached", audio.render_tone)
+    ):
+        result = _sessions(sessions, play)
+        print(f"{name:>12} {result['plays']:>7} {result['seconds']:>9.2f} {result['retained_mib']:>9.1f}")
+
+    try:
+        from streamlit.runtime.media_file_storage import MediaFileKind
+        from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    except ImportError:
+        return
+    storage = MemoryMediaFileStorage("/media")
+    for _ in range(sessions):
+        for spec in specs:
+            storage.load_and_get_id(audio.render_tone(spec), "audio/wav", MediaFileKind.MEDIA)
+    shared = sum(file.content is audio.render_tone(spec) for spec in distinct
+                 for file in storage._files_by_id.values())
+    print(f"\nmedia storage: {len(storage._files_by_id)} files for {sessions * len(specs)} st.audio calls, "
+          f"{shared} referencing the cached buffer")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
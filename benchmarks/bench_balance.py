@@ -0,0 +1,70 @@
+"""Elemental balance model: per-session stepping vs batch evaluation.
+
+Times evaluating full LBRP trajectories for N sessions one ``BalanceModel`` at
+a time against a single ``simulate_balance`` call over a (N, 5) batch, and the
+per-rerun cost of moving a session cursor forward (one incremental step) and
+backward (a cached lookup).
+
+Usage:
+    python benchmarks/bench_balance.py [--sessions N ...]
+"""
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lbrp_engine as app  # noqa: E402
+
+
+def per_session(n_sessions: int, last_step: int) -> float:
+    start = time.perf_counter()
+    for seed in range(n_sessions):
+        app.BalanceModel(seed).state("LBRP", last_step)
+    return time.perf_counter() - start
+
+
+def batched(n_sessions: int) -> float:
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    app.simulate_balance("LBRP", app.initial_balance(rng, n_sessions), rng)
+    return time.perf_counter() - start
+
+
+def cursor_costs(last_step: int, number: int = 2000) -> tuple:
+    """(forward step, backward step) cost in microseconds"""
+    forward = []
+    for seed in range(number):
+        model = app.BalanceModel(seed)
+        model.state("LBRP", last_step - 1)
+        start = time.perf_counter()
+        model.state("LBRP", last_step)
+        forward.append(time.perf_counter() - start)
+    backward = timeit.timeit(lambda: model.state("LBRP", 3), number=number) / number
+    return sum(forward) / len(forward) * 1e6, backward * 1e6
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Session counts to evaluate")
+    args = parser.parse_args(argv)
+    counts = args.sessions
+    last_step = len(app.get_step_catalog("LBRP")) - 1
+    app.get_balance_transforms("LBRP")
+
+    forward, backward = cursor_costs(last_step)
+    print(f"cursor forward: {forward:.1f} us, backward (cached): {backward:.2f} us")
+    print(f"{'sessions':>10} {'per-session (ms)':>17} {'batched (ms)':>13} {'speedup':>8}")
+    for n in counts:
+        loop = per_session(n, last_step)
+        batch = batched(n)
+        print(f"{n:>10} {loop * 1e3:>17.1f} {batch * 1e3:>13.2f} {loop / batch:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
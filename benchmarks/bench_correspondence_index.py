@@ -0,0 +1,112 @@
+"""Correspondence query latency: secondary indexes vs. linear scans.
+
+The real tables are small, so the record set is enlarged with synthetic
+quarters, archangels and cross vibrations (names with vowel points and
+suffixes, spread over every sephira, element, direction and letter). Each
+query is answered by ``CorrespondenceIndex.lookup``/``search`` and by the
+linear scan application code used to do, and both must agree.
+
+Usage:
+    python benchmarks/bench_correspondence_index.py [--copies N] [--queries N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lbrp_engine.correspondence_index import (  # noqa: E402
+    CorrespondenceIndex,
+    fold,
+    get_correspondence_index,
+)
+from lbrp_engine.models import Direction, Element, Sephira  # noqa: E402
+
+LETTERS = "אבגדהוזחטיכלמנסעפצקרשת"
+
+
+def synthetic_records(copies: int, rng: random.Random) -> list:
+    records = list(get_correspondence_index().records)
+    base = [record for record in records if record.kind != "sephira"]
+    for n in range(copies):
+        for record in base:
+            suffix = "".join(rng.choice(LETTERS) for _ in range(3))
+            records.append(record._replace(
+                name=f"{record.name}{n}",
+                hebrew=f"{record.hebrew}ָ{suffix}",
+                direction=rng.choice(list(Direction)) if record.direction else None,
+                element=rng.choice(list(Element)) if record.element else None,
+                sephira=rng.choice(list(Sephira)) if record.sephira else None,
+                letter=rng.choice(LETTERS) if record.letter else ""
+            ))
+    return records
+
+
+def _scan(records, field: str, value):
+    key = fold(value)
+    if field == "name":
+        return tuple(r for r in records if key in (fold(r.name), fold(r.hebrew)))
+    return tuple(r for r in records if getattr(r, field) is not None and fold(getattr(r, field) or "") == key)
+
+
+def _queries(records, count: int, rng: random.Random) -> list:
+    queries = []
+    for _ in range(count):
+        record = rng.choice(records)
+        field = rng.choice(("sephira", "element", "direction", "letter", "name"))
+        value = {"name": record.hebrew or record.name}.get(field, getattr(record, field))
+        if value:
+            queries.append((field, value))
+    return queries
+
+
+def _timed(func, queries) -> list:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        func(*query)
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=2000, help="Synthetic copies of the correspondence tables")
+    parser.add_argument("--queries", type=int, default=500, help="Queries timed per kind")
+    args = parser.parse_args(argv)
+    copies, count = args.copies, args.queries
+    rng = random.Random(11)
+
+    records = synthetic_records(copies, rng)
+    start = time.perf_counter()
+    index = CorrespondenceIndex(records)
+    build = time.perf_counter() - start
+    queries = _queries(records, count, rng)
+    for field, value in queries[:50]:
+        indexed = index.lookup(field, value)
+        assert set(indexed) >= set(_scan(records, field, value)), (field, value)
+
+    print(f"{len(records)} records, index built in {build * 1e3:.0f} ms, {len(queries)} queries")
+    print(f"{'query':>14} {'p50 (us)':>10} {'p99 (us)':>10}")
+    search_terms = [(value if isinstance(value, str) else fold(value),) for _, value in queries]
+    for name, func, batch in (
+        ("scan", lambda field, value: _scan(records, field, value), queries[:50]),
+        ("lookup", index.lookup, queries),
+        ("search", index.search, search_terms)
+    ):
+        samples = _timed(func, batch)
+        print(f"{name:>14} {statistics.median(samples) * 1e6:>10.1f} {samples[int(len(samples) * 0.99)] * 1e6:>10.1f}")
+
+    live = get_correspondence_index()
+    step_queries = [("LBRP", field, value) for field, value in _queries(list(live.records), count, rng)]
+    live.steps("LBRP", "sephira", Sephira.KETER)  # build the step index outside the timing
+    samples = _timed(live.steps, step_queries)
+    print(f"{'steps':>14} {statistics.median(samples) * 1e6:>10.1f} {samples[int(len(samples) * 0.99)] * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
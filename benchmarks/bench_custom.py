@@ -0,0 +1,98 @@
+"""Custom sequence cache under popular and adversarial request mixes.
+
+``popular`` draws customizations from a small set that many users share, so
+most requests should hit. ``adversarial`` gives every request a fresh divine
+name, so nothing repeats and the cache can only evict. Reports hit, miss and
+eviction counts, the bytes the cache charges against its limit, and the
+Python heap it actually retains (``tracemalloc``, after a collection), which
+must plateau as the request count grows and stay near the charged bytes.
+
+Usage:
+    python benchmarks/bench_custom.py [--requests N] [--limit-kib KIB]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lbrp_engine import custom  # noqa: E402
+from lbrp_engine.simulator import get_step_catalog  # noqa: E402
+
+DIRECTIONS = ["EAST", "SOUTH", "WEST", "NORTH"]
+PHASES = ["Qabalistic Cross", "Closing Cross", "Archangel Evocation"]
+
+
+def _popular(rng: random.Random, i: int) -> dict:
+    return {
+        "archangel_order": DIRECTIONS[i % 4:] + DIRECTIONS[:i % 4],
+        "skip_phases": PHASES[:rng.randrange(2)]
+    }
+
+
+def _adversarial(rng: random.Random, i: int) -> dict:
+    return {
+        "base": rng.choice(("LBRP", "LIRP")),
+        "archangel_order": rng.sample(DIRECTIONS, 4),
+        "divine_names": {rng.choice(DIRECTIONS): f"NAME-{i}-{rng.getrandbits(32):08x}"},
+        "skip_phases": rng.sample(PHASES, rng.randrange(3))
+    }
+
+
+def run(mix, requests: int, limit: int) -> dict:
+    cache = custom.ByteLRUCache(limit)
+    rng = random.Random(7)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for i in range(requests):
+        key = custom.canonical_spec(mix(rng, i))
+        base = get_step_catalog(json.loads(key)["base"])
+        cache.get_or_build(key, lambda: custom.compile_custom(key), lambda steps: custom.sequence_bytes(steps, base))
+    elapsed = time.perf_counter() - start
+    gc.collect()  # count what the cache holds, not garbage cycles awaiting collection
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    info = cache.cache_info()
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "evictions": info.evictions,
+        "entries": info.currsize,
+        "charged_kib": info.bytes / 1024,
+        "retained_kib": retained / 1024,
+        "us_per_request": elapsed / requests * 1e6
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per mix")
+    parser.add_argument("--limit-kib", type=int, default=1024, help="Cache limit in KiB")
+    args = parser.parse_args(argv)
+    requests, limit = args.requests, args.limit_kib * 1024
+    for base in ("LBRP", "LIRP"):
+        get_step_catalog(base)
+    # Compiling a pentagram imports NumPy; keep that out of the heap figures
+    custom.compile_custom(custom.canonical_spec({"divine_names": {"EAST": "WARMUP"}}))
+
+    print(f"{requests} requests, limit {limit // 1024} KiB")
+    print(f"{'mix':>12} {'hits':>7} {'misses':>7} {'evicted':>8} {'entries':>8} "
+          f"{'charged KiB':>12} {'heap KiB':>9} {'us/req':>8}")
+    for name, mix in (("popular", _popular), ("adversarial", _adversarial)):
+        result = run(mix, requests, limit)
+        assert result["charged_kib"] * 1024 <= limit
+        print(f"{name:>12} {result['hits']:>7} {result['misses']:>7} {result['evictions']:>8} "
+              f"{result['entries']:>8} {result['charged_kib']:>12.1f} {result['retained_kib']:>9.1f} "
+              f"{result['us_per_request']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
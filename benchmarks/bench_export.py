@@ -0,0 +1,55 @@
+"""Rerun latency with the export panel visible.
+
+Drives the app headlessly with Streamlit's AppTest, parks the cursor on each
+step and times full reruns. Alongside, it times the eager ``json.dumps`` export
+every rerun used to perform, which the lazy export panel no longer pays until
+"Prepare Ritual Data" is clicked. Also reports NDJSON / gzip payload sizes.
+
+Usage:
+    python benchmarks/bench_export.py [--reruns N]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import lbrp_engine as app  # noqa: E402
+
+
+def _eager_export(current_step: int) -> str:
+    record = app.build_ritual_record("LBRP", current_step)
+    return json.dumps(record, indent=2, default=str)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=20, help="Timed reruns per step")
+    args = parser.parse_args(argv)
+    reruns = args.reruns
+    at = AppTest.from_file(os.path.join(ROOT, "lbrp_streamlit_app.py")).run()
+    
+    print(f"{'step':>4} {'rerun p50 (ms)':>15} {'eager export (ms)':>18} "
+          f"{'json':>7} {'ndjson':>7} {'gzip':>7}")
+    for index in range(len(app.get_step_catalog("LBRP"))):
+        at.session_state["current_step"] = index
+        samples = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1e3)
+        eager = timeit.timeit(lambda: _eager_export(index), number=reruns) / reruns * 1e3
+        sizes = [len(app.encode_export("LBRP", index, fmt)) for fmt in app.EXPORT_FORMATS]
+        print(f"{index + 1:>4} {statistics.median(samples):>15.2f} {eager:>18.3f} "
+              + " ".join(f"{size:>7}" for size in sizes))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,58 @@
+"""Template fragment lookup: indexed store vs. reading and parsing per request.
+
+The naive path re-reads ``template.html``, parses it and renders the fragment
+on every call. The store parses once, serves rendered fragments from memory
+and only stats the file once per ``RELOAD_INTERVAL``.
+
+Usage:
+    python benchmarks/bench_fragments.py [--lookups N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lbrp_engine import fragments  # noqa: E402
+
+FRAGMENT_IDS = ("elemental-table", "pentagram-guide")
+
+
+def _naive(fragment_id: str) -> str:
+    # A fresh store per call reads, hashes, parses and renders from scratch
+    return fragments.FragmentStore(fragments.TEMPLATE_PATH).render(fragment_id)
+
+
+def _timed(render, lookups: int) -> list:
+    samples = []
+    for i in range(lookups):
+        fragment_id = FRAGMENT_IDS[i % len(FRAGMENT_IDS)]
+        start = time.perf_counter()
+        render(fragment_id)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=2000, help="Fragment lookups timed")
+    args = parser.parse_args(argv)
+    lookups = args.lookups
+    store = fragments.get_fragment_store()
+    for fragment_id in FRAGMENT_IDS:
+        assert store.render(fragment_id) == _naive(fragment_id)
+
+    print(f"{lookups} lookups over {', '.join(FRAGMENT_IDS)}")
+    print(f"{'path':>8} {'p50 (us)':>10} {'p99 (us)':>10} {'total (ms)':>11}")
+    for name, render in (("naive", _naive), ("store", store.render)):
+        samples = sorted(_timed(render, lookups))
+        print(f"{name:>8} {statistics.median(samples) * 1e6:>10.1f} "
+              f"{samples[int(len(samples) * 0.99)] * 1e6:>10.1f} {sum(samples) * 1e3:>11.1f}")
+    print(f"store reloads: {store.reloads}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
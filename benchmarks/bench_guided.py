@@ -0,0 +1,97 @@
+"""Guided-practice scheduler: timer drift, idle cost and control latency.
+
+Starts N timed sessions on the shared asyncio scheduler with short random
+step durations and waits for all of them to finish, reporting how late each
+timer fired and how far each session's finish strayed from its planned total
+(deadlines are chained, so lateness must not accumulate). Then parks N
+sessions on long steps and measures the CPU the process burns while they
+idle, and the latency of pause / resume / skip calls under that load.
+
+Usage:
+    python benchmarks/bench_guided.py [--sessions N] [--steps N]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lbrp_engine.guided import GuidedScheduler  # noqa: E402
+
+
+def _percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def drift(sessions: int, steps: int) -> None:
+    scheduler = GuidedScheduler()
+    rng = random.Random(0)
+    finished = {}
+    done = threading.Event()
+
+    def on_advance(session_id: str, step: int) -> None:
+        state = scheduler.state(session_id)
+        if state is not None and state.finished:
+            finished[session_id] = time.monotonic()
+            if len(finished) == sessions:
+                done.set()
+
+    planned = {}
+    for n in range(sessions):
+        durations = [rng.uniform(0.02, 0.08) for _ in range(steps)]
+        session_id = f"session-{n}"
+        planned[session_id] = time.monotonic() + sum(durations)
+        scheduler.start(session_id, durations, on_advance=on_advance)
+    done.wait(timeout=steps * 0.1 + 30)
+
+    lateness_ms = [value * 1e3 for value in scheduler.lateness]
+    finish_ms = [(finished[sid] - planned[sid]) * 1e3 for sid in finished]
+    print(f"{sessions} sessions x {steps} steps: {len(lateness_ms)} timers fired, "
+          f"{len(finished)}/{sessions} finished")
+    print(f"  timer lateness  p50 {statistics.median(lateness_ms):6.2f} ms  "
+          f"p99 {_percentile(lateness_ms, 0.99):6.2f} ms  max {max(lateness_ms):6.2f} ms")
+    print(f"  finish drift    p50 {statistics.median(finish_ms):6.2f} ms  "
+          f"p99 {_percentile(finish_ms, 0.99):6.2f} ms  max {max(finish_ms):6.2f} ms")
+
+
+def idle(sessions: int, seconds: float = 2.0) -> None:
+    scheduler = GuidedScheduler()
+    for n in range(sessions):
+        scheduler.start(f"idle-{n}", [600.0] * 19)
+    time.sleep(0.2)
+    cpu_start, wall_start = time.process_time(), time.monotonic()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.monotonic() - wall_start
+    print(f"{sessions} idle sessions: {cpu / wall * 100:.2f}% CPU, {threading.active_count()} threads")
+
+    latencies = {"pause": [], "resume": [], "skip": []}
+    for n in range(min(sessions, 500)):
+        session_id = f"idle-{n}"
+        for action in ("pause", "resume", "skip"):
+            start = time.perf_counter()
+            getattr(scheduler, action)(session_id)
+            latencies[action].append((time.perf_counter() - start) * 1e6)
+    print("  control latency " + "  ".join(
+        f"{action} p50 {statistics.median(values):.1f} us / p99 {_percentile(values, 0.99):.1f} us"
+        for action, values in latencies.items()
+    ))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500, help="Guided sessions")
+    parser.add_argument("--steps", type=int, default=19, help="Steps per session")
+    args = parser.parse_args(argv)
+    sessions, steps = args.sessions, args.steps
+    drift(sessions, steps)
+    idle(sessions)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
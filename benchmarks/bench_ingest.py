@@ -0,0 +1,85 @@
+"""Ingestion throughput and memory for growing corpora of exported records.
+
+Writes a synthetic corpus of ``lbrp_ritual_*.json`` downloads (random ritual
+types and cursors) plus one NDJSON bulk export, then ingests it serially and
+across a process pool. Reports files/second, the dataset size against the raw
+JSON, and peak resident memory of the parent and of the workers, which should
+stay flat as the corpus grows.
+
+Usage:
+    python benchmarks/bench_ingest.py [--files N ...]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import lbrp_engine as app  # noqa: E402
+
+# Run each ingestion in a fresh process so peak RSS is per run
+_RUN = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+from lbrp_engine.analytics import completion_funnel, ingest
+start = time.perf_counter()
+totals = ingest([{corpus!r}], {dataset!r}, workers={workers}, files_per_task=500)
+elapsed = time.perf_counter() - start
+completion_funnel({dataset!r})
+print(json.dumps(dict(totals, seconds=elapsed,
+    parent_rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    worker_rss=resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)))
+"""
+
+
+def write_corpus(directory: str, files: int) -> int:
+    rng = random.Random(files)
+    steps = len(app.get_step_catalog("LBRP"))
+    for index in range(files):
+        record = app.build_ritual_record(rng.choice(app.RITUAL_TYPES), rng.randrange(steps))
+        with open(os.path.join(directory, f"lbrp_ritual_{index:07d}.json"), "w", encoding="utf-8") as fp:
+            json.dump(record, fp, indent=2)
+    with open(os.path.join(directory, "bulk.ndjson"), "wb") as fp:
+        app.stream_export(((rng.choice(app.RITUAL_TYPES), rng.randrange(steps)) for _ in range(files)), fp)
+    return _dir_size(directory)
+
+
+def _dir_size(directory: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Corpus sizes to ingest")
+    args = parser.parse_args(argv)
+    counts = args.files
+    workers = os.cpu_count() or 1
+    print(f"{'files':>7} {'workers':>7} {'files/s':>9} {'raw MiB':>8} {'parquet KiB':>12} "
+          f"{'parent MiB':>11} {'worker MiB':>11}")
+    for files in counts:
+        tmp = tempfile.mkdtemp()
+        try:
+            corpus, dataset = os.path.join(tmp, "corpus"), os.path.join(tmp, "dataset")
+            os.makedirs(corpus)
+            raw = write_corpus(corpus, files)
+            for count in sorted({1, workers}):
+                source = _RUN.format(root=ROOT, corpus=corpus, dataset=dataset, workers=count)
+                output = subprocess.run([sys.executable, "-c", source], check=True,
+                                        capture_output=True, text=True).stdout
+                result = json.loads(output)
+                print(f"{files:>7} {count:>7} {result['files'] / result['seconds']:>9.0f} "
+                      f"{raw / 2**20:>8.1f} {_dir_size(dataset) / 1024:>12.1f} "
+                      f"{result['parent_rss'] / 1024:>11.1f} {result['worker_rss'] / 1024:>11.1f}")
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
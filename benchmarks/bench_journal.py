@@ -0,0 +1,85 @@
+"""Session journal write throughput under many concurrent sessions.
+
+Each session thread records navigation events as a user clicking through the
+ritual would. Compares one commit per event (``batch_size=1``) against the
+batched writer, reporting events/second, time for ``record()`` to return
+(what a rerun pays) and the final flush latency.
+
+Usage:
+    python benchmarks/bench_journal.py [--sessions N] [--events N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import lbrp_engine as app  # noqa: E402
+
+
+def _session(journal, session_id: str, events: int, record_times: list) -> None:
+    steps = len(app.get_step_catalog("LBRP"))
+    samples = []
+    for i in range(events):
+        start = time.perf_counter()
+        journal.record(session_id, "navigate", "LBRP", i % steps)
+        samples.append(time.perf_counter() - start)
+    record_times.extend(samples)
+
+
+def run(batch_size: int, sessions: int, events: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = app.SessionJournal(os.path.join(tmp, "journal.sqlite3"), batch_size=batch_size)
+        record_times = []
+        threads = [
+            threading.Thread(target=_session, args=(journal, f"session-{n}", events, record_times))
+            for n in range(sessions)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        enqueued = time.perf_counter()
+        journal.flush()
+        elapsed = time.perf_counter() - start
+        flush_latency = time.perf_counter() - enqueued
+        written = journal.written
+        resumed = journal.resume("session-0")
+        journal.close()
+
+    record_times.sort()
+    return {
+        "batch_size": batch_size,
+        "events": written,
+        "events_per_second": written / elapsed,
+        "record_p50_us": statistics.median(record_times) * 1e6,
+        "record_p99_us": record_times[int(len(record_times) * 0.99)] * 1e6,
+        "flush_ms": flush_latency * 1e3,
+        "resumed_step": resumed["current_step"]
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100, help="Concurrent session threads")
+    parser.add_argument("--events", type=int, default=200, help="Events recorded per session")
+    args = parser.parse_args(argv)
+    sessions, events = args.sessions, args.events
+    print(f"{sessions} sessions x {events} events")
+    print(f"{'batch':>6} {'events':>8} {'events/s':>10} {'record p50 (us)':>16} "
+          f"{'record p99 (us)':>16} {'flush (ms)':>11}")
+    for batch_size in (1, 256):
+        result = run(batch_size, sessions, events)
+        assert result["events"] == sessions * events
+        print(f"{result['batch_size']:>6} {result['events']:>8} {result['events_per_second']:>10.0f} "
+              f"{result['record_p50_us']:>16.1f} {result['record_p99_us']:>16.1f} {result['flush_ms']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,170 @@
+"""Concurrent-user load test driving the real app through Streamlit's AppTest.
+
+Each simulated session opens the app, switches to LIRP, clicks Next through
+every step, steps back once, switches to LBRP and resets. AppTest is not
+thread-safe, so the N sessions are kept live side by side (one AppTest and
+session state each) and their clicks are interleaved round-robin, the way a
+single server process serves many connected users. For each concurrency
+level the script records p50/p95/p99 rerun latency, reruns per second and
+resident memory, and writes the results as JSON so runs can be compared
+between commits.
+
+AppTest polls for script completion every 100 ms, which would quantize every
+latency to that interval; the benchmark swaps in a 1 ms poll.
+
+Usage:
+    python benchmarks/bench_load.py --sessions 1 10 50 --output load.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest, local_script_runner  # noqa: E402
+
+from lbrp_engine import get_step_catalog  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "lbrp_streamlit_app.py")
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/status") as fp:
+            for line in fp:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _require_widgets_deltas(runner, timeout: float = 3) -> None:
+    """AppTest's completion wait with a 1 ms poll instead of 100 ms"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if runner.script_stopped():
+            return
+        time.sleep(0.001)
+    runner.request_stop()
+    raise RuntimeError(f"AppTest script run timed out after {timeout}s")
+
+
+local_script_runner.require_widgets_deltas = _require_widgets_deltas
+
+
+def _button(at: AppTest, label: str):
+    return next(button for button in at.button if button.label == label)
+
+
+def session_actions(timeout: float) -> Iterator[Callable[[], AppTest]]:
+    """Yield the scripted walkthrough of one session as rerun-triggering actions"""
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    yield at.run
+    yield lambda: at.radio[0].set_value("LIRP (Invoking)").run()
+    for _ in range(len(get_step_catalog("LIRP")) - 1):
+        yield lambda: _button(at, "Next ▶️").click().run()
+    yield lambda: _button(at, "◀️ Previous").click().run()
+    yield lambda: at.radio[0].set_value("LBRP (Banishing)").run()
+    yield lambda: _button(at, "🔁 Reset Ritual").click().run()
+
+
+def run_sessions(sessions: int, timeout: float) -> List[float]:
+    """Interleave ``sessions`` live walkthroughs, returning every rerun latency"""
+    active = [session_actions(timeout) for _ in range(sessions)]
+    latencies = []
+    while active:
+        for actions in list(active):
+            action = next(actions, None)
+            if action is None:
+                active.remove(actions)
+                continue
+            start = time.perf_counter()
+            at = action()
+            latencies.append(time.perf_counter() - start)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+    return latencies
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_level(sessions: int, timeout: float) -> Dict:
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    latencies = [sample * 1e3 for sample in run_sessions(sessions, timeout)]
+    wall = time.perf_counter() - start
+
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "wall_seconds": round(wall, 3),
+        "throughput_reruns_per_second": round(len(latencies) / wall, 2),
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3),
+            "p50": round(_percentile(latencies, 50), 3),
+            "p95": round(_percentile(latencies, 95), 3),
+            "p99": round(_percentile(latencies, 99), 3),
+            "max": round(max(latencies), 3)
+        },
+        "rss_bytes": _rss_bytes(),
+        "rss_delta_bytes": _rss_bytes() - rss_before
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50],
+                        help="Concurrency levels to test")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-rerun AppTest timeout (s)")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "load",
+        "revision": _git_revision(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "results": []
+    }
+    for sessions in args.sessions:
+        result = run_level(sessions, args.timeout)
+        report["results"].append(result)
+        latency = result["latency_ms"]
+        print(f"{sessions:>5} sessions: p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, "
+              f"p99 {latency['p99']:.1f} ms, {result['throughput_reruns_per_second']:.1f} reruns/s, "
+              f"RSS {result['rss_bytes'] / 2**20:.1f} MiB", file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,72 @@
+"""Monte Carlo throughput: naive per-path loop vs batched NumPy vs process pool.
+
+The naive baseline walks one path at a time with ``random.random()`` over the
+same transition matrix. The batched engine samples whole chunks of paths as
+arrays; the pooled run spreads chunks across worker processes. Simulated
+completion rates are printed next to the exact value from the fundamental
+matrix.
+
+Usage:
+    python benchmarks/bench_markov.py [--paths N] [--workers N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lbrp_engine as app  # noqa: E402
+
+
+def naive(paths: int) -> tuple:
+    """(completion rate, seconds) walking each path in pure Python"""
+    chain = app.get_ritual_chain("LBRP")
+    size = len(chain.phases)
+    rows = chain.transitions.tolist()
+    costs = chain.costs.tolist()
+    start = time.perf_counter()
+    completed = 0
+    for _ in range(paths):
+        state, steps = 0, 0
+        while state < size:
+            steps += costs[state]
+            draw, acc = random.random(), 0.0
+            for following, probability in enumerate(rows[state]):
+                acc += probability
+                if draw < acc:
+                    break
+            state = following
+        completed += state == size
+    return completed / paths, time.perf_counter() - start
+
+
+def batched(paths: int, workers: int) -> tuple:
+    start = time.perf_counter()
+    result = app.monte_carlo("LBRP", paths, seed=0, workers=workers)
+    return result["completion_rate"], time.perf_counter() - start
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=2_000_000, help="Paths simulated per engine")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes in the pooled run")
+    args = parser.parse_args(argv)
+    paths, workers = args.paths, args.workers
+    naive_paths = min(paths, 200_000)
+    exact = app.exact_statistics("LBRP")["completion_probability"]
+
+    print(f"exact completion probability: {exact:.5f}")
+    print(f"{'engine':>22} {'paths':>10} {'completion':>11} {'paths/s':>12} {'speedup':>8}")
+    rate, elapsed = naive(naive_paths)
+    baseline = naive_paths / elapsed
+    print(f"{'naive Python loop':>22} {naive_paths:>10} {rate:>11.5f} {baseline:>12,.0f} {1:>7.0f}x")
+    for label, count in (("batched NumPy", 1), (f"pool ({workers} workers)", workers)):
+        rate, elapsed = batched(paths, count)
+        print(f"{label:>22} {paths:>10} {rate:>11.5f} {paths / elapsed:>12,.0f} "
+              f"{paths / elapsed / baseline:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
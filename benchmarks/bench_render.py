@@ -0,0 +1,52 @@
+"""Rerun render benchmark: rebuilding step markup vs. pre-rendered fragments.
+
+For every step of a ritual, times the markup work a rerun performs. "before"
+rebuilds the step, phase extras and balance panel from the generators (what
+every rerun used to do); "after" looks up the cached fragments.
+
+Usage:
+    python benchmarks/bench_render.py [--ritual-type TYPE] [--repeats N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lbrp_engine as app  # noqa: E402
+
+BALANCE = (82, 91, 77, 88, 95)
+
+
+def _rebuild(step: app.RitualStep, index: int) -> str:
+    html = app.HTMLGenerator.generate_step(step)
+    if step.phase == "Formulating Pentagrams":
+        html += app.HTMLGenerator.generate_direction_indicator((index - 6) % 4)
+    elif step.phase == "Archangel Evocation":
+        html += app.HTMLGenerator.generate_archangel_correspondences()
+    return html + app.HTMLGenerator.generate_balance(BALANCE)
+
+
+def _cached(ritual_type: str, index: int) -> str:
+    return app.get_step_fragments(ritual_type)[index] + app.get_panel_fragment(BALANCE)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ritual-type", default="LBRP", help="Ritual whose steps are rendered")
+    parser.add_argument("--repeats", type=int, default=2000, help="Renders timed per step")
+    args = parser.parse_args(argv)
+    ritual_type, repeats = args.ritual_type, args.repeats
+    steps = app.get_step_catalog(ritual_type)
+    _cached(ritual_type, 0)
+    
+    print(f"{'step':>4} {'phase':<24} {'before (us)':>12} {'after (us)':>11} {'speedup':>8}")
+    for index, step in enumerate(steps):
+        before = timeit.timeit(lambda: _rebuild(step, index), number=repeats) / repeats * 1e6
+        after = timeit.timeit(lambda: _cached(ritual_type, index), number=repeats) / repeats * 1e6
+        print(f"{index + 1:>4} {step.phase:<24} {before:>12.2f} {after:>11.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
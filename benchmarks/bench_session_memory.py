@@ -0,0 +1,100 @@
+"""Memory benchmark: per-session step lists vs. the shared step catalog.
+
+Simulates N Streamlit sessions and measures the Python heap they retain with
+``tracemalloc``. "before" is frozen at the original layout: each session owned
+an ``LBRPSimulator`` whose list of ``@dataclass`` steps held freshly generated
+strings, copied here from the catalog. "after" keeps only the session cursor
+and reads steps from the shared ``get_step_catalog``. Compilation and its
+lazy imports (NumPy, geometry) are warmed up first.
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sessions N ...]
+"""
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lbrp_engine as app  # noqa: E402
+
+
+@dataclass
+class BaselineStep:
+    """RitualStep as the original app defined it"""
+    phase: str
+    number: int
+    title: str
+    description: str
+    vibration: str = ""
+    gesture: str = ""
+    visualization: str = ""
+    sephira: Optional[app.Sephira] = None
+    html_content: str = ""
+
+
+def _fresh(text: str) -> str:
+    """A new string object with the same value, as each session's generator call produced"""
+    return "".join(list(text))
+
+
+# Filled by main() before measuring, so the template is not counted
+_TEMPLATE: tuple = ()
+
+
+def _before_session() -> dict:
+    return {
+        'steps': [
+            BaselineStep(_fresh(step.phase), step.number, _fresh(step.title), _fresh(step.description),
+                         _fresh(step.vibration), _fresh(step.gesture), _fresh(step.visualization),
+                         step.sephira, _fresh(step.html_content))
+            for step in _TEMPLATE
+        ],
+        'current_step': 0,
+        'balance': [random.randint(70, 100) for _ in range(5)]
+    }
+
+
+def _after_session() -> dict:
+    app.get_step_catalog("LBRP")
+    return {
+        'ritual_type': "LBRP",
+        'current_step': 0,
+        'balance': [random.randint(70, 100) for _ in range(5)]
+    }
+
+
+def measure(factory, n_sessions: int) -> int:
+    """Return bytes retained by ``n_sessions`` sessions built by ``factory``"""
+    app.get_step_catalog.cache_clear()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sessions = [factory() for _ in range(n_sessions)]
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del sessions
+    return retained
+
+
+def main(argv=None) -> None:
+    global _TEMPLATE
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 100, 1000],
+                        help="Session counts to measure")
+    args = parser.parse_args(argv)
+    counts = args.sessions
+    app.compile_ritual(app.load_definition("LBRP"))
+    _TEMPLATE = tuple(app.get_step_catalog("LBRP"))
+    print(f"{'sessions':>10} {'before (KiB)':>14} {'after (KiB)':>14} {'ratio':>8}")
+    for n in counts:
+        before = measure(_before_session, n)
+        after = measure(_after_session, n)
+        print(f"{n:>10} {before / 1024:>14.1f} {after / 1024:>14.1f} {before / max(after, 1):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
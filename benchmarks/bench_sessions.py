@@ -0,0 +1,122 @@
+"""Session memory soak test: state retained as simulated sessions come and go.
+
+Runs a simulated clock for ``hours``. Sessions arrive at ``per_minute``,
+rerun every few seconds for 1-20 minutes (advancing the cursor, building the
+balance model and now and then preparing an export, like the app), then sit
+idle in an open tab for an exponentially distributed time (mean
+``linger_hours``) before it is closed. Each session's state is a mapping with
+the app's keys, tracked by a ``SessionRegistry`` exactly as the app does.
+
+The same arrival sequence is replayed with the app's policy (compact after
+``LBRP_SESSION_COMPACT_SECONDS``, evict after ``LBRP_SESSION_EVICT_SECONDS``)
+and with compaction and eviction disabled. Each half hour the heap retained
+(``tracemalloc``) and the registry's per-session accounting are printed.
+
+Usage:
+    python benchmarks/bench_sessions.py [--hours H] [--per-minute N] [--linger-hours H]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lbrp_engine import encode_export, get_step_catalog  # noqa: E402
+from lbrp_engine.balance import BalanceModel  # noqa: E402
+from lbrp_engine.sessions import SessionRegistry  # noqa: E402
+from lbrp_streamlit_app import SESSION_POLICY  # noqa: E402
+
+TICK = 10.0  # simulated seconds per step
+SAMPLE_EVERY = 1800.0
+
+
+class _State(dict):
+    """One session's state (a dict subclass, so the registry can hold it weakly)"""
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rerun(state: _State, rng: random.Random, total: int) -> None:
+    state["current_step"] = min(state["current_step"] + 1, total - 1)
+    state["cursor_epoch"] += 1
+    model = state.get("balance_model")
+    if model is None or model.seed != state["balance_seed"]:
+        model = state["balance_model"] = BalanceModel(state["balance_seed"])
+    model.balance(state["ritual_type"], state["current_step"])
+    if rng.random() < 0.05:
+        key = ("JSON", state["ritual_type"], state["current_step"])
+        state["export"] = (key, encode_export(state["ritual_type"], state["current_step"], "JSON"), "ritual.json")
+
+
+def soak(policy, hours: float, per_minute: float, linger_hours: float, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    clock = _Clock()
+    registry = SessionRegistry(policy, clock=clock)
+    totals = {ritual_type: len(get_step_catalog(ritual_type)) for ritual_type in ("LBRP", "LIRP")}
+    open_tabs = {}  # session_id -> [state, active_until, closes_at]; Streamlit holds these strongly
+    samples = []
+    arrivals = 0.0
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    while clock.now < hours * 3600:
+        clock.now += TICK
+        arrivals += per_minute * TICK / 60
+        while arrivals >= 1 or rng.random() < arrivals:
+            arrivals -= 1
+            active_until = clock.now + rng.uniform(60, 1200)
+            open_tabs[f"s{len(samples)}-{rng.getrandbits(48):x}"] = [_State(
+                ritual_type=rng.choice(("LBRP", "LIRP")), current_step=0, cursor_epoch=0,
+                balance_seed=rng.getrandbits(63), journal_id=None
+            ), active_until, active_until + rng.expovariate(1 / (linger_hours * 3600))]
+        for session_id, (state, active_until, closes_at) in list(open_tabs.items()):
+            if clock.now >= closes_at:
+                del open_tabs[session_id]
+            elif clock.now < active_until and rng.random() < 0.5:
+                registry.touch(session_id, state)
+                _rerun(state, rng, totals[state["ritual_type"]])
+        if clock.now % SAMPLE_EVERY < TICK:
+            registry.sweep()
+            gc.collect()
+            summary = registry.summary()
+            active = sum(clock.now < active_until for _, active_until, _ in open_tabs.values())
+            samples.append((clock.now / 3600, len(open_tabs), active, summary["session_state_bytes"],
+                            (tracemalloc.get_traced_memory()[0] - baseline) / 2**20))
+    tracemalloc.stop()
+    return samples
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=8.0, help="Simulated hours")
+    parser.add_argument("--per-minute", type=float, default=2.0, help="Session arrivals per minute")
+    parser.add_argument("--linger-hours", type=float, default=4.0, help="Mean hours an idle tab stays open")
+    args = parser.parse_args(argv)
+    hours, per_minute, linger_hours = args.hours, args.per_minute, args.linger_hours
+    print(f"{hours:g} simulated hours, {per_minute:g} sessions/minute, tabs left open {linger_hours:g} h on average")
+    print(f"policy: compact after {SESSION_POLICY.compact_after:g} s, evict after {SESSION_POLICY.evict_after:g} s")
+    runs = {
+        "policy": soak(SESSION_POLICY, hours, per_minute, linger_hours),
+        "none": soak(SESSION_POLICY._replace(compact_after=0, evict_after=0), hours, per_minute, linger_hours)
+    }
+    print(f"\n{'hour':>5} {'open':>6} {'active':>7} | {'state KiB':>10} {'heap MiB':>9} | "
+          f"{'state KiB':>10} {'heap MiB':>9}")
+    print(f"{'':>21} | {'with policy':^20} | {'no policy':^20}")
+    for with_policy, without in zip(runs["policy"], runs["none"]):
+        hour, open_tabs, active, state_bytes, heap = with_policy
+        print(f"{hour:>5.1f} {open_tabs:>6} {active:>7} | {state_bytes / 1024:>10.1f} {heap:>9.2f} | "
+              f"{without[3] / 1024:>10.1f} {without[4]:>9.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,154 @@
+"""Cold-start budget: import time and time-to-first-render in fresh interpreters.
+
+Every sample runs in a new Python process, the way a freshly scaled-up worker
+starts. Measured stages (medians over ``--repeat`` runs):
+
+``engine_import``
+    ``import lbrp_engine``
+``engine_first_render``
+    import plus the first step fragments of every ritual (headless workers)
+``app_import``
+    ``import lbrp_streamlit_app`` once Streamlit itself is loaded
+``app_first_render``
+    Streamlit, the app module and its first full script run via AppTest
+
+The engine stages also record which heavy modules the import pulled in;
+Streamlit, NumPy, pandas, plotly or Pillow appearing there is a failure.
+Streamlit loads those itself, so the app import is checked for the engine
+modules it must leave to first use (audio, balance, Tree of Life, guided
+practice, journal) instead. The
+script exits non-zero when any stage exceeds its budget, so it can gate CI.
+Compiled rituals are warmed first so the numbers reflect a deployed worker.
+
+Usage:
+    python benchmarks/bench_startup.py --repeat 5 --budget app_first_render=3000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Milliseconds per stage; override with --budget stage=ms
+DEFAULT_BUDGETS_MS = {
+    "engine_import": 150.0,
+    "engine_first_render": 300.0,
+    "app_import": 150.0,
+    "app_first_render": 4000.0
+}
+
+HEAVY_MODULES = ("streamlit", "numpy", "pandas", "plotly", "PIL")
+LAZY_APP_MODULES = tuple(f"lbrp_engine.{name}" for name in ("audio", "balance", "tree_of_life", "guided", "journal"))
+
+_ENGINE_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import lbrp_engine
+imported = time.perf_counter()
+for ritual_type in lbrp_engine.RITUAL_TYPES:
+    lbrp_engine.get_step_fragments(ritual_type)
+rendered = time.perf_counter()
+print(json.dumps({
+    "engine_import": (imported - start) * 1e3,
+    "engine_first_render": (rendered - start) * 1e3,
+    "heavy_modules": sorted(m for m in HEAVY if m in sys.modules)
+}))
+"""
+
+_APP_IMPORT_PROBE = """
+import json, sys, time
+import streamlit, streamlit.components.v1
+start = time.perf_counter()
+import lbrp_streamlit_app
+print(json.dumps({
+    "app_import": (time.perf_counter() - start) * 1e3,
+    "lazy_modules": sorted(m for m in LAZY if m in sys.modules)
+}))
+"""
+
+_APP_PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("lbrp_streamlit_app.py").run(timeout=60)
+assert not at.exception, at.exception
+print(json.dumps({"app_first_render": (time.perf_counter() - start) * 1e3}))
+"""
+
+
+def _probe(source: str) -> Dict:
+    output = subprocess.run(
+        [sys.executable, "-c", source], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(repeat: int) -> Dict:
+    engine_probe = f"HEAVY = {HEAVY_MODULES!r}\n{_ENGINE_PROBE}"
+    app_import_probe = f"LAZY = {LAZY_APP_MODULES!r}\n{_APP_IMPORT_PROBE}"
+    _probe(engine_probe)  # warm the compiled-ritual disk cache
+    samples: Dict[str, List[float]] = {stage: [] for stage in DEFAULT_BUDGETS_MS}
+    heavy, eager = set(), set()
+    for _ in range(repeat):
+        engine = _probe(engine_probe)
+        heavy.update(engine.pop("heavy_modules"))
+        app_import = _probe(app_import_probe)
+        eager.update(app_import.pop("lazy_modules"))
+        for source in (engine, app_import, _probe(_APP_PROBE)):
+            for stage, elapsed in source.items():
+                samples[stage].append(elapsed)
+    return {
+        "median_ms": {stage: statistics.median(values) for stage, values in samples.items()},
+        "max_ms": {stage: max(values) for stage, values in samples.items()},
+        "heavy_modules_on_engine_import": sorted(heavy),
+        "lazy_modules_on_app_import": sorted(eager)
+    }
+
+
+def _parse_budget(value: str) -> tuple:
+    stage, _, limit = value.partition("=")
+    if stage not in DEFAULT_BUDGETS_MS or not limit:
+        raise argparse.ArgumentTypeError(f"expected one of {', '.join(DEFAULT_BUDGETS_MS)}=<ms>")
+    return stage, float(limit)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh processes per stage")
+    parser.add_argument("--budget", type=_parse_budget, action="append", default=[],
+                        help="Override a stage budget, e.g. engine_import=100")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    budgets = dict(DEFAULT_BUDGETS_MS, **dict(args.budget))
+    report = measure(args.repeat)
+    report["budgets_ms"] = budgets
+
+    failures = [
+        f"{stage}: {report['median_ms'][stage]:.1f} ms > {limit:.1f} ms budget"
+        for stage, limit in budgets.items() if report["median_ms"][stage] > limit
+    ]
+    failures += [f"import lbrp_engine loaded {name}" for name in report["heavy_modules_on_engine_import"]]
+    failures += [f"import lbrp_streamlit_app loaded {name}" for name in report["lazy_modules_on_app_import"]]
+    report["passed"] = not failures
+
+    for stage, limit in budgets.items():
+        print(f"{stage:>20}: {report['median_ms'][stage]:8.1f} ms (budget {limit:.0f} ms)", file=sys.stderr)
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            fp.write(payload + "\n")
+    else:
+        print(payload)
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
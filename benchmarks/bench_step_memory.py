@@ -0,0 +1,94 @@
+"""Memory of large generated step sequences: dict-backed dataclass vs. compact RitualStep.
+
+Builds N custom ritual variants (19 steps each, with a personalized
+preparation intention) the way independent generator calls would: every
+variant gets freshly built strings. "dataclass" stores them in the original
+``@dataclass`` layout with a per-instance ``__dict__`` and the step's HTML
+inline; "compact" uses the tuple-based ``RitualStep``, which interns its
+short, repeated labels and holds a fresh reference to its HTML, rendered
+once into the shared markup cache.
+
+Usage:
+    python benchmarks/bench_step_memory.py [--variants N ...]
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lbrp_engine import RitualStep, Sephira, get_step_catalog  # noqa: E402
+
+
+@dataclass(frozen=True)
+class DataclassStep:
+    """The previous RitualStep layout, kept as the comparison baseline"""
+    phase: str
+    number: int
+    title: str
+    description: str
+    vibration: str = ""
+    gesture: str = ""
+    visualization: str = ""
+    sephira: Optional[Sephira] = None
+    html_content: str = ""
+
+
+def _fresh(text: str) -> str:
+    """A new string object with the same value, as a separate generator call would produce"""
+    return "".join(list(text))
+
+
+def _html(step_cls, step: RitualStep):
+    if step_cls is DataclassStep or isinstance(step.html, str):
+        return _fresh(step.html_content)
+    return tuple(list(step.html))
+
+
+def build_variants(step_cls, n_variants: int) -> list:
+    base = get_step_catalog("LBRP")
+    variants = []
+    for variant in range(n_variants):
+        steps = []
+        for step in base:
+            description = step.description
+            if step.number == 1 and step.phase == "Preparation":
+                description = f"{description} Personal intention #{variant}."
+            steps.append(step_cls(
+                _fresh(step.phase), step.number, _fresh(step.title), _fresh(description),
+                _fresh(step.vibration), _fresh(step.gesture), _fresh(step.visualization),
+                step.sephira, _html(step_cls, step)
+            ))
+        variants.append(tuple(steps))
+    return variants
+
+
+def measure(step_cls, n_variants: int) -> int:
+    tracemalloc.start()
+    variants = build_variants(step_cls, n_variants)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del variants
+    return retained
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--variants", type=int, nargs="+", default=[100, 1000, 5000],
+                        help="Variant counts to measure")
+    args = parser.parse_args(argv)
+    counts = args.variants
+    for step in get_step_catalog("LBRP"):
+        step.html_content  # resolve the shared markup (and import NumPy) before measuring
+    print(f"{'variants':>9} {'dataclass (KiB)':>16} {'compact (KiB)':>14} {'ratio':>7}")
+    for n in counts:
+        before = measure(DataclassStep, n)
+        after = measure(RitualStep, n)
+        print(f"{n:>9} {before / 1024:>16.1f} {after / 1024:>14.1f} {before / max(after, 1):>6.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
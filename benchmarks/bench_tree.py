@@ -0,0 +1,101 @@
+"""Tree of Life figure cost per rerun as the ritual sequence grows.
+
+Sequences of increasing length are made by repeating a ritual's steps. For
+steps spread over each sequence, a rerun's figure work is timed, including
+the serialization ``st.plotly_chart`` performs. "rebuild" constructs the
+figure from scratch, drawing one segment per sephira change up to the step,
+as a straightforward implementation would (skipped for the longest
+sequence). "cached" looks up the step's precomputed highlight and its cached
+figure. The one-pass ``traverse`` of each sequence is timed separately, as it
+runs once per process.
+
+Usage:
+    python benchmarks/bench_tree.py [--ritual-type TYPE] [--samples N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import plotly.graph_objects as go  # noqa: E402
+from streamlit.elements.plotly_chart import marshall  # noqa: E402
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart  # noqa: E402
+
+from lbrp_engine.simulator import get_step_catalog  # noqa: E402
+from lbrp_engine.tree_of_life import (  # noqa: E402
+    NODE_COLORS,
+    PATHS,
+    SEPHIROT,
+    highlight_figure,
+    route,
+    step_sephira,
+    traverse,
+)
+
+
+def _rebuild(steps, index: int) -> go.Figure:
+    figure = go.Figure()
+    for a, b, _ in PATHS:
+        figure.add_trace(go.Scatter(x=[SEPHIROT[a][0], SEPHIROT[b][0]], y=[SEPHIROT[a][1], SEPHIROT[b][1]],
+                                    mode="lines", line={"color": "#444"}))
+    last = None
+    for step in steps[:index + 1]:
+        sephira = step_sephira(step)
+        if sephira and last and sephira != last:
+            for a, b in route(last, sephira):
+                figure.add_trace(go.Scatter(x=[SEPHIROT[a][0], SEPHIROT[b][0]],
+                                            y=[SEPHIROT[a][1], SEPHIROT[b][1]],
+                                            mode="lines", line={"color": "#ffd700", "width": 5}))
+        last = sephira or last
+    names = list(SEPHIROT)
+    figure.add_trace(go.Scatter(x=[SEPHIROT[n][0] for n in names], y=[SEPHIROT[n][1] for n in names],
+                                mode="markers+text", text=names, marker={"color": [NODE_COLORS[n] for n in names]}))
+    figure.update_layout(showlegend=False, height=460)
+    return figure
+
+
+def _serialize(figure: go.Figure) -> None:
+    marshall(PlotlyChart(), figure, True, "streamlit", "streamlit", config={"displayModeBar": False})
+
+
+def _time(func, samples) -> float:
+    timings = []
+    for index in samples:
+        start = time.perf_counter()
+        _serialize(func(index))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ritual-type", default="LBRP", help="Ritual whose steps are repeated")
+    parser.add_argument("--samples", type=int, default=10, help="Steps timed per sequence length")
+    args = parser.parse_args(argv)
+    ritual_type, count = args.ritual_type, args.samples
+    catalog = get_step_catalog(ritual_type)
+    highlight_figure(traverse(catalog)[1])  # import plotly and build the base figure outside the timings
+
+    print(f"{'steps':>7} {'traverse ms':>12} {'rebuild ms':>11} {'cached ms':>10} {'figures':>8}")
+    for repeat in (1, 10, 100, 1000):
+        steps = catalog * repeat
+        start = time.perf_counter()
+        highlights = traverse(steps)
+        traversal = time.perf_counter() - start
+        samples = [len(steps) - 1 - i * (len(steps) // count) for i in range(count)]
+        for index in samples:
+            highlight_figure(highlights[index])  # first view of each highlight builds its figure
+        # Rebuilding takes seconds per rerun on the longest sequence; it is left out there
+        rebuild = _time(lambda index: _rebuild(steps, index), samples[:3]) * 1e3 if repeat <= 100 else None
+        cached = _time(lambda index: highlight_figure(highlights[index]), samples)
+        rebuild_ms = f"{rebuild:>11.2f}" if rebuild is not None else f"{'-':>11}"
+        print(f"{len(steps):>7} {traversal * 1e3:>12.2f} {rebuild_ms} {cached * 1e3:>10.2f} "
+              f"{highlight_figure.cache_info().currsize:>8}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
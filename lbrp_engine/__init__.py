@@ -0,0 +1,137 @@
+"""Headless LBRP ritual engine: models, correspondences, step catalog, balance and exports.
+
+Importing this package never pulls in Streamlit; the UI lives in
+``lbrp_streamlit_app.py`` and the bulk exporter in ``python -m lbrp_engine``.
+The NumPy-backed models (balance, geometry, Markov chain, audio), the plotly
+Tree of Life, the pandas analytics and the SQLite journal are imported on
+first attribute access, so loading and rendering compiled steps stays cheap
+for short-lived workers.
+"""
+from importlib import import_module
+
+from .compiler import available_rituals, compile_ritual, load_compiled, load_definition
+from .correspondence_index import CorrespondenceIndex, get_correspondence_index
+from .correspondences import get_archangels, get_correspondences, get_cross_steps
+from .export import (
+    EXPORT_FORMATS,
+    build_ritual_record,
+    encode_export,
+    get_step_json,
+    iter_ndjson,
+    stream_export,
+)
+from .custom import canonical_spec, get_custom_sequence, get_sequence_cache
+from .fragments import FragmentStore, get_fragment_store, render_fragment
+from .generators import CSS_STYLES, TREE_OF_LIFE_HTML, HTMLGenerator
+from .models import Direction, Element, KabbalisticEntity, RitualStep, Sephira
+from .rendering import get_navigation_bundle, get_panel_fragment, get_step_fragments
+from .sessions import SessionPolicy, SessionRegistry, get_session_registry
+from .simulator import RITUAL_TYPES, LBRPSimulator, get_step_catalog
+from .static_build import build_static_site
+
+# Public names served lazily from heavier submodules
+_LAZY_EXPORTS = {
+    "ToneSpec": "audio",
+    "get_vibration_audio": "audio",
+    "render_tone": "audio",
+    "completion_funnel": "analytics",
+    "ingest": "analytics",
+    "load_steps": "analytics",
+    "BalanceModel": "balance",
+    "get_balance_transforms": "balance",
+    "initial_balance": "balance",
+    "new_balance_seed": "balance",
+    "simulate_balance": "balance",
+    "PentagramDrawing": "geometry",
+    "get_pentagram_drawing": "geometry",
+    "GuidedScheduler": "guided",
+    "GuidedState": "guided",
+    "get_scheduler": "guided",
+    "SessionJournal": "journal",
+    "get_journal": "journal",
+    "RitualChain": "markov",
+    "exact_statistics": "markov",
+    "get_ritual_chain": "markov",
+    "monte_carlo": "markov",
+    "TreeHighlight": "tree_of_life",
+    "get_tree_figure": "tree_of_life",
+    "get_tree_highlights": "tree_of_life",
+}
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
+__all__ = [
+    "BalanceModel",
+    "CSS_STYLES",
+    "CorrespondenceIndex",
+    "Direction",
+    "EXPORT_FORMATS",
+    "Element",
+    "FragmentStore",
+    "GuidedScheduler",
+    "GuidedState",
+    "HTMLGenerator",
+    "KabbalisticEntity",
+    "LBRPSimulator",
+    "PentagramDrawing",
+    "RITUAL_TYPES",
+    "RitualChain",
+    "RitualStep",
+    "Sephira",
+    "SessionJournal",
+    "SessionPolicy",
+    "SessionRegistry",
+    "TREE_OF_LIFE_HTML",
+    "ToneSpec",
+    "TreeHighlight",
+    "available_rituals",
+    "build_ritual_record",
+    "build_static_site",
+    "canonical_spec",
+    "compile_ritual",
+    "completion_funnel",
+    "encode_export",
+    "exact_statistics",
+    "get_archangels",
+    "get_balance_transforms",
+    "get_correspondence_index",
+    "get_correspondences",
+    "get_cross_steps",
+    "get_custom_sequence",
+    "get_fragment_store",
+    "get_journal",
+    "get_navigation_bundle",
+    "get_panel_fragment",
+    "get_pentagram_drawing",
+    "get_ritual_chain",
+    "get_scheduler",
+    "get_sequence_cache",
+    "get_session_registry",
+    "get_step_catalog",
+    "get_step_fragments",
+    "get_step_json",
+    "get_tree_figure",
+    "get_tree_highlights",
+    "get_vibration_audio",
+    "ingest",
+    "initial_balance",
+    "iter_ndjson",
+    "load_compiled",
+    "load_definition",
+    "load_steps",
+    "monte_carlo",
+    "new_balance_seed",
+    "render_fragment",
+    "render_tone",
+    "simulate_balance",
+    "stream_export",
+]
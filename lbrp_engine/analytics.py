@@ -0,0 +1,224 @@
+"""Ingestion of exported ritual records into a columnar dataset, and funnels over it
+
+``ingest`` streams a corpus of exports (``lbrp_ritual_*.json`` downloads and
+NDJSON files, optionally gzipped) through a process pool. Each worker parses
+a group of files and writes the normalized steps, one row per exported
+``RitualStep.to_dict()`` payload, as Parquet parts of at most ``batch_rows``
+rows. The parent only tracks counts and keeps a bounded number of tasks in
+flight, so memory stays flat however large the corpus is.
+
+``completion_funnel`` reads the parts one at a time, only the columns it
+needs, and reduces each to a small histogram before combining them.
+
+Step markup (``html_content``) is dropped on ingestion: it is derived from the
+other fields and would dominate the dataset.
+"""
+import glob
+import gzip
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+EXPORT_SUFFIXES = (".json", ".ndjson", ".jsonl", ".ndjson.gz", ".jsonl.gz", ".json.gz")
+
+# Text fields kept from each step payload, stored as categoricals
+STEP_TEXT_FIELDS = ("phase", "title", "description", "vibration", "gesture", "visualization", "sephira")
+
+PART_PATTERN = "part-*.parquet"
+
+def iter_export_files(sources: Iterable[str]) -> Iterator[str]:
+    """Yield export files from files and directories (searched recursively), sorted per directory"""
+    for source in sources:
+        if os.path.isdir(source):
+            for directory, subdirs, filenames in os.walk(source):
+                subdirs.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(EXPORT_SUFFIXES):
+                        yield os.path.join(directory, filename)
+        else:
+            yield source
+
+def iter_records(path: str) -> Iterator[Dict]:
+    """Records of one export file: a single JSON document or NDJSON lines"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fp:
+        if path.endswith((".json", ".json.gz")):
+            document = json.load(fp)
+            yield from document if isinstance(document, list) else (document,)
+            return
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
+
+class _StepBuffer:
+    """Column lists of normalized step rows, flushed to Parquet parts"""
+
+    def __init__(self, output_dir: str, task: int):
+        self.output_dir = output_dir
+        self.task = task
+        self.parts = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.columns: Dict[str, List] = {
+            name: [] for name in ("source", "record", "timestamp", "ritual_type", "steps_completed",
+                                  "step_index", "number") + STEP_TEXT_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["record"])
+
+    def add(self, source: str, record_index: int, record: Dict) -> None:
+        intern = sys.intern
+        columns = self.columns
+        timestamp = record.get("timestamp")
+        ritual_type = intern(record.get("ritual_type", "LBRP"))
+        steps = record.get("steps", [])
+        steps_completed = int(record.get("steps_completed", len(steps)))
+        for index, step in enumerate(steps):
+            columns["source"].append(source)
+            columns["record"].append(record_index)
+            columns["timestamp"].append(timestamp)
+            columns["ritual_type"].append(ritual_type)
+            columns["steps_completed"].append(steps_completed)
+            columns["step_index"].append(index)
+            columns["number"].append(step.get("number", index + 1))
+            for field in STEP_TEXT_FIELDS:
+                value = step.get(field)
+                columns[field].append(intern(value) if value else value)
+
+    def flush(self) -> None:
+        if not len(self):
+            return
+        frame = pd.DataFrame(self.columns)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], errors="coerce")
+        for name in ("record", "steps_completed", "step_index", "number"):
+            frame[name] = pd.to_numeric(frame[name], downcast="integer")
+        for name in ("source", "ritual_type") + STEP_TEXT_FIELDS:
+            frame[name] = frame[name].astype("category")
+        path = os.path.join(self.output_dir, f"part-{self.task:06d}-{self.parts:04d}.parquet")
+        frame.to_parquet(path, index=False, compression="zstd")
+        self.parts += 1
+        self._reset()
+
+def _ingest_task(task: int, paths: List[str], output_dir: str, batch_rows: int) -> Tuple[int, int, int, int]:
+    """Worker: parse a group of files into Parquet parts; returns (records, rows, parts, errors)"""
+    buffer = _StepBuffer(output_dir, task)
+    records = rows = errors = 0
+    for path in paths:
+        source = sys.intern(path)
+        try:
+            for record_index, record in enumerate(iter_records(path)):
+                buffer.add(source, record_index, record)
+                records += 1
+                # Records never straddle parts, so per-part aggregates stay exact
+                if len(buffer) >= batch_rows:
+                    rows += len(buffer)
+                    buffer.flush()
+        except (OSError, ValueError, AttributeError, TypeError, EOFError):
+            errors += 1
+    rows += len(buffer)
+    buffer.flush()
+    return records, rows, buffer.parts, errors
+
+def _chunked(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(paths)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def ingest(sources: Iterable[str], output_dir: str, workers: int = 1, files_per_task: int = 256,
+           batch_rows: int = 100_000) -> Dict[str, int]:
+    """Normalize every export under ``sources`` into a Parquet dataset in ``output_dir``
+
+    Existing parts in ``output_dir`` are replaced.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(output_dir, PART_PATTERN)):
+        os.remove(stale)
+
+    totals = {"files": 0, "records": 0, "rows": 0, "parts": 0, "errors": 0}
+
+    def account(count: int, result: Tuple[int, int, int, int]) -> None:
+        totals["files"] += count
+        for key, value in zip(("records", "rows", "parts", "errors"), result):
+            totals[key] += value
+
+    tasks = enumerate(_chunked(iter_export_files(sources), files_per_task))
+    if workers <= 1:
+        for task, paths in tasks:
+            account(len(paths), _ingest_task(task, paths, output_dir, batch_rows))
+        return totals
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for task, paths in tasks:
+            pending.append((len(paths), pool.submit(_ingest_task, task, paths, output_dir, batch_rows)))
+            if len(pending) >= workers * 2:
+                count, future = pending.popleft()
+                account(count, future.result())
+        while pending:
+            count, future = pending.popleft()
+            account(count, future.result())
+    return totals
+
+def iter_parts(dataset_dir: str, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Load the dataset one part at a time, optionally only some columns"""
+    for path in sorted(glob.glob(os.path.join(dataset_dir, PART_PATTERN))):
+        yield pd.read_parquet(path, columns=columns)
+
+def load_steps(dataset_dir: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """The whole normalized steps table (for corpora that fit in memory)"""
+    parts = list(iter_parts(dataset_dir, columns))
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    steps = pd.concat(parts, ignore_index=True)
+    # Parts carry their own categories; concatenation falls back to object columns
+    for name in steps.columns.intersection(("source", "ritual_type") + STEP_TEXT_FIELDS):
+        steps[name] = steps[name].astype("category")
+    return steps
+
+def completion_funnel(dataset_dir: str) -> pd.DataFrame:
+    """Per ritual type and phase: records that started and completed each phase
+
+    A phase counts as completed by a record that holds as many of its steps as
+    the longest occurrence of that phase anywhere in the corpus.
+    """
+    histograms = []
+    records = []
+    for part in iter_parts(dataset_dir, ["source", "record", "ritual_type", "phase", "step_index"]):
+        part["source"] = part["source"].astype(str)
+        per_record = part.groupby(["ritual_type", "phase", "source", "record"], observed=True).agg(
+            steps=("step_index", "size"), first=("step_index", "min")
+        )
+        histograms.append(per_record.groupby(["ritual_type", "phase", "steps"], observed=True).agg(
+            count=("first", "size"), first=("first", "min")
+        ))
+        records.append(part.drop_duplicates(["source", "record"]).groupby("ritual_type", observed=True).size())
+
+    columns = ["ritual_type", "phase", "order", "started", "completed", "completion_rate", "reach_rate"]
+    if not histograms:
+        return pd.DataFrame(columns=columns)
+
+    histogram = pd.concat(histograms).groupby(level=[0, 1, 2], observed=True).agg({"count": "sum", "first": "min"})
+    histogram = histogram.reset_index()
+    phase_size = histogram.groupby(["ritual_type", "phase"], observed=True)["steps"].transform("max")
+    histogram["completed"] = histogram["count"].where(histogram["steps"] == phase_size, 0)
+
+    funnel = histogram.groupby(["ritual_type", "phase"], observed=True).agg(
+        order=("first", "min"), started=("count", "sum"), completed=("completed", "sum")
+    ).reset_index()
+    totals = pd.concat(records).groupby(level=0).sum()
+    funnel["completion_rate"] = funnel["completed"] / funnel["started"]
+    funnel["reach_rate"] = funnel["started"] / funnel["ritual_type"].astype(str).map(totals)
+    funnel["ritual_type"] = funnel["ritual_type"].astype(str)
+    funnel["phase"] = funnel["phase"].astype(str)
+    return funnel.sort_values(["ritual_type", "order"]).reset_index(drop=True)[columns]
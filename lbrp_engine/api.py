@@ -0,0 +1,246 @@
+"""Read-only HTTP API over the compiled ritual sequences (asyncio, no dependencies)
+
+Routes (GET or HEAD)::
+
+    /rituals                               ritual types, titles, step counts
+    /rituals/{type}                        the whole sequence
+    /rituals/{type}/steps?start=&stop=     a range of steps (0-based, stop exclusive)
+    /rituals/{type}/steps/{index}          one step
+
+Step bodies are the ``RitualStep.to_dict()`` payloads already serialized by
+``get_step_json``. Every response is built once per process: the body, its
+gzip encoding, a strong ETag per representation, and the complete 200 and
+304 responses including headers, so a request costs a parse, a dictionary
+lookup and one socket write. Clients revalidating with ``If-None-Match`` get
+``304 Not Modified``. Connections are kept alive (HTTP/1.1) unless a request
+carries a body, which is never read: the connection is closed after replying.
+
+The data is compiled once per process; restart the service after changing a
+ritual definition, as with the app.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .compiler import load_definition
+from .export import get_step_json
+from .instrumentation import register_cache
+from .simulator import RITUAL_TYPES, get_step_catalog
+
+DEFAULT_PORT = 8765
+CACHE_CONTROL = "public, max-age=60"
+MAX_HEADER_BYTES = 16 * 1024
+KEEPALIVE_SECONDS = 30.0
+
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+class Representation(NamedTuple):
+    """Prebuilt responses for one encoding of a resource"""
+    etag: str
+    full: bytes          # status line, headers and body
+    headers_only: bytes  # the same response to HEAD
+    not_modified: bytes  # 304 response
+
+class Resource(NamedTuple):
+    identity: Representation
+    gzip: Representation
+
+def _head(status: int, headers: Dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status} {_REASONS[status]}"] + [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+def _representation(body: bytes, etag: str, encoding: Optional[str]) -> Representation:
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Content-Length": str(len(body)),
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding"
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    head = _head(200, headers)
+    not_modified = _head(304, {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"})
+    return Representation(etag, head + body, head, not_modified)
+
+def build_resource(body: bytes) -> Resource:
+    """Prebuild both encodings of a JSON body; the ETags are strong and differ per encoding"""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return Resource(
+        _representation(body, f'"{digest}"', None),
+        _representation(gzip.compress(body, 9, mtime=0), f'"{digest}-gz"', "gzip")
+    )
+
+def _error(status: int, message: str) -> bytes:
+    body = json.dumps({"error": message}).encode("utf-8")
+    headers = {"Content-Type": "application/json; charset=utf-8", "Content-Length": str(len(body))}
+    if status == 405:
+        headers["Allow"] = "GET, HEAD"
+        headers["Connection"] = "close"  # the request body is never read
+    return _head(status, headers) + body
+
+# ==================== RESOURCES ====================
+@register_cache
+@lru_cache(maxsize=None)
+def rituals_resource() -> Resource:
+    return build_resource(json.dumps([
+        {
+            "ritual_type": ritual_type,
+            "title": load_definition(ritual_type).get("title", ritual_type),
+            "steps": len(get_step_catalog(ritual_type)),
+            "etag": ritual_resource(ritual_type).identity.etag
+        }
+        for ritual_type in RITUAL_TYPES
+    ], ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+@register_cache
+@lru_cache(maxsize=None)
+def ritual_resource(ritual_type: str) -> Resource:
+    title = json.dumps(load_definition(ritual_type).get("title", ritual_type), ensure_ascii=False)
+    steps = ",".join(get_step_json(ritual_type))
+    return build_resource(
+        f'{{"ritual_type":"{ritual_type}","title":{title},"steps":[{steps}]}}'.encode("utf-8")
+    )
+
+@register_cache
+@lru_cache(maxsize=4096)
+def steps_resource(ritual_type: str, start: int, stop: int) -> Resource:
+    """A step range, with its bounds clamped to the sequence"""
+    return build_resource(f"[{','.join(get_step_json(ritual_type)[start:stop])}]".encode("utf-8"))
+
+@register_cache
+@lru_cache(maxsize=None)
+def step_resource(ritual_type: str, index: int) -> Resource:
+    return build_resource(get_step_json(ritual_type)[index].encode("utf-8"))
+
+def _ritual_type(name: str) -> Optional[str]:
+    ritual_type = name.upper()
+    return ritual_type if ritual_type in RITUAL_TYPES else None
+
+def resolve(target: str) -> Tuple[Optional[Resource], int, str]:
+    """Resource for a request target, or (None, status, message)"""
+    url = urlsplit(target)
+    parts = [part for part in url.path.split("/") if part]
+    if parts == ["rituals"]:
+        return rituals_resource(), 200, ""
+    if len(parts) < 2 or parts[0] != "rituals":
+        return None, 404, "Not found"
+    ritual_type = _ritual_type(parts[1])
+    if ritual_type is None:
+        return None, 404, f"Unknown ritual type: {parts[1]}"
+    if len(parts) == 2:
+        return ritual_resource(ritual_type), 200, ""
+    if parts[2] != "steps" or len(parts) > 4:
+        return None, 404, "Not found"
+
+    total = len(get_step_catalog(ritual_type))
+    try:
+        if len(parts) == 4:
+            index = int(parts[3])
+            if not 0 <= index < total:
+                return None, 404, f"Step {index} out of range 0-{total - 1}"
+            return step_resource(ritual_type, index), 200, ""
+        query = parse_qs(url.query)
+        start = int(query.get("start", ["0"])[0])
+        stop = int(query.get("stop", [str(total)])[0])
+    except ValueError:
+        return None, 400, "Step positions must be integers"
+    start, stop = min(max(start, 0), total), min(max(stop, 0), total)
+    return steps_resource(ritual_type, start, max(start, stop)), 200, ""
+
+# ==================== SERVER ====================
+def _header_values(headers: Dict[str, str], name: str) -> Tuple[str, ...]:
+    return tuple(value.strip() for value in headers.get(name, "").split(",") if value.strip())
+
+def _accepts_gzip(headers: Dict[str, str]) -> bool:
+    qualities = {}
+    for value in _header_values(headers, "accept-encoding"):
+        coding, _, params = value.partition(";")
+        _, _, quality = params.replace(" ", "").partition("q=")
+        try:
+            qualities[coding.strip().lower()] = float(quality) if quality else 1.0
+        except ValueError:
+            qualities[coding.strip().lower()] = 0.0
+    # An explicit gzip entry wins over the wildcard, wherever either appears
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+def respond(method: str, target: str, headers: Dict[str, str]) -> bytes:
+    """Complete response bytes for one parsed request"""
+    if method not in ("GET", "HEAD"):
+        return _error(405, f"{method} not allowed")
+    resource, status, message = resolve(target)
+    if resource is None:
+        return _error(status, message)
+    representation = resource.gzip if _accepts_gzip(headers) else resource.identity
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    matches = {tag[2:] if tag.startswith("W/") else tag for tag in _header_values(headers, "if-none-match")}
+    if representation.etag in matches or "*" in matches:
+        return representation.not_modified
+    return representation.headers_only if method == "HEAD" else representation.full
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_SECONDS)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                return
+            except asyncio.LimitOverrunError:
+                writer.write(_error(400, "Headers too large"))
+                return
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ")
+            except ValueError:
+                writer.write(_error(400, "Malformed request line"))
+                return
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.strip().lower()] = value.strip()
+            writer.write(respond(method, target, headers))
+            if method not in ("GET", "HEAD") or headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+                return  # an unread body would be parsed as the next request
+            connection = headers.get("connection", "").lower()
+            if connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive"):
+                return
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+def warm() -> int:
+    """Prebuild every ritual, step and full-range resource; returns the number built"""
+    built = 1
+    rituals_resource()
+    for ritual_type in RITUAL_TYPES:
+        total = len(get_step_catalog(ritual_type))
+        ritual_resource(ritual_type)
+        steps_resource(ritual_type, 0, total)
+        for index in range(total):
+            step_resource(ritual_type, index)
+        built += total + 2
+    return built
+
+async def start_server(host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+    """Start serving on the running loop (resources are warmed first)"""
+    warm()
+    return await asyncio.start_server(_handle, host, port, limit=MAX_HEADER_BYTES, reuse_address=True)
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> None:
+    """Run the API until interrupted"""
+    async def main() -> None:
+        server = await start_server(host, port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
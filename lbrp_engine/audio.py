@@ -0,0 +1,149 @@
+"""Synthesized guide tones for step vibrations, cached as shared WAV buffers
+
+Each step with a ``vibration`` gets an intoned tone: a fundamental pitched
+from the step's sephira (or, for archangels, their quarter's element) with a
+few harmonics and a slow vibrato. The name is split into syllables, each
+given its own swell and vowel colour (harmonic weights), and spread over the
+step's guided-practice duration (capped at ``MAX_TONE_SECONDS``).
+
+Tones are keyed by their synthesis parameters, not by step, so the same
+vibration in LBRP and LIRP is rendered once. The finished WAV file is one
+immutable ``bytes`` object kept in a byte-bounded LRU cache: ``st.audio``
+stores bytes by reference and deduplicates identical content, so every
+session playing a step shares the cached buffer instead of a copy.
+"""
+import os
+import re
+import struct
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .correspondence_index import get_correspondence_index
+from .custom import ByteLRUCache
+from .instrumentation import register_cache
+from .models import Element, RitualStep, Sephira
+from .simulator import get_step_catalog
+
+SAMPLE_RATE = 22050
+MAX_TONE_SECONDS = 30.0
+AUDIO_CACHE_BYTES = int(os.environ.get("LBRP_AUDIO_CACHE_BYTES", str(64 * 1024 * 1024)))
+WAV_HEADER_BYTES = 44
+
+# Fundamentals (Hz) in a comfortable intoning range
+SEPHIRA_PITCH = {
+    Sephira.KETER: 261.63,    # C4
+    Sephira.CHESED: 196.00,   # G3
+    Sephira.GEVURAH: 220.00,  # A3
+    Sephira.TIFERET: 174.61,  # F3
+    Sephira.MALKUTH: 130.81   # C3
+}
+ELEMENT_PITCH = {
+    Element.AIR: 246.94,      # B3
+    Element.FIRE: 293.66,     # D4
+    Element.WATER: 164.81,    # E3
+    Element.EARTH: 146.83,    # D3
+    Element.SPIRIT: 261.63    # C4
+}
+DEFAULT_PITCH = 196.00
+
+# Relative weights of harmonics 1-5 per vowel colour; consonant-only names hum
+VOWEL_HARMONICS = {
+    "a": (1.0, 0.8, 0.6, 0.3, 0.2),
+    "e": (1.0, 0.5, 0.3, 0.5, 0.3),
+    "i": (1.0, 0.3, 0.2, 0.4, 0.5),
+    "o": (1.0, 0.7, 0.3, 0.1, 0.05),
+    "u": (1.0, 0.4, 0.1, 0.05, 0.02),
+    "m": (1.0, 0.2, 0.05, 0.02, 0.01)
+}
+_SYLLABLE = re.compile(r"[aeiouy]+")
+
+class ToneSpec(NamedTuple):
+    """Synthesis parameters; equal specs share one rendered buffer"""
+    frequency: float
+    seconds: float
+    vowels: str  # one vowel colour per syllable
+
+def syllable_vowels(vibration: str) -> str:
+    """Vowel colour of each syllable of the Latin part of a vibration"""
+    latin = vibration.split("(")[0].lower()
+    vowels = "".join(group[0].replace("y", "i") for group in _SYLLABLE.findall(latin))
+    if vowels:
+        return vowels
+    # Names like YHVH are intoned letter by letter
+    return "m" * max(len(re.sub(r"[^a-z]", "", latin)), 1)
+
+@register_cache
+@lru_cache(maxsize=1024)
+def tone_spec(step: RitualStep) -> Optional[ToneSpec]:
+    """Tone for a step's vibration, or None if it has none"""
+    if not step.vibration:
+        return None
+    frequency = SEPHIRA_PITCH.get(step.sephira)
+    if frequency is None:
+        record = get_correspondence_index().first("name", step.vibration)
+        frequency = ELEMENT_PITCH.get(record.element, DEFAULT_PITCH) if record is not None else DEFAULT_PITCH
+    seconds = min(step.duration or MAX_TONE_SECONDS, MAX_TONE_SECONDS)
+    return ToneSpec(frequency, seconds, syllable_vowels(step.vibration))
+
+def synthesize(spec: ToneSpec, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Render a tone as float32 samples in [-1, 1]"""
+    samples = int(spec.seconds * sample_rate)
+    t = np.arange(samples, dtype=np.float64) / sample_rate
+    # 5 Hz vibrato of about a quarter tone, entering after the attack
+    vibrato = 0.015 * spec.frequency / 5.0 * np.sin(2 * np.pi * 5.0 * t) * np.minimum(t / 1.5, 1.0)
+    phase = 2 * np.pi * spec.frequency * t + vibrato
+
+    syllables = len(spec.vowels)
+    position = t * (syllables / spec.seconds)
+    syllable = np.minimum(position.astype(np.intp), syllables - 1)
+    weights = np.array([VOWEL_HARMONICS[vowel] for vowel in spec.vowels])[syllable]  # (samples, 5)
+
+    wave = np.zeros(samples)
+    for harmonic in range(weights.shape[1]):
+        wave += weights[:, harmonic] * np.sin((harmonic + 1) * phase)
+
+    # Each syllable swells and eases off, with a short breath between syllables
+    within = position - syllable
+    swell = np.sin(np.pi * np.clip(within / 0.92, 0.0, 1.0)) ** 0.5
+    fade = np.minimum(np.minimum(t / 0.05, (spec.seconds - t) / 0.05), 1.0)
+    wave *= swell * fade
+    peak = np.abs(wave).max() if samples else 0.0
+    return (wave / peak * 0.8 if peak else wave).astype(np.float32)
+
+def wav_bytes(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Encode float samples as a 16-bit mono PCM WAV file in a single buffer"""
+    data_bytes = samples.size * 2
+    buffer = bytearray(WAV_HEADER_BYTES + data_bytes)
+    struct.pack_into(
+        "<4sI4s4sIHHIIHH4sI", buffer, 0,
+        b"RIFF", 36 + data_bytes, b"WAVE", b"fmt ", 16, 1, 1,
+        sample_rate, sample_rate * 2, 2, 16, b"data", data_bytes
+    )
+    # Quantize straight into the file buffer
+    pcm = np.frombuffer(buffer, dtype="<i2", offset=WAV_HEADER_BYTES)
+    np.multiply(samples, 32767, out=pcm, casting="unsafe")
+    return bytes(buffer)
+
+@lru_cache(maxsize=1)
+def get_audio_cache() -> ByteLRUCache:
+    """Process-wide WAV cache, bounded by ``LBRP_AUDIO_CACHE_BYTES``"""
+    cache = ByteLRUCache(AUDIO_CACHE_BYTES)
+    register_cache(cache, "vibration_audio")
+    return cache
+
+def render_tone(spec: ToneSpec, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """WAV file for a tone, synthesized once and shared while it stays cached"""
+    return get_audio_cache().get_or_build(
+        (spec, sample_rate), lambda: wav_bytes(synthesize(spec, sample_rate), sample_rate), len
+    )
+
+def get_vibration_audio(step: RitualStep) -> Optional[bytes]:
+    """Shared WAV buffer of a step's intoned vibration, or None"""
+    spec = tone_spec(step)
+    return render_tone(spec) if spec is not None else None
+
+def tone_catalog(ritual_type: str) -> Tuple[Optional[ToneSpec], ...]:
+    """Tone of every step of a ritual (None where a step has no vibration)"""
+    return tuple(tone_spec(step) for step in get_step_catalog(ritual_type))
@@ -0,0 +1,174 @@
+"""Elemental balance dynamics driven by the compiled step sequence
+
+The balance panel shows a five-element state vector (Air, Fire, Water, Earth,
+Spirit). Every step applies an affine transform ``x' = M @ x + b`` derived
+from its phase spec and correspondences, plus a small gaussian perturbation
+drawn from the session's own generator, clipped to 0-100:
+
+- cross steps strengthen the element of their sephira; Tiferet pulls all five
+  toward their mean, and the closing cross acts twice as strongly;
+- banishing pentagrams settle their quarter's element toward equilibrium,
+  invoking pentagrams strengthen it;
+- archangels steady the element of their quarter.
+
+Transforms are built once per ritual type and shared by every session. A
+``BalanceModel`` extends a session's trajectory only as far as its cursor has
+reached, so stepping backwards is a lookup, and ``simulate_balance`` advances
+any number of sessions together as one (sessions, 5) array per step.
+"""
+import json
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .compiler import load_compiled_phases
+from .correspondences import get_correspondences
+from .instrumentation import register_cache
+from .models import Direction, Element, RitualStep, Sephira
+
+# State vector order, matching the balance panel
+ELEMENTS = (Element.AIR, Element.FIRE, Element.WATER, Element.EARTH, Element.SPIRIT)
+
+SEPHIRA_ELEMENTS: Dict[Sephira, Element] = {
+    Sephira.KETER: Element.SPIRIT,
+    Sephira.GEVURAH: Element.FIRE,
+    Sephira.CHESED: Element.WATER,
+    Sephira.MALKUTH: Element.EARTH
+}
+
+EQUILIBRIUM = 85.0
+INITIAL_RANGE = (70, 100)
+NOISE = 1.5  # standard deviation of the per-step perturbation
+
+Transform = Tuple[np.ndarray, np.ndarray]
+
+def _identity() -> Transform:
+    return np.eye(len(ELEMENTS)), np.zeros(len(ELEMENTS))
+
+def _pull(element: Element, target: float, rate: float) -> Transform:
+    """Move one element a fraction ``rate`` of the way toward ``target``"""
+    matrix, offset = _identity()
+    index = ELEMENTS.index(element)
+    matrix[index, index] = 1.0 - rate
+    offset[index] = rate * target
+    return matrix, offset
+
+def _harmonize(rate: float) -> Transform:
+    """Move every element a fraction ``rate`` of the way toward their mean"""
+    size = len(ELEMENTS)
+    return (1.0 - rate) * np.eye(size) + rate / size, np.zeros(size)
+
+# ==================== PHASE TRANSFORMS ====================
+def _cross_transforms(spec: Dict, steps: Tuple[RitualStep, ...]) -> List[Transform]:
+    strength = 2.0 if spec.get("amplified", False) else 1.0
+    transforms = []
+    for step in steps:
+        element = SEPHIRA_ELEMENTS.get(step.sephira)
+        if element is None:
+            transforms.append(_harmonize(0.3 * strength))
+        else:
+            transforms.append(_pull(element, 100.0, 0.15 * strength))
+    return transforms
+
+def _pentagram_transforms(spec: Dict, steps: Tuple[RitualStep, ...]) -> List[Transform]:
+    correspondences = get_correspondences()
+    invoking = spec.get("mode", "banishing") == "invoking"
+    return [
+        _pull(correspondences[Direction[name]].element,
+              100.0 if invoking else EQUILIBRIUM, 0.4 if invoking else 0.5)
+        for name in spec["directions"]
+    ]
+
+def _archangel_transforms(spec: Dict, steps: Tuple[RitualStep, ...]) -> List[Transform]:
+    correspondences = get_correspondences()
+    return [_pull(correspondences[Direction[name]].element, EQUILIBRIUM, 0.35) for name in spec["directions"]]
+
+PHASE_TRANSFORMS: Dict[str, Callable[[Dict, Tuple[RitualStep, ...]], List[Transform]]] = {
+    "cross": _cross_transforms,
+    "pentagrams": _pentagram_transforms,
+    "archangels": _archangel_transforms
+}
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_balance_transforms(ritual_type: str = "LBRP") -> Tuple[np.ndarray, np.ndarray]:
+    """Stacked per-step matrices (steps, 5, 5) and offsets (steps, 5), read-only"""
+    transforms: List[Transform] = []
+    for (_, spec_json), steps in load_compiled_phases(ritual_type):
+        spec = json.loads(spec_json)
+        phase_transforms = PHASE_TRANSFORMS.get(spec["kind"])
+        if phase_transforms is None:
+            transforms.extend(_identity() for _ in steps)
+        else:
+            transforms.extend(phase_transforms(spec, steps))
+    matrices = np.stack([matrix for matrix, _ in transforms])
+    offsets = np.stack([offset for _, offset in transforms])
+    matrices.flags.writeable = False
+    offsets.flags.writeable = False
+    return matrices, offsets
+
+def _advance(state: np.ndarray, matrix: np.ndarray, offset: np.ndarray, noise: np.ndarray) -> np.ndarray:
+    """Apply one step to a (5,) state or a (sessions, 5) batch"""
+    return np.clip(state @ matrix.T + offset + noise, 0.0, 100.0)
+
+def initial_balance(rng: np.random.Generator, sessions: Optional[int] = None) -> np.ndarray:
+    """Random starting state, one row per session when ``sessions`` is given"""
+    shape = len(ELEMENTS) if sessions is None else (sessions, len(ELEMENTS))
+    low, high = INITIAL_RANGE
+    return rng.integers(low, high + 1, size=shape).astype(float)
+
+def simulate_balance(ritual_type: str, initial: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Trajectories of many sessions at once: (sessions, 5) in, (sessions, steps, 5) out"""
+    matrices, offsets = get_balance_transforms(ritual_type)
+    noise = rng.normal(0.0, NOISE, size=(len(matrices),) + initial.shape)
+    trajectory = np.empty((initial.shape[0], len(matrices), len(ELEMENTS)))
+    state = initial
+    for index in range(len(matrices)):
+        state = _advance(state, matrices[index], offsets[index], noise[index])
+        trajectory[:, index] = state
+    return trajectory
+
+def new_balance_seed() -> int:
+    """Fresh entropy for a session's balance generator"""
+    return int(np.random.SeedSequence().entropy)
+
+class BalanceModel:
+    """One session's balance trajectories, extended lazily as its cursor advances
+
+    Everything derives from ``seed``, so a model rebuilt from the same seed
+    (e.g. after resuming a journaled session) reproduces the same values.
+    """
+
+    __slots__ = ("seed", "initial", "_trajectories")
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = new_balance_seed() if seed is None else seed
+        self.initial = initial_balance(np.random.default_rng(self.seed))
+        # ritual_type -> [generator, states (steps, 5), steps computed so far]
+        self._trajectories: Dict[str, List] = {}
+
+    def state(self, ritual_type: str, step: int) -> np.ndarray:
+        """State after applying steps ``0..step`` (clamped to the sequence)"""
+        matrices, offsets = get_balance_transforms(ritual_type)
+        trajectory = self._trajectories.get(ritual_type)
+        if trajectory is None:
+            sequence = np.random.SeedSequence(self.seed, spawn_key=(zlib.crc32(ritual_type.encode()),))
+            trajectory = [np.random.default_rng(sequence), np.empty((len(matrices), len(ELEMENTS))), 0]
+            self._trajectories[ritual_type] = trajectory
+
+        rng, states, reached = trajectory
+        step = min(max(step, 0), len(matrices) - 1)
+        if step >= reached:
+            state = states[reached - 1] if reached else self.initial
+            for index in range(reached, step + 1):
+                state = states[index] = _advance(
+                    state, matrices[index], offsets[index], rng.normal(0.0, NOISE, len(ELEMENTS))
+                )
+            trajectory[2] = step + 1
+        return states[step]
+
+    def balance(self, ritual_type: str, step: int) -> Tuple[int, ...]:
+        """Rounded percentages for the balance panel"""
+        return tuple(int(round(value)) for value in self.state(ritual_type, step))
@@ -0,0 +1,231 @@
+"""Command-line entry point for headless ritual exports, compilation, simulation, static builds and the API"""
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .compiler import available_rituals, load_compiled
+from .export import stream_export
+from .simulator import RITUAL_TYPES, get_step_catalog
+
+Configuration = Tuple[str, int]
+
+def iter_configurations(ritual_types: Sequence[str], repeat: int = 1) -> Iterator[Configuration]:
+    """Yield (ritual_type, current_step) for every step of every ritual, ``repeat`` times"""
+    for _ in range(repeat):
+        for ritual_type in ritual_types:
+            for current_step in range(len(get_step_catalog(ritual_type))):
+                yield ritual_type, current_step
+
+def read_configurations(path: str) -> Iterator[Configuration]:
+    """Stream configurations from a JSONL file of {"ritual_type", "current_step"} objects
+    
+    Unknown ritual types and steps outside the ritual raise ``ValueError``
+    naming the offending line.
+    """
+    with open(path, encoding="utf-8") as fp:
+        for lineno, line in enumerate(fp, 1):
+            if line.strip():
+                config = json.loads(line)
+                ritual_type, current_step = config.get("ritual_type", "LBRP"), int(config["current_step"])
+                if ritual_type not in RITUAL_TYPES:
+                    raise ValueError(f"{path}:{lineno}: unknown ritual type {ritual_type!r} "
+                                     f"(expected one of {', '.join(RITUAL_TYPES)})")
+                total = len(get_step_catalog(ritual_type))
+                if not 0 <= current_step < total:
+                    raise ValueError(f"{path}:{lineno}: step {current_step} is outside {ritual_type} "
+                                     f"(0-{total - 1})")
+                yield ritual_type, current_step
+
+def _chunked(configs: Iterable[Configuration], size: int) -> Iterator[List[Configuration]]:
+    iterator = iter(configs)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _export_chunk(chunk: List[Configuration], timestamp: Optional[str]) -> bytes:
+    """Worker: render one chunk of configurations to NDJSON bytes"""
+    buffer = io.BytesIO()
+    stream_export(chunk, buffer, timestamp=timestamp)
+    return buffer.getvalue()
+
+def bulk_export(configs: Iterable[Configuration], output: str, workers: int = 1,
+                chunk_size: int = 500, timestamp: Optional[str] = None) -> Tuple[int, int]:
+    """Export configurations to ``output`` in order, returning (records, bytes written)
+
+    Chunks are rendered across a process pool with a bounded number in flight,
+    so memory stays flat no matter how many configurations are streamed.
+    A ``.gz`` output path is gzip-compressed.
+    """
+    opener = gzip.open if output.endswith(".gz") else open
+    records = written = 0
+    with opener(output, "wb") as out:
+        if workers <= 1:
+            for chunk in _chunked(configs, chunk_size):
+                written += out.write(_export_chunk(chunk, timestamp))
+                records += len(chunk)
+            return records, written
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in _chunked(configs, chunk_size):
+                pending.append((len(chunk), pool.submit(_export_chunk, chunk, timestamp)))
+                if len(pending) >= workers * 2:
+                    count, future = pending.popleft()
+                    written += out.write(future.result())
+                    records += count
+            while pending:
+                count, future = pending.popleft()
+                written += out.write(future.result())
+                records += count
+    return records, written
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    if args.config_file:
+        configs = read_configurations(args.config_file)
+    else:
+        configs = iter_configurations(args.ritual_type or RITUAL_TYPES, args.repeat)
+
+    start = time.perf_counter()
+    records, written = bulk_export(
+        configs, args.output, workers=args.workers,
+        chunk_size=args.chunk_size, timestamp=args.timestamp
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Exported {records} transcripts ({written / 1024:.1f} KiB) to {args.output} "
+          f"in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+def _cmd_compile(args: argparse.Namespace) -> int:
+    for name in args.ritual or available_rituals():
+        start = time.perf_counter()
+        steps = load_compiled(name)
+        print(f"{name}: {len(steps)} steps ready in {(time.perf_counter() - start) * 1e3:.1f} ms",
+              file=sys.stderr)
+    return 0
+
+def _cmd_simulate(args: argparse.Namespace) -> int:
+    from .markov import DEFAULT_RETRY, exact_statistics, monte_carlo
+    
+    retry = DEFAULT_RETRY if args.retry is None else args.retry
+    start = time.perf_counter()
+    simulated = monte_carlo(
+        args.ritual_type, args.paths, seed=args.seed, retry=retry,
+        workers=args.workers, chunk_size=args.chunk_size
+    )
+    elapsed = time.perf_counter() - start
+    simulated.pop("steps_histogram")
+    print(json.dumps({"exact": exact_statistics(args.ritual_type, retry), "simulated": simulated}, indent=2))
+    print(f"Simulated {args.paths} paths in {elapsed:.2f}s ({args.paths / elapsed:,.0f} paths/s)", file=sys.stderr)
+    return 0
+
+def _cmd_ingest(args: argparse.Namespace) -> int:
+    from .analytics import ingest
+    
+    start = time.perf_counter()
+    totals = ingest(args.sources, args.output, workers=args.workers,
+                    files_per_task=args.files_per_task, batch_rows=args.batch_rows)
+    elapsed = time.perf_counter() - start
+    print(f"Ingested {totals['records']} records ({totals['rows']} steps) from {totals['files']} files "
+          f"into {totals['parts']} parts in {elapsed:.2f}s; {totals['errors']} unreadable files",
+          file=sys.stderr)
+    return 0
+
+def _cmd_funnel(args: argparse.Namespace) -> int:
+    from .analytics import completion_funnel
+    
+    funnel = completion_funnel(args.dataset)
+    print(funnel.to_csv(index=False) if args.csv else funnel.to_string(index=False))
+    return 0
+
+def _cmd_build(args: argparse.Namespace) -> int:
+    from .static_build import build_static_site
+    
+    report = build_static_site(args.output, args.ritual_type, clean=args.clean)
+    for entry in report["files"]:
+        print(f"{entry['path']:<40} {entry['bytes'] / 1024:>8.1f} KiB {entry['gzip_bytes'] / 1024:>8.1f} KiB gzip",
+              file=sys.stderr)
+    print(f"Built {len(report['files'])} files ({report['total_bytes'] / 1024:.1f} KiB, "
+          f"{report['total_gzip_bytes'] / 1024:.1f} KiB gzipped) into {args.output} "
+          f"in {report['build_seconds'] * 1e3:.0f} ms", file=sys.stderr)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, indent=2)
+    return 0
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    from .api import serve
+    
+    print(f"Serving the ritual API on http://{args.host}:{args.port}/rituals", file=sys.stderr)
+    serve(args.host, args.port)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m lbrp_engine", description="Headless LBRP ritual engine")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Bulk-export ritual transcripts as NDJSON")
+    export.add_argument("-o", "--output", required=True, help="Output path; a .gz suffix enables gzip")
+    export.add_argument("--ritual-type", action="append", choices=RITUAL_TYPES,
+                        help="Ritual type to export (repeatable, default: all)")
+    export.add_argument("--repeat", type=int, default=1, help="Repeat the step grid N times")
+    export.add_argument("--config-file", help="JSONL file of {ritual_type, current_step} configurations")
+    export.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    export.add_argument("--chunk-size", type=int, default=500, help="Configurations per worker task")
+    export.add_argument("--timestamp", help="Fixed timestamp for reproducible output")
+    export.set_defaults(handler=_cmd_export)
+
+    compile_ = commands.add_parser("compile", help="Compile ritual definitions into the on-disk cache")
+    compile_.add_argument("ritual", nargs="*", help="Ritual names (default: all definitions)")
+    compile_.set_defaults(handler=_cmd_compile)
+
+    simulate = commands.add_parser("simulate", help="Markov completion statistics, exact and Monte Carlo")
+    simulate.add_argument("--ritual-type", choices=RITUAL_TYPES, default="LBRP", help="Ritual type to model")
+    simulate.add_argument("--paths", type=int, default=1_000_000, help="Paths to simulate")
+    simulate.add_argument("--retry", type=float,
+                          help="Share of failed phases that are repeated rather than abandoned (default: 0.5)")
+    simulate.add_argument("--seed", type=int, help="Seed for reproducible runs")
+    simulate.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    simulate.add_argument("--chunk-size", type=int, default=250_000, help="Paths per worker task")
+    simulate.set_defaults(handler=_cmd_simulate)
+
+    ingest = commands.add_parser("ingest", help="Normalize exported records into a Parquet dataset")
+    ingest.add_argument("sources", nargs="+", help="Export files or directories (.json, .ndjson, .gz)")
+    ingest.add_argument("-o", "--output", required=True, help="Dataset directory")
+    ingest.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    ingest.add_argument("--files-per-task", type=int, default=256, help="Files parsed per worker task")
+    ingest.add_argument("--batch-rows", type=int, default=100_000, help="Maximum rows per Parquet part")
+    ingest.set_defaults(handler=_cmd_ingest)
+
+    funnel = commands.add_parser("funnel", help="Phase completion funnel of an ingested dataset")
+    funnel.add_argument("dataset", help="Dataset directory written by ingest")
+    funnel.add_argument("--csv", action="store_true", help="Print CSV instead of a table")
+    funnel.set_defaults(handler=_cmd_funnel)
+
+    build = commands.add_parser("build", help="Pre-render every ritual into a static, content-hashed site")
+    build.add_argument("-o", "--output", required=True, help="Output directory")
+    build.add_argument("--ritual-type", action="append", choices=RITUAL_TYPES,
+                       help="Ritual type to build (repeatable, default: all)")
+    build.add_argument("--clean", action="store_true", help="Remove hashed assets of earlier builds")
+    build.add_argument("--report", help="Also write the size and build-time report as JSON here")
+    build.set_defaults(handler=_cmd_build)
+
+    serve = commands.add_parser("serve", help="Serve ritual steps over a read-only HTTP API")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    serve.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    serve.set_defaults(handler=_cmd_serve)
+
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
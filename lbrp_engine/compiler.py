@@ -0,0 +1,287 @@
+"""Declarative ritual definitions compiled to step sequences, cached on disk
+
+Rituals are JSON files in ``lbrp_engine/rituals`` (or ``LBRP_RITUALS_DIR``).
+A definition lists phases, each handled by a phase compiler keyed by its
+``kind``; ``extends`` inherits another definition, overriding its top-level
+keys and, through ``phase_overrides``, individual phase specs by name.
+
+A derived ritual is compiled as a delta over its base: a phase whose spec and
+starting offset match the base reuses the base's step objects, and only the
+changed phases are compiled (and rendered downstream).
+
+Compiled sequences are pickled to ``LBRP_CACHE_DIR`` (default
+``~/.cache/lbrp_engine``) under a hash of the resolved definition and the
+engine sources that shape a step, so a changed definition or generator is
+recompiled and a new process otherwise just loads the bundle. Bundles of
+derived rituals store only their own phases.
+"""
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import replace
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .correspondences import get_archangels, get_correspondences, get_cross_steps
+from .generators import HTMLGenerator
+from .instrumentation import register_cache
+from .models import Direction, RitualStep
+
+# (offset of the phase's first step, canonical spec JSON) -> compiled phase steps
+PhaseKey = Tuple[int, str]
+CompiledPhases = Tuple[Tuple[PhaseKey, Tuple[RitualStep, ...]], ...]
+
+RITUALS_DIR = os.environ.get("LBRP_RITUALS_DIR", os.path.join(os.path.dirname(__file__), "rituals"))
+CACHE_DIR = os.environ.get("LBRP_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "lbrp_engine"))
+
+# Guided-practice seconds per step when a phase sets no ``step_seconds``
+DEFAULT_STEP_SECONDS = 15.0
+
+# Named HTML blocks a static step may reference
+STATIC_HTML: Dict[str, Callable[[], str]] = {
+    "preparation": HTMLGenerator.generate_preparation
+}
+
+def _pentagram_html(direction: Direction, divine_name: str, step_num: int, mode: str) -> str:
+    entity = replace(get_correspondences()[direction], divine_name=divine_name)
+    return HTMLGenerator.generate_pentagram(direction, entity, step_num, mode)
+
+# Generators behind a step's HTML reference ("kind", *args)
+HTML_SOURCES: Dict[str, Callable[..., str]] = {
+    "static": lambda name: STATIC_HTML[name](),
+    "cross": HTMLGenerator.generate_cross_step,
+    "pentagram": _pentagram_html,
+    "archangel": lambda direction: HTMLGenerator.generate_archangel(direction, get_archangels()[direction])
+}
+
+# Markup behind the references of every loaded bundle, rendered once at compile
+# time so resolving a compiled step never runs the (NumPy-backed) generators
+PRERENDERED_HTML: Dict[tuple, str] = {}
+
+def available_rituals() -> List[str]:
+    """Names of every ritual definition on disk"""
+    names = []
+    for filename in sorted(os.listdir(RITUALS_DIR)):
+        if filename.endswith(".json"):
+            with open(os.path.join(RITUALS_DIR, filename), encoding="utf-8") as fp:
+                names.append(json.load(fp)["name"])
+    return names
+
+@lru_cache(maxsize=None)
+def _read_definition(name: str) -> str:
+    filename = f"{name.lower()}.json"
+    if filename not in os.listdir(RITUALS_DIR):  # never join an arbitrary name into a path
+        raise ValueError(f"Unknown ritual type: {name}")
+    with open(os.path.join(RITUALS_DIR, filename), encoding="utf-8") as fp:
+        return fp.read()
+
+def load_definition(name: str) -> Dict:
+    """Load a ritual definition, resolving ``extends`` chains and phase overrides
+    
+    A derived definition records its parent under ``base``.
+    """
+    definition = json.loads(_read_definition(name))
+    parent = definition.pop("extends", None)
+    if parent is None:
+        return definition
+    if parent == name:
+        raise ValueError(f"Ritual {name} cannot extend itself")
+    
+    overrides = definition.pop("phase_overrides", {})
+    resolved = load_definition(parent)
+    resolved.update(definition)
+    resolved["base"] = parent
+    resolved["phases"] = [
+        {**spec, **overrides[spec["phase"]]} if spec["phase"] in overrides else spec
+        for spec in resolved["phases"]
+    ]
+    unknown = set(overrides) - {spec["phase"] for spec in resolved["phases"]}
+    if unknown:
+        raise ValueError(f"Ritual {name} overrides unknown phases: {', '.join(sorted(unknown))}")
+    return resolved
+
+@lru_cache(maxsize=None)
+def _sources_digest() -> str:
+    # Every engine module, so no change to code that shapes a bundle can leave a stale one behind
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(__file__)
+    for filename in sorted(f for f in os.listdir(package_dir) if f.endswith(".py")):
+        digest.update(filename.encode())
+        with open(os.path.join(package_dir, filename), "rb") as fp:
+            digest.update(fp.read())
+    return digest.hexdigest()
+
+def definition_hash(definition: Dict) -> str:
+    """Content hash of a resolved definition and the engine code that compiles it"""
+    digest = hashlib.sha256(_sources_digest().encode())
+    digest.update(json.dumps(definition, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+# ==================== PHASE COMPILERS ====================
+def _compile_static(spec: Dict, steps: List[RitualStep]) -> List[RitualStep]:
+    compiled = []
+    for step in spec["steps"]:
+        html = step.get("html_content", "")
+        if "html" in step:
+            html = ("static", step["html"])
+        compiled.append(RitualStep(
+            spec["phase"], len(steps) + len(compiled) + 1, step["title"], step["description"],
+            vibration=step.get("vibration", ""),
+            gesture=step.get("gesture", ""),
+            visualization=step.get("visualization", ""),
+            html=html,
+            duration=step.get("duration", spec.get("step_seconds", DEFAULT_STEP_SECONDS))
+        ))
+    return compiled
+
+def _compile_cross(spec: Dict, steps: List[RitualStep]) -> List[RitualStep]:
+    compiled = []
+    amplified = spec.get("amplified", False)
+    duration = spec.get("step_seconds", DEFAULT_STEP_SECONDS)
+
+    for i, (vibration, gesture, sephira_desc, visualization, sephira) in enumerate(get_cross_steps(), 1):
+        vis = f"{visualization} - Amplified" if amplified else visualization
+        title = f"{vibration.split(' ')[0]} (Closing)" if amplified else vibration.split(' ')[0]
+        desc = f"Repeating {vibration} with enhanced resonance" if amplified else f"{sephira_desc}: {vibration}"
+
+        compiled.append(RitualStep(
+            spec["phase"], len(compiled) + 1, title, desc,
+            vibration=vibration, gesture=gesture, visualization=vis,
+            sephira=sephira,
+            html=("cross", i, vibration, sephira),
+            duration=duration
+        ))
+    return compiled
+
+def _compile_pentagrams(spec: Dict, steps: List[RitualStep]) -> List[RitualStep]:
+    compiled = []
+    correspondences = get_correspondences()
+    mode = spec.get("mode", "banishing")
+    kind = "" if mode == "banishing" else f"{mode} "
+    divine_names = spec.get("divine_names", {})
+
+    for i, name in enumerate(spec["directions"], 1):
+        direction = Direction[name]
+        entity = correspondences[direction]
+        if name in divine_names:
+            entity = replace(entity, divine_name=divine_names[name])
+        compiled.append(RitualStep(
+            spec["phase"], len(steps) + len(compiled) + 1,
+            f"{direction.display_name} {kind.title()}Pentagram",
+            f"Drawing {entity.element.value} {kind}pentagram with divine name {entity.divine_name}",
+            vibration=entity.divine_name,
+            gesture=spec.get("gesture", ""),
+            visualization=f"{entity.color} flame forming pentagram",
+            sephira=entity.sephira,
+            html=("pentagram", direction, entity.divine_name, i, mode),
+            duration=spec.get("step_seconds", DEFAULT_STEP_SECONDS)
+        ))
+    return compiled
+
+def _compile_archangels(spec: Dict, steps: List[RitualStep]) -> List[RitualStep]:
+    compiled = []
+    archangels = get_archangels()
+
+    for name in spec["directions"]:
+        direction = Direction[name]
+        archangel = archangels[direction]
+        compiled.append(RitualStep(
+            spec["phase"], len(steps) + len(compiled) + 1,
+            f"{archangel['name']} ({archangel['hebrew']})",
+            f"{spec['positions'][name]}, {archangel['name']}: {archangel['attributes']}",
+            vibration=archangel['name'],
+            visualization=f"Visualize {archangel['name']} in {archangel['colors']} light",
+            html=("archangel", direction),
+            duration=spec.get("step_seconds", DEFAULT_STEP_SECONDS)
+        ))
+    return compiled
+
+PHASE_COMPILERS: Dict[str, Callable[[Dict, List[RitualStep]], List[RitualStep]]] = {
+    "static": _compile_static,
+    "cross": _compile_cross,
+    "pentagrams": _compile_pentagrams,
+    "archangels": _compile_archangels
+}
+
+def compile_phases(definition: Dict, reuse: Optional[Dict[PhaseKey, Tuple[RitualStep, ...]]] = None) -> CompiledPhases:
+    """Compile a resolved definition phase by phase, reusing identical phases from ``reuse``"""
+    reuse = reuse or {}
+    phases = []
+    steps = []
+    for spec in definition["phases"]:
+        key = (len(steps), json.dumps(spec, sort_keys=True, ensure_ascii=False))
+        phase_steps = reuse.get(key)
+        if phase_steps is None:
+            compiler = PHASE_COMPILERS.get(spec["kind"])
+            if compiler is None:
+                raise ValueError(f"Unknown phase kind {spec['kind']!r} in ritual {definition['name']}")
+            phase_steps = tuple(compiler(spec, steps))
+        phases.append((key, phase_steps))
+        steps.extend(phase_steps)
+    return tuple(phases)
+
+def compile_ritual(definition: Dict) -> List[RitualStep]:
+    """Compile a resolved definition into its step sequence"""
+    return [step for _, phase_steps in compile_phases(definition) for step in phase_steps]
+
+# ==================== DISK CACHE ====================
+def _bundle_path(name: str, content_hash: str) -> str:
+    return os.path.join(CACHE_DIR, f"{name.lower()}-{content_hash[:16]}.pickle")
+
+@register_cache
+@lru_cache(maxsize=None)
+def load_compiled_phases(name: str) -> CompiledPhases:
+    """Load a ritual's compiled phases from the disk cache, compiling only what is missing
+    
+    Phases shared with the base ritual are taken from the base's own compiled
+    phases, so both sequences reference the same step objects.
+    """
+    definition = load_definition(name)
+    base = definition.get("base")
+    reuse = dict(load_compiled_phases(base)) if base else {}
+    content_hash = definition_hash(definition)
+    path = _bundle_path(name, content_hash)
+
+    try:
+        with open(path, "rb") as fp:
+            bundle = pickle.load(fp)
+        if bundle["hash"] == content_hash:
+            PRERENDERED_HTML.update(bundle["markup"])
+            return tuple(
+                (key, reuse[key] if phase_steps is None else phase_steps)
+                for key, phase_steps in bundle["phases"]
+            )
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+        pass
+
+    phases = compile_phases(definition, reuse)
+    own_phases = [(key, None if reuse.get(key) is phase_steps else phase_steps) for key, phase_steps in phases]
+    markup = {
+        step.html: HTML_SOURCES[step.html[0]](*step.html[1:])
+        for _, phase_steps in own_phases if phase_steps is not None
+        for step in phase_steps if isinstance(step.html, tuple)
+    }
+    PRERENDERED_HTML.update(markup)
+    _store(name, path, {"hash": content_hash, "phases": own_phases, "markup": markup})
+    return phases
+
+def load_compiled(name: str) -> Tuple[RitualStep, ...]:
+    """Load a ritual's compiled step sequence (see ``load_compiled_phases``)"""
+    return tuple(step for _, phase_steps in load_compiled_phases(name) for step in phase_steps)
+
+def _store(name: str, path: str, bundle: Dict) -> None:
+    """Atomically write a bundle and drop stale bundles of the same ritual (best effort)"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fp:
+            pickle.dump(bundle, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        prefix = f"{name.lower()}-"
+        for filename in os.listdir(CACHE_DIR):
+            stale = os.path.join(CACHE_DIR, filename)
+            if filename.startswith(prefix) and filename.endswith(".pickle") and stale != path:
+                os.remove(stale)
+    except OSError:
+        pass
@@ -0,0 +1,231 @@
+"""One indexed store over every correspondence table, with step lookups
+
+The quarters (``get_correspondences``), archangels (``get_archangels``),
+cross vibrations (``get_cross_steps``) and the sephirot themselves are
+flattened into ``Correspondence`` records. Secondary indexes map a folded
+key to record positions for each of ``FIELDS``, so a lookup is a dictionary
+access plus the k matching records.
+
+Keys are folded so spelling variants meet: Hebrew loses its vowel points and
+final letter forms (אַתָּה and אתה, ם and מ), Latin text loses case,
+diacritics and punctuation, and a few transliteration variants are merged
+(ph/f, w/v, b/v, th/t, kh/ch), so "Geburah" finds Gevurah and "YHWH" finds
+YHVH. Names written as ``"LATIN (עברית)"`` are indexed under both parts.
+
+Steps of a ritual are linked to records through their vibration (a divine
+name, archangel or cross word) and sephira, and indexed per ritual type on
+first use.
+"""
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .correspondences import SEPHIRA_COLORS, get_archangels, get_correspondences, get_cross_steps
+from .instrumentation import register_cache
+from .models import Direction, Element, KabbalisticEntity, Sephira
+
+FIELDS = ("kind", "sephira", "element", "direction", "letter", "name")
+
+_HEBREW_MARKS = re.compile("[֑-ׇ]")
+_HEBREW_LETTERS = re.compile("[א-ת]+")
+_FINAL_FORMS = str.maketrans("ךםןףץ", "כמנפצ")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_LATIN_VARIANTS = (("ph", "f"), ("w", "v"), ("b", "v"), ("th", "t"), ("kh", "ch"))
+
+class Correspondence(NamedTuple):
+    """One entity of the correspondence tables"""
+    kind: str                     # "quarter", "archangel", "cross" or "sephira"
+    name: str                     # Latin name as written in the tables
+    hebrew: str = ""
+    direction: Optional[Direction] = None
+    element: Optional[Element] = None
+    sephira: Optional[Sephira] = None
+    letter: str = ""              # Hebrew letter of the quarter's divine name
+    color: str = ""
+    details: Tuple[Tuple[str, str], ...] = ()
+
+class SearchResult(NamedTuple):
+    records: Tuple[Correspondence, ...]
+    steps: Tuple[int, ...]        # positions in the ritual's step catalog
+
+def fold_hebrew(text: str) -> str:
+    """Hebrew letters only, without vowel points or final forms"""
+    return "".join(_HEBREW_LETTERS.findall(_HEBREW_MARKS.sub("", text))).translate(_FINAL_FORMS)
+
+def fold_latin(text: str) -> str:
+    """Lowercase ASCII letters and digits with common transliteration variants merged"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = _NON_ALNUM.sub("", "".join(c for c in decomposed if not unicodedata.combining(c)).casefold())
+    for variant, canonical in _LATIN_VARIANTS:
+        folded = folded.replace(variant, canonical)
+    return folded
+
+def fold(value) -> str:
+    """Index key of a field value, an enum member or free text"""
+    if isinstance(value, Direction):
+        value = value.display_name
+    elif isinstance(value, (Element, Sephira)):
+        value = value.value
+    text = str(value)
+    hebrew = fold_hebrew(text)
+    return hebrew if hebrew and not fold_latin(text) else fold_latin(text)
+
+def _name_keys(*names: str) -> List[str]:
+    """Keys for names like ``"YHVH (יהוה)"``: the Latin part, the Hebrew part and each word"""
+    keys = []
+    for name in names:
+        latin = _HEBREW_LETTERS.sub(" ", _HEBREW_MARKS.sub("", name))
+        words = [fold_latin(word) for word in re.split(r"[\s,()-]+", latin)]
+        keys += [fold_latin(latin), fold_hebrew(name), *words]
+    return [key for key in dict.fromkeys(keys) if key]
+
+def _record_keys(record: Correspondence) -> Dict[str, List[str]]:
+    keys = {
+        "kind": [record.kind],
+        "sephira": [fold(record.sephira)] if record.sephira else [],
+        "element": [fold(record.element)] if record.element else [],
+        "direction": [fold(record.direction)] if record.direction else [],
+        "letter": [fold_hebrew(record.letter)] if record.letter else [],
+        "name": _name_keys(record.name, record.hebrew)
+    }
+    if record.kind == "sephira":
+        keys["name"] = []  # a sephira is found through its field, not as a second name
+    return keys
+
+class CorrespondenceIndex:
+    """Correspondence records with a secondary index per field"""
+
+    def __init__(self, records: Iterable[Correspondence]):
+        self.records: Tuple[Correspondence, ...] = tuple(records)
+        indexes: Dict[str, Dict[str, List[int]]] = {field: {} for field in FIELDS}
+        for position, record in enumerate(self.records):
+            for field, keys in _record_keys(record).items():
+                index = indexes[field]
+                for key in keys:
+                    index.setdefault(key, []).append(position)
+        self._indexes: Dict[str, Dict[str, Tuple[int, ...]]] = {
+            field: {key: tuple(positions) for key, positions in index.items()}
+            for field, index in indexes.items()
+        }
+        # Free-text search matches a term in any field
+        terms: Dict[str, set] = {}
+        for index in self._indexes.values():
+            for key, positions in index.items():
+                terms.setdefault(key, set()).update(positions)
+        self._terms = {key: tuple(sorted(positions)) for key, positions in terms.items()}
+        self._step_indexes: Dict[str, Dict[str, Dict[str, Tuple[int, ...]]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_tables(cls, quarters: Dict[Direction, KabbalisticEntity], archangels: Dict[Direction, Dict],
+                    cross_steps: List[Tuple], sephira_colors: Dict[Sephira, str]) -> "CorrespondenceIndex":
+        records = []
+        for direction, entity in quarters.items():
+            latin, _, hebrew = entity.divine_name.partition(" (")
+            records.append(Correspondence(
+                "quarter", latin, hebrew.rstrip(")"), direction, entity.element, entity.sephira,
+                entity.hebrew_letter, direction.color
+            ))
+        for direction, archangel in archangels.items():
+            details = tuple((key, archangel[key]) for key in ("planet", "colors", "attributes", "symbol")
+                            if key in archangel)
+            element = quarters[direction].element if direction in quarters else None
+            records.append(Correspondence(
+                "archangel", archangel["name"], archangel["hebrew"], direction, element,
+                color=direction.color, details=details
+            ))
+        for vibration, gesture, sephira_desc, visualization, sephira in cross_steps:
+            latin, _, hebrew = vibration.partition(" (")
+            records.append(Correspondence(
+                "cross", latin, hebrew.rstrip(")"), sephira=sephira, color=sephira_colors.get(sephira, ""),
+                details=(("gesture", gesture), ("meaning", sephira_desc), ("visualization", visualization))
+            ))
+        for sephira, color in sephira_colors.items():
+            records.append(Correspondence("sephira", sephira.value, sephira=sephira, color=color))
+        return cls(records)
+
+    # ---------- entities ----------
+    def lookup(self, field: str, value, kind: str = "") -> Tuple[Correspondence, ...]:
+        """Records whose ``field`` matches ``value`` (optionally of one kind), in table order"""
+        if field not in self._indexes:
+            raise ValueError(f"Unknown field {field!r}; expected one of {', '.join(FIELDS)}")
+        records = self.records
+        matches = (records[position] for position in self._indexes[field].get(fold(value), ()))
+        return tuple(record for record in matches if not kind or record.kind == kind)
+
+    def first(self, field: str, value, kind: str = "") -> Optional[Correspondence]:
+        """The first matching record, or None"""
+        matches = self.lookup(field, value, kind)
+        return matches[0] if matches else None
+
+    def of_kind(self, kind: str) -> Tuple[Correspondence, ...]:
+        return self.lookup("kind", kind)
+
+    def search(self, text: str, ritual_type: Optional[str] = None) -> SearchResult:
+        """Records matching every word of ``text`` in any field, and the steps touching them"""
+        positions: Optional[set] = None
+        for word in re.split(r"[\s,]+", text.strip()):
+            key = fold(word)
+            if not key:
+                continue
+            matched = set(self._terms.get(key, ()))
+            positions = matched if positions is None else positions & matched
+            if not positions:
+                break
+        records = tuple(self.records[position] for position in sorted(positions or ()))
+        if ritual_type is None or not records:
+            return SearchResult(records, ())
+        steps = set()
+        for record in records:
+            steps.update(self._record_steps(ritual_type, record))
+        return SearchResult(records, tuple(sorted(steps)))
+
+    # ---------- steps ----------
+    def steps(self, ritual_type: str, field: str, value) -> Tuple[int, ...]:
+        """Positions in ``ritual_type``'s catalog of the steps whose records match ``field``"""
+        if field not in self._indexes:
+            raise ValueError(f"Unknown field {field!r}; expected one of {', '.join(FIELDS)}")
+        return self._steps_index(ritual_type)[field].get(fold(value), ())
+
+    def _record_steps(self, ritual_type: str, record: Correspondence) -> Tuple[int, ...]:
+        if record.kind == "sephira":
+            return self.steps(ritual_type, "sephira", record.sephira)
+        keys = _name_keys(record.name, record.hebrew)
+        return self._steps_index(ritual_type)["name"].get(keys[0], ()) if keys else ()
+
+    def _steps_index(self, ritual_type: str) -> Dict[str, Dict[str, Tuple[int, ...]]]:
+        index = self._step_indexes.get(ritual_type)
+        if index is None:
+            from .simulator import get_step_catalog  # compiled lazily; the generators import this module
+
+            with self._lock:
+                index = self._step_indexes.get(ritual_type)
+                if index is None:
+                    index = self._step_indexes[ritual_type] = self._index_steps(get_step_catalog(ritual_type))
+        return index
+
+    def _index_steps(self, steps) -> Dict[str, Dict[str, Tuple[int, ...]]]:
+        index: Dict[str, Dict[str, List[int]]] = {field: {} for field in FIELDS}
+        for position, step in enumerate(steps):
+            keys: Dict[str, set] = {field: set() for field in FIELDS}
+            if step.sephira is not None:
+                keys["sephira"].add(fold(step.sephira))
+            for name_key in _name_keys(step.vibration)[:2]:
+                for record_position in self._indexes["name"].get(name_key, ()):
+                    for field, values in _record_keys(self.records[record_position]).items():
+                        keys[field].update(values)
+            for field, values in keys.items():
+                for key in values:
+                    index[field].setdefault(key, []).append(position)
+        return {field: {key: tuple(positions) for key, positions in keys.items()}
+                for field, keys in index.items()}
+
+@register_cache
+@lru_cache(maxsize=1)
+def get_correspondence_index() -> CorrespondenceIndex:
+    """Process-wide index over the cached correspondence tables"""
+    return CorrespondenceIndex.from_tables(
+        get_correspondences(), get_archangels(), get_cross_steps(), SEPHIRA_COLORS
+    )
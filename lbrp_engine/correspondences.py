@@ -0,0 +1,97 @@
+"""Cached Kabbalistic correspondence tables"""
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .instrumentation import register_cache
+from .models import Direction, Element, KabbalisticEntity, Sephira
+
+# Color of each sephira on the Tree of Life (matches the CSS custom properties)
+SEPHIRA_COLORS: Dict[Sephira, str] = {
+    Sephira.KETER: "#ffffff",
+    Sephira.CHESED: "#4169e1",
+    Sephira.GEVURAH: "#dc143c",
+    Sephira.TIFERET: "#ffd700",
+    Sephira.MALKUTH: "#228b22"
+}
+# Display name of each quarter's color
+DIRECTION_COLOR_NAMES: Dict[Direction, str] = {
+    Direction.EAST: "Blue",
+    Direction.SOUTH: "Red",
+    Direction.WEST: "Blue",
+    Direction.NORTH: "Brown"
+}
+
+@register_cache
+@lru_cache(maxsize=1)
+def get_correspondences() -> Dict[Direction, KabbalisticEntity]:
+    """Cache correspondences to avoid recreation"""
+    return {
+        Direction.EAST: KabbalisticEntity(
+            "Air", Sephira.KETER, "YHVH (יהוה)", Element.AIR, Direction.EAST, "י"
+        ),
+        Direction.SOUTH: KabbalisticEntity(
+            "Fire", Sephira.GEVURAH, "ADONAI (אדני)", Element.FIRE, Direction.SOUTH, "ה"
+        ),
+        Direction.WEST: KabbalisticEntity(
+            "Water", Sephira.CHESED, "EHEIEH (אהיה)", Element.WATER, Direction.WEST, "ו"
+        ),
+        Direction.NORTH: KabbalisticEntity(
+            "Earth", Sephira.MALKUTH, "AGLA (אגלא)", Element.EARTH, Direction.NORTH, "ה"
+        )
+    }
+
+@register_cache
+@lru_cache(maxsize=1)
+def get_archangels() -> Dict[Direction, Dict]:
+    """Cache archangel data"""
+    return {
+        Direction.EAST: {
+            "name": "Raphael",
+            "planet": "Mercury",
+            "colors": "Yellow-Purple",
+            "attributes": "Healing, Wisdom, Air",
+            "hebrew": "רפאל",
+            "symbol": "⚗️"
+        },
+        Direction.SOUTH: {
+            "name": "Michael",
+            "planet": "Sun",
+            "colors": "Red-Green",
+            "attributes": "Protection, Fire, Strength",
+            "hebrew": "מיכאל",
+            "symbol": "⚔️"
+        },
+        Direction.WEST: {
+            "name": "Gabriel",
+            "planet": "Moon",
+            "colors": "Blue-Orange",
+            "attributes": "Strength, Water, Revelation",
+            "hebrew": "גבריאל",
+            "symbol": "🕊️"
+        },
+        Direction.NORTH: {
+            "name": "Uriel",
+            "planet": "Venus",
+            "colors": "Green-Brown",
+            "attributes": "Light, Earth, Wisdom",
+            "hebrew": "אוריאל",
+            "symbol": "🔥"
+        }
+    }
+
+@register_cache
+@lru_cache(maxsize=1)
+def get_cross_steps() -> List[Tuple]:
+    """Cache cross ritual steps"""
+    return [
+        ("ATEH (אַתָּה)", "Touch forehead", "Keter - Divine Will", 
+         "Visualize white light descending", Sephira.KETER),
+        ("MALKUTH (מַלְכוּת)", "Point downward", "Malkuth - Kingdom", 
+         "Draw light to feet, connecting heaven and earth", Sephira.MALKUTH),
+        ("VE-GEBURAH (וְגבוּרָה)", "Touch right shoulder", "Gevurah - Severity/Power", 
+         "Red pillar of strength", Sephira.GEVURAH),
+        ("VE-GEDULAH (וְגדוּלָה)", "Touch left shoulder", "Chesed - Mercy/Glory", 
+         "Blue pillar of mercy", Sephira.CHESED),
+        ("LE-OLAM, AMEN (לעולם, אמן)", "Clasp hands at chest", "Tiferet - Beauty/Harmony", 
+         "Golden glow at heart center", Sephira.TIFERET)
+    ]
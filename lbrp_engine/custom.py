@@ -0,0 +1,206 @@
+"""User-customized ritual sequences, compiled once and kept in a byte-bounded LRU cache
+
+A customization is a small spec over a base ritual::
+
+    {"base": "LBRP",
+     "archangel_order": ["NORTH", "EAST", "SOUTH", "WEST"],
+     "divine_names": {"EAST": "IHVH"},
+     "skip_phases": ["Closing Cross"]}
+
+``canonical_spec`` validates it and drops everything that matches the base
+(a default order, an unchanged name, empty lists), so any two users asking
+for the same sequence get the same key and share one compiled tuple of
+steps. The customized definition is compiled as a delta over the base: a
+phase whose spec and first step number both match the base reuses the base's
+step objects and only costs their references, which is what the cache
+charges against its byte limit. A new archangel order or divine name
+recompiles just its phase, but skipping a phase renumbers every later step,
+so the phases after it are compiled afresh too.
+"""
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, NamedTuple, Tuple
+
+from .compiler import compile_phases, load_compiled_phases, load_definition
+from .correspondences import get_correspondences
+from .instrumentation import register_cache
+from .models import RitualStep
+from .simulator import get_step_catalog
+
+CUSTOM_CACHE_BYTES = int(os.environ.get("LBRP_CUSTOM_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+MAX_DIVINE_NAME = 64
+_MARKUP = frozenset("<>&\"'")
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    max_bytes: int
+    currsize: int    # entries, as for ``functools.lru_cache``
+    bytes: int
+
+class ByteLRUCache:
+    """Thread-safe LRU mapping bounded by the summed size of its values"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], object], sizeof: Callable[[object], int]):
+        """Cached value for ``key``, building and charging it on a miss
+
+        Builds run outside the lock; when two callers race on one key, the
+        first value stored is returned to both. A value larger than the whole
+        budget is returned without being cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = build()
+        size = sizeof(value)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.max_bytes,
+                             len(self._entries), self._bytes)
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# ==================== SPECS ====================
+def _phase_of_kind(definition: Dict, kind: str) -> Dict:
+    for spec in definition["phases"]:
+        if spec["kind"] == kind:
+            return spec
+    raise ValueError(f"Ritual {definition['name']} has no {kind} phase")
+
+def canonical_spec(spec: Dict) -> str:
+    """Validated customization with defaults removed, as a stable JSON key"""
+    base = str(spec.get("base", "LBRP")).upper()
+    definition = load_definition(base)
+    canonical: Dict = {"base": base}
+    unknown = set(spec) - {"base", "archangel_order", "divine_names", "skip_phases"}
+    if unknown:
+        raise ValueError(f"Unknown customization keys: {', '.join(sorted(unknown))}")
+
+    order = [str(name).upper() for name in spec.get("archangel_order") or ()]
+    if order:
+        default = _phase_of_kind(definition, "archangels")["directions"]
+        if sorted(order) != sorted(default):
+            raise ValueError(f"archangel_order must be a permutation of {', '.join(default)}")
+        if order != default:
+            canonical["archangel_order"] = order
+
+    names = {}
+    if spec.get("divine_names"):
+        pentagrams = _phase_of_kind(definition, "pentagrams")
+        defaults = {direction.name: entity.divine_name for direction, entity in get_correspondences().items()}
+        defaults.update(pentagrams.get("divine_names", {}))
+        for direction, name in spec["divine_names"].items():
+            direction, name = str(direction).upper(), " ".join(str(name).split())
+            if direction not in pentagrams["directions"]:
+                raise ValueError(f"No pentagram faces {direction}")
+            if not name or len(name) > MAX_DIVINE_NAME or _MARKUP.intersection(name):
+                raise ValueError(f"Invalid divine name for {direction}: {name!r}")
+            if name != defaults[direction]:
+                names[direction] = name
+    if names:
+        canonical["divine_names"] = names
+
+    skipped = sorted({str(phase) for phase in spec.get("skip_phases") or ()})
+    if skipped:
+        phases = [phase["phase"] for phase in definition["phases"]]
+        missing = set(skipped) - set(phases)
+        if missing:
+            raise ValueError(f"Ritual {base} has no phases {', '.join(sorted(missing))}")
+        if len(skipped) == len(phases):
+            raise ValueError("A customization cannot skip every phase")
+        canonical["skip_phases"] = skipped
+
+    return json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+def custom_definition(key: str) -> Dict:
+    """Resolved ritual definition for a canonical spec"""
+    custom = json.loads(key)
+    definition = load_definition(custom["base"])
+    skipped = set(custom.get("skip_phases", ()))
+    phases = []
+    for spec in definition["phases"]:
+        if spec["phase"] in skipped:
+            continue
+        if spec["kind"] == "archangels" and "archangel_order" in custom:
+            spec = {**spec, "directions": custom["archangel_order"]}
+        elif spec["kind"] == "pentagrams" and "divine_names" in custom:
+            spec = {**spec, "divine_names": {**spec.get("divine_names", {}), **custom["divine_names"]}}
+        phases.append(spec)
+    return {**definition, "name": f"{custom['base']}*", "base": custom["base"], "phases": phases}
+
+def compile_custom(key: str) -> Tuple[RitualStep, ...]:
+    """Compile a canonical spec, reusing the base ritual's phases it leaves unchanged and in place"""
+    definition = custom_definition(key)
+    reuse = dict(load_compiled_phases(definition["base"]))
+    phases = compile_phases(definition, reuse)
+    return tuple(step for _, phase_steps in phases for step in phase_steps)
+
+def sequence_bytes(steps: Tuple[RitualStep, ...], base: Tuple[RitualStep, ...] = ()) -> int:
+    """Memory a compiled sequence adds beyond its base: the tuple, plus every new step and its fields"""
+    shared = {id(step) for step in base}
+    size = sys.getsizeof(steps)
+    for step in steps:
+        if id(step) in shared:
+            continue
+        size += sys.getsizeof(step) + sum(sys.getsizeof(field) for field in step if isinstance(field, (str, tuple)))
+    return size
+
+# ==================== PROCESS-WIDE CACHE ====================
+@lru_cache(maxsize=1)
+def get_sequence_cache() -> ByteLRUCache:
+    """Process-wide cache of custom sequences, bounded by ``LBRP_CUSTOM_CACHE_BYTES``"""
+    cache = ByteLRUCache(CUSTOM_CACHE_BYTES)
+    register_cache(cache, "custom_sequences")
+    return cache
+
+def get_custom_sequence(spec: Dict) -> Tuple[RitualStep, ...]:
+    """Compiled steps of a customization, shared by every user asking for the same one"""
+    key = canonical_spec(spec)
+    base = json.loads(key)["base"]
+    if key == json.dumps({"base": base}, separators=(",", ":")):
+        # No customization left: the shared catalog already is this sequence
+        return get_step_catalog(base)
+
+    def sizeof(steps: Tuple[RitualStep, ...]) -> int:
+        return sequence_bytes(steps, get_step_catalog(base))
+
+    return get_sequence_cache().get_or_build(key, lambda: compile_custom(key), sizeof)
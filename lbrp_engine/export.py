@@ -0,0 +1,75 @@
+"""Ritual record serialization: JSON, NDJSON and streamed gzip exports"""
+import gzip
+import io
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+from .instrumentation import register_cache
+from .models import RitualStep
+from .simulator import get_step_catalog
+
+EXPORT_FORMATS = {
+    "JSON": ("application/json", "json"),
+    "NDJSON": ("application/x-ndjson", "ndjson"),
+    "NDJSON (gzip)": ("application/gzip", "ndjson.gz")
+}
+
+@register_cache
+@lru_cache(maxsize=None)
+def step_json(step: RitualStep) -> str:
+    """Compact JSON of one step's to_dict() payload; steps shared between rituals serialize once"""
+    return json.dumps(step.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_step_json(ritual_type: str = "LBRP") -> Tuple[str, ...]:
+    """Serialize each step's to_dict() payload once per process as compact JSON"""
+    return tuple(step_json(step) for step in get_step_catalog(ritual_type))
+
+def build_ritual_record(ritual_type: str, current_step: int) -> Dict:
+    """Build the downloadable ritual record for a session cursor"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "ritual_type": ritual_type,
+        "steps_completed": current_step + 1,
+        "steps": [step.to_dict() for step in get_step_catalog(ritual_type)[:current_step + 1]]
+    }
+
+def iter_ndjson(sessions: Iterable[Tuple[str, int]], timestamp: Optional[str] = None) -> Iterator[str]:
+    """Yield one compact NDJSON line per (ritual_type, current_step) session
+    
+    A fixed ``timestamp`` makes the output byte-for-byte reproducible.
+    """
+    for ritual_type, current_step in sessions:
+        header = json.dumps({
+            "timestamp": timestamp or datetime.now().isoformat(),
+            "ritual_type": ritual_type,
+            "steps_completed": current_step + 1
+        }, separators=(",", ":"))
+        steps = ",".join(get_step_json(ritual_type)[:current_step + 1])
+        yield f'{header[:-1]},"steps":[{steps}]}}\n'
+
+def stream_export(sessions: Iterable[Tuple[str, int]], fp: BinaryIO, compress: bool = False,
+                  timestamp: Optional[str] = None) -> int:
+    """Stream NDJSON records to a binary file object, returning uncompressed bytes written"""
+    out = gzip.GzipFile(fileobj=fp, mode="wb", mtime=0) if compress else fp
+    written = 0
+    try:
+        for line in iter_ndjson(sessions, timestamp):
+            written += out.write(line.encode("utf-8"))
+    finally:
+        if compress:
+            out.close()
+    return written
+
+def encode_export(ritual_type: str, current_step: int, export_format: str) -> bytes:
+    """Serialize one session's ritual record in the requested export format"""
+    if export_format == "JSON":
+        record = build_ritual_record(ritual_type, current_step)
+        return json.dumps(record, indent=2, default=str).encode("utf-8")
+    
+    buffer = io.BytesIO()
+    stream_export([(ritual_type, current_step)], buffer, compress=export_format == "NDJSON (gzip)")
+    return buffer.getvalue()
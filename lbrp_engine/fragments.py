@@ -0,0 +1,235 @@
+"""Indexed store of the reusable components in ``template.html``
+
+The template is parsed once into an index of element spans by ``id``, so a
+fragment is a dictionary lookup rather than a re-read of the file. Fragments
+with a context provider are rendered from the cached correspondence tables:
+``{{name}}`` placeholders are substituted (HTML-escaped unless the name ends
+in ``_svg``) and an element marked ``data-repeat="key"`` is repeated (without
+the marker) once per item of the context list ``key``. Rendered fragments are cached in memory.
+
+The store checks the file's mtime and size at most every
+``RELOAD_INTERVAL`` seconds; when they change and the content hash differs,
+the index and the rendered cache are rebuilt (hot reload).
+"""
+import hashlib
+import html
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .correspondences import DIRECTION_COLOR_NAMES, get_archangels, get_correspondences
+from .instrumentation import register_cache
+from .models import Direction
+from .rendering import compact_markup
+
+TEMPLATE_PATH = os.environ.get(
+    "LBRP_TEMPLATE_PATH", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "template.html")
+)
+RELOAD_INTERVAL = 1.0
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+_HIDDEN = re.compile(r'\s+style="display:\s*none;?"')
+_REPEAT = re.compile(r'\s+data-repeat="[^"]*"')
+_VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+                        "param", "source", "track", "wbr"))
+
+Span = Tuple[int, int]
+
+class _ParsedTemplate(NamedTuple):
+    source: str
+    ids: Dict[str, Span]
+    repeats: List[Tuple[int, int, str]]
+    rendered: Dict[str, str]
+
+class RenderCacheInfo(NamedTuple):
+    """Rendered-fragment statistics in ``functools.lru_cache`` form (unbounded)"""
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+class _IndexParser(HTMLParser):
+    """Record the source span of every element with an ``id`` or ``data-repeat``"""
+
+    def __init__(self, source: str):
+        super().__init__(convert_charrefs=False)
+        self._line_starts = [0] + [match.end() for match in re.finditer("\n", source)]
+        self._open: List[Tuple[str, int, Optional[str], Optional[str]]] = []
+        self.ids: Dict[str, Span] = {}
+        self.repeats: List[Tuple[int, int, str]] = []
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        attributes = dict(attrs)
+        self._open.append((tag, self._offset(), attributes.get("id"), attributes.get("data-repeat")))
+
+    def handle_endtag(self, tag):
+        # Close back to the matching tag, tolerating unclosed children
+        for depth in range(len(self._open) - 1, -1, -1):
+            if self._open[depth][0] == tag:
+                break
+        else:
+            return
+        end = self._offset() + len(f"</{tag}>")
+        for _, start, element_id, repeat in self._open[depth:]:
+            if element_id:
+                self.ids.setdefault(element_id, (start, end))
+            if repeat:
+                self.repeats.append((start, end, repeat))
+        del self._open[depth:]
+
+# ==================== CONTEXT PROVIDERS ====================
+def _elemental_table_context() -> Dict:
+    archangels = get_archangels()
+    return {
+        "quarters": [
+            {
+                "direction": direction.display_name,
+                "element": entity.element.value,
+                "divine_name": entity.divine_name,
+                "archangel": archangels[direction]["name"],
+                "color": direction.color,
+                "color_name": DIRECTION_COLOR_NAMES[direction]
+            }
+            for direction, entity in get_correspondences().items()
+        ]
+    }
+
+def _pentagram_guide_context() -> Dict:
+    from .geometry import PENTAGRAM_MODES, PENTAGRAM_POINTS, get_pentagram_drawing
+
+    # The LBRP draws the Earth pentagram in every quarter
+    context = {"element": get_correspondences()[Direction.NORTH].element.value}
+    for mode in PENTAGRAM_MODES:
+        drawing = get_pentagram_drawing(Direction.NORTH, mode, 120)
+        context[f"{mode}_svg"] = drawing.svg
+        context[f"{mode}_strokes"] = " → ".join(PENTAGRAM_POINTS[vertex].value for vertex in drawing.order)
+    return context
+
+FRAGMENT_CONTEXTS: Dict[str, Callable[[], Dict]] = {
+    "elemental-table": _elemental_table_context,
+    "pentagram-guide": _pentagram_guide_context
+}
+
+def _substitute(markup: str, context: Dict) -> str:
+    def value(match):
+        name = match.group(1)
+        if name not in context:
+            return match.group(0)
+        text = str(context[name])
+        return text if name.endswith("_svg") else html.escape(text)
+    return _PLACEHOLDER.sub(value, markup)
+
+class FragmentStore:
+    """Fragments of one template file, indexed by id and hot-reloaded on change"""
+
+    def __init__(self, path: str = TEMPLATE_PATH):
+        self.path = path
+        self.reloads = 0
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._checked = float("-inf")
+        self._signature: Optional[Tuple[int, int]] = None
+        self._digest = ""
+        self._parsed = _ParsedTemplate("", {}, [], {})
+
+    def _refresh(self) -> _ParsedTemplate:
+        now = time.monotonic()
+        if now - self._checked < RELOAD_INTERVAL:
+            return self._parsed
+        with self._lock:
+            self._checked = now
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return self._parsed
+            with open(self.path, "rb") as fp:
+                data = fp.read()
+            self._signature = signature
+            digest = hashlib.sha256(data).hexdigest()
+            if digest == self._digest:
+                return self._parsed
+
+            source = data.decode("utf-8")
+            parser = _IndexParser(source)
+            parser.feed(source)
+            parser.close()
+            # Swapped in as one object, so readers never mix two versions
+            self._parsed = _ParsedTemplate(source, parser.ids, parser.repeats, {})
+            self._digest = digest
+            self.reloads += 1
+            return self._parsed
+
+    def ids(self) -> List[str]:
+        """Every indexed fragment id, in document order"""
+        ids = self._refresh().ids
+        return sorted(ids, key=ids.get)
+
+    def raw(self, fragment_id: str) -> str:
+        """Unrendered outer markup of a fragment"""
+        parsed = self._refresh()
+        start, end = self._span(parsed, fragment_id)
+        return parsed.source[start:end]
+
+    def render(self, fragment_id: str) -> str:
+        """Visible, data-filled and compacted markup of a fragment, cached until the template changes"""
+        parsed = self._refresh()
+        rendered = parsed.rendered.get(fragment_id)
+        if rendered is None:
+            self.misses += 1
+            rendered = parsed.rendered[fragment_id] = self._render(parsed, fragment_id)
+        else:
+            self.hits += 1
+        return rendered
+
+    def cache_info(self) -> RenderCacheInfo:
+        """Hits, misses and rendered fragments cached for the current template"""
+        return RenderCacheInfo(self.hits, self.misses, None, len(self._parsed.rendered))
+
+    def _span(self, parsed: _ParsedTemplate, fragment_id: str) -> Span:
+        span = parsed.ids.get(fragment_id)
+        if span is None:
+            raise KeyError(f"No fragment {fragment_id!r} in {self.path}")
+        return span
+
+    def _render(self, parsed: _ParsedTemplate, fragment_id: str) -> str:
+        start, end = self._span(parsed, fragment_id)
+        source = parsed.source
+        provider = FRAGMENT_CONTEXTS.get(fragment_id)
+        context = provider() if provider is not None else {}
+
+        pieces = []
+        cursor = start
+        for repeat_start, repeat_end, key in sorted(parsed.repeats):
+            if repeat_start < cursor or repeat_end > end:
+                continue
+            block = _REPEAT.sub("", source[repeat_start:repeat_end], count=1)
+            pieces.append(_substitute(source[cursor:repeat_start], context))
+            pieces.extend(_substitute(block, {**context, **item}) for item in context.get(key, ()))
+            cursor = repeat_end
+        pieces.append(_substitute(source[cursor:end], context))
+
+        markup = "".join(pieces)
+        # Template components are hidden until placed; only the root carries that style
+        opening = markup.index(">") + 1
+        return compact_markup(_HIDDEN.sub("", markup[:opening], count=1) + markup[opening:])
+
+@lru_cache(maxsize=1)
+def get_fragment_store() -> FragmentStore:
+    """Process-wide store for ``template.html``"""
+    store = FragmentStore(TEMPLATE_PATH)
+    register_cache(store, "fragments")
+    return store
+
+def render_fragment(fragment_id: str) -> str:
+    """Rendered markup of a ``template.html`` component"""
+    return get_fragment_store().render(fragment_id)
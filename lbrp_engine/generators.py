@@ -0,0 +1,245 @@
+"""HTML generators and static markup constants"""
+from typing import Dict, Tuple
+
+from .correspondence_index import get_correspondence_index
+from .models import Direction, KabbalisticEntity, RitualStep, Sephira
+
+# ==================== CONSTANTS ====================
+CSS_STYLES = """
+<style>
+    :root {
+        --keter-color: #ffffff;
+        --chesed-color: #4169e1;
+        --gevurah-color: #dc143c;
+        --tiferet-color: #ffd700;
+        --malkuth-color: #228b22;
+    }
+    
+    .main-header {
+        background: linear-gradient(90deg, #000428 0%, #004e92 100%);
+        color: white;
+        padding: 2rem;
+        border-radius: 10px;
+        margin-bottom: 2rem;
+        text-align: center;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }
+    
+    .ritual-phase-card {
+        background: rgba(255, 255, 255, 0.05);
+        border-left: 4px solid var(--tiferet-color);
+        padding: 1.5rem;
+        margin: 1rem 0;
+        border-radius: 8px;
+        transition: all 0.3s ease;
+    }
+    
+    .ritual-phase-card:hover {
+        background: rgba(255, 215, 0, 0.1);
+        transform: translateX(5px);
+    }
+    
+    .vibration-text {
+        animation: vibrate 0.5s linear infinite;
+        font-weight: bold;
+        color: #ffd700;
+    }
+    
+    .progress-container {
+        height: 20px;
+        background: rgba(255,255,255,0.1);
+        border-radius: 10px;
+        margin: 1rem 0;
+        overflow: hidden;
+    }
+    
+    .progress-bar {
+        height: 100%;
+        background: linear-gradient(90deg, #ffd700, #ff8c00);
+        transition: width 0.5s ease;
+    }
+</style>
+"""
+
+TREE_OF_LIFE_HTML = """
+<div style='font-family: monospace; background: #000; color: #ffd700; padding: 2rem; border-radius: 10px; margin: 1rem 0; border: 1px solid #444;'>
+<pre style='text-align: center; margin: 0;'>
+               ╭────────── KETER ───────────╮
+               │         (ATEH)              │
+               │          Divine Will        │
+               ╰─────────────┬──────────────╯
+                             │
+                             ▼
+                          DA'AT
+                             │
+               ╭─────────────┴─────────────╮
+               │                           │
+               ▼                           ▼
+          CHESED (Mercy)           GEVURAH (Severity)
+          (VE-GEDULAH)             (VE-GEBURAH)
+                             │
+                             ▼
+                         TIFERET (Beauty)
+                             │
+               ╭─────────────┴─────────────╮
+               │                           │
+               ▼                           ▼
+            HOD (Glory)                NETZACH (Victory)
+                             │
+                             ▼
+                         YESOD (Foundation)
+                             │
+                             ▼
+                        MALKUTH (Kingdom)
+</pre>
+</div>
+"""
+
+# ==================== HTML GENERATORS ====================
+class HTMLGenerator:
+    """Static HTML generator methods"""
+    
+    @staticmethod
+    def generate_preparation() -> str:
+        return """
+        <div style='text-align: center; padding: 20px; background: linear-gradient(135deg, #000428 0%, #004e92 100%); color: white; border-radius: 10px;'>
+            <div style='font-size: 3rem; margin-bottom: 1rem;'>✡️</div>
+            <h3 style='color: #ffd700;'>Preparation Phase</h3>
+            <p>Microcosm aligning with Macrocosm</p>
+        </div>
+        """
+    
+    @staticmethod
+    def generate_cross_step(step_num: int, vibration: str, sephira: Sephira) -> str:
+        record = get_correspondence_index().first("sephira", sephira, kind="sephira")
+        color = record.color if record is not None else "#ffffff"
+        
+        return f"""
+        <div style='border-left: 4px solid {color}; padding-left: 1rem; margin: 1rem 0;'>
+            <div style='display: flex; align-items: center; gap: 10px;'>
+                <div style='background: {color}; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center;'>
+                    {step_num}
+                </div>
+                <h4 style='color: {color}; margin: 0;'>{vibration.split(' ')[0]}</h4>
+            </div>
+            <p style='margin: 0.5rem 0;'><strong>Sephira:</strong> {sephira.value}</p>
+            <p class='vibration-text' style='font-size: 1.2rem;'>{vibration}</p>
+        </div>
+        """
+    
+    @staticmethod
+    def generate_pentagram(direction: Direction, entity: KabbalisticEntity, step_num: int,
+                           mode: str = "banishing") -> str:
+        rgb = ','.join(str(int(entity.color.lstrip('#')[i:i+2], 16)) for i in (0, 2, 4))
+        progress = (step_num / 4) * 100
+        from .geometry import PENTAGRAM_POINTS, get_pentagram_drawing  # NumPy, needed only when compiling
+        
+        drawing = get_pentagram_drawing(direction, mode)
+        strokes = " → ".join(PENTAGRAM_POINTS[vertex].value for vertex in drawing.order)
+        
+        return f"""
+        <div style='background: rgba({rgb}, 0.1); padding: 1.5rem; border-radius: 10px; text-align: center;'>
+            <div>{drawing.svg}</div>
+            <h4 style='color: {entity.color};'>{direction.display_name} - {entity.element.value}</h4>
+            <p><strong>Divine Name:</strong> {entity.divine_name}</p>
+            <p><strong>Hebrew Letter:</strong> {entity.hebrew_letter}</p>
+            <p><strong>{mode.capitalize()} Strokes:</strong> {strokes}</p>
+            <div class='progress-container'>
+                <div class='progress-bar' style='width: {progress}%;'></div>
+            </div>
+        </div>
+        """
+    
+    @staticmethod
+    def generate_archangel(direction: Direction, archangel: Dict) -> str:
+        return f"""
+        <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 1rem; border-radius: 10px; margin: 0.5rem; text-align: center; min-height: 150px; display: flex; flex-direction: column; justify-content: center;'>
+            <div style='font-size: 2rem;'>{archangel['symbol']}</div>
+            <h4>{archangel['name']}</h4>
+            <p style='font-size: 1.5rem; margin: 0.5rem 0;'>{archangel['hebrew']}</p>
+            <p><small>{archangel['attributes']}</small></p>
+        </div>
+        """
+    
+    @staticmethod
+    def generate_step(step: RitualStep) -> str:
+        """Full main-region markup for one step, replacing the per-widget layout"""
+        vibration = gesture = visualization = ""
+        if step.vibration:
+            vibration = f"""
+            <h3>🔊 Vibration</h3>
+            <h2 class='vibration-text'>{step.vibration}</h2>
+            """
+        if step.gesture:
+            gesture = f"""
+            <h3>👐 Gesture</h3>
+            <div style='background: rgba(28, 131, 225, 0.1); padding: 1rem; border-radius: 0.5rem;'>{step.gesture}</div>
+            """
+        if step.visualization:
+            visualization = f"""
+            <h3>👁️ Visualization</h3>
+            <p><em>{step.visualization}</em></p>
+            """
+        
+        return f"""
+        <div class='ritual-phase-card'>
+            <h3>Phase: {step.phase}</h3>
+            <h2 style='color: #ffd700;'>{step.title}</h2>
+            <p>{step.description}</p>
+        </div>
+        <div style='display: flex; gap: 1rem;'>
+            <div style='flex: 1;'>{vibration}</div>
+            <div style='flex: 1;'>{gesture}</div>
+        </div>
+        {visualization}
+        {step.html_content}
+        """
+    
+    @staticmethod
+    def generate_direction_indicator(active: int) -> str:
+        cells = "".join(f"""
+            <div style='flex: 1; text-align: center; padding: 10px; border: 2px solid {color}; border-radius: 5px;'>
+                <div style='font-size: 1.5rem;'>{direction.symbol}</div>
+                <strong style='color: {color};'>{direction.name}</strong>
+            </div>
+            """ for direction, color in (
+                (direction, "#ffd700" if i == active else "#666")
+                for i, direction in enumerate(Direction)
+            ))
+        
+        return f"""
+        <h3>🗺️ Directional Sequence</h3>
+        <div style='display: flex; gap: 1rem;'>{cells}</div>
+        """
+    
+    @staticmethod
+    def generate_archangel_correspondences() -> str:
+        cells = "".join(f"""
+            <div style='flex: 1; background: {archangel.color}20; padding: 10px; border-radius: 10px; text-align: center;'>
+                <h4>{archangel.name}</h4>
+                <p><strong>Element:</strong> {archangel.element.value}</p>
+                <p><strong>Planet:</strong> {dict(archangel.details)["planet"]}</p>
+            </div>
+            """ for archangel in get_correspondence_index().of_kind("archangel"))
+        
+        return f"""
+        <h3>👼 Archangel Correspondences</h3>
+        <div style='display: flex; gap: 1rem;'>{cells}</div>
+        """
+    
+    @staticmethod
+    def generate_balance(balance: Tuple[int, ...]) -> str:
+        elements = ["Air", "Fire", "Water", "Earth", "Spirit"]
+        colors = ["#87ceeb", "#ff4500", "#1e90ff", "#8b4513", "#9370db"]
+        
+        return "".join(f"""
+        <div style='margin: 10px 0;'>
+            <div style='display: flex; justify-content: space-between;'>
+                <span>{element}</span>
+                <span>{value}%</span>
+            </div>
+            <div class='progress-container'>
+                <div class='progress-bar' style='width: {value}%; background: {color};'></div>
+            </div>
+        </div>
+        """ for element, value, color in zip(elements, balance, colors))
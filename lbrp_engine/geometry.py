@@ -0,0 +1,118 @@
+"""Pentagram geometry: vertices, stroke order, SVG paths and animation keyframes
+
+Vertices are numbered clockwise from the top point, each attributed to an
+element (Spirit at the top, then Water, Fire, Earth, Air). An invoking
+pentagram is drawn from the point given in ``INVOKING_FROM`` toward the
+element's own point; the banishing form starts at the element's point and
+runs the star the other way round. Every stroke spans two vertices, so a
+whole figure is ``start + k * delta (mod 5)`` evaluated for k = 0..5 at once.
+
+Drawings are computed once per (direction, mode, size) and kept in a bounded
+cache shared by every session.
+"""
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+
+from .correspondences import get_correspondences
+from .instrumentation import register_cache
+from .models import Direction, Element
+
+PENTAGRAM_MODES = ("banishing", "invoking")
+
+# Element attributed to each vertex, clockwise from the top point
+PENTAGRAM_POINTS: Tuple[Element, ...] = (
+    Element.SPIRIT, Element.WATER, Element.FIRE, Element.EARTH, Element.AIR
+)
+
+# Golden Dawn elemental pentagrams: vertex an invoking stroke starts from
+INVOKING_FROM: Dict[Element, Element] = {
+    Element.EARTH: Element.SPIRIT,
+    Element.FIRE: Element.SPIRIT,
+    Element.AIR: Element.WATER,
+    Element.WATER: Element.AIR
+}
+
+DRAW_SECONDS = 4.0
+
+class PentagramDrawing(NamedTuple):
+    """Precomputed figure for one (direction, mode, size)"""
+    element: Element
+    mode: str
+    vertices: np.ndarray   # (5, 2) vertex coordinates, clockwise from the top
+    order: np.ndarray      # (6,) vertex indices in drawing order, closed
+    path: str              # SVG path data following the strokes
+    keyframes: np.ndarray  # (6, 3) rows of (percent, x, y) for the pen
+    svg: str               # self-contained animated SVG markup
+
+def pentagram_vertices(size: int) -> np.ndarray:
+    """Vertices of a pentagram inscribed in a ``size`` x ``size`` box"""
+    center = size / 2
+    radius = size * 0.42
+    angles = np.pi / 2 - 2 * np.pi * np.arange(5) / 5
+    return np.column_stack((center + radius * np.cos(angles), center - radius * np.sin(angles)))
+
+def stroke_order(element: Element, mode: str) -> np.ndarray:
+    """Closed vertex sequence (6 indices) for drawing an element's pentagram"""
+    if mode not in PENTAGRAM_MODES:
+        raise ValueError(f"Unknown pentagram mode: {mode}")
+    point = PENTAGRAM_POINTS.index(element)
+    origin = PENTAGRAM_POINTS.index(INVOKING_FROM[element])
+    delta = (point - origin) % 5
+    if mode == "banishing":
+        origin, delta = point, (origin - point) % 5
+    return (origin + delta * np.arange(6)) % 5
+
+def _svg(drawing_id: str, color: str, size: int, vertices: np.ndarray, order: np.ndarray,
+         path: str, keyframes: np.ndarray) -> str:
+    length = float(np.hypot(*np.diff(vertices[order], axis=0).T).sum())
+    pen = " ".join(f"{percent:g}%{{transform:translate({x:.1f}px,{y:.1f}px)}}" for percent, x, y in keyframes)
+    labels = "".join(
+        f"<text x='{x:.1f}' y='{y:.1f}' font-size='{size * 0.07:.0f}' fill='{color}' "
+        f"text-anchor='middle' dominant-baseline='middle'>{number}</text>"
+        for number, (x, y) in enumerate(_label_positions(vertices, order, size), 1)
+    )
+    return (
+        f"<svg viewBox='0 0 {size} {size}' width='{size}' height='{size}' role='img' "
+        f"aria-label='{drawing_id}'>"
+        f"<style>"
+        f"@keyframes {drawing_id}-draw{{from{{stroke-dashoffset:{length:.1f}}}to{{stroke-dashoffset:0}}}}"
+        f"@keyframes {drawing_id}-pen{{{pen}}}"
+        f"</style>"
+        f"<path d='{path}' fill='none' stroke='{color}' stroke-opacity='0.25' stroke-width='2'/>"
+        f"<path d='{path}' fill='none' stroke='{color}' stroke-width='3' stroke-linejoin='round' "
+        f"stroke-dasharray='{length:.1f}' "
+        f"style='animation:{drawing_id}-draw {DRAW_SECONDS:g}s linear infinite'/>"
+        f"<circle r='{size * 0.025:.1f}' fill='{color}' "
+        f"style='animation:{drawing_id}-pen {DRAW_SECONDS:g}s linear infinite'/>"
+        f"{labels}"
+        f"</svg>"
+    )
+
+def _label_positions(vertices: np.ndarray, order: np.ndarray, size: int) -> np.ndarray:
+    """Stroke numbers just outside the vertex each stroke starts from"""
+    center = np.array([size / 2, size / 2])
+    starts = vertices[order[:-1]]
+    return center + (starts - center) * 1.16
+
+@register_cache
+@lru_cache(maxsize=64)
+def get_pentagram_drawing(direction: Direction, mode: str = "banishing", size: int = 160) -> PentagramDrawing:
+    """Pentagram of a quarter's element, computed once per process"""
+    element = get_correspondences()[direction].element
+    vertices = pentagram_vertices(size)
+    order = stroke_order(element, mode)
+    points = vertices[order]
+    path = "M" + "L".join(f"{x:.1f},{y:.1f}" for x, y in points[:-1]) + "Z"
+
+    # The pen moves at constant speed, so keyframes sit at cumulative stroke lengths
+    lengths = np.hypot(*np.diff(points, axis=0).T)
+    percents = np.concatenate(([0.0], np.cumsum(lengths) / lengths.sum() * 100))
+    keyframes = np.column_stack((percents, points))
+
+    drawing_id = f"lbrp-{direction.name.lower()}-{mode}-{size}"
+    svg = _svg(drawing_id, direction.color, size, vertices, order, path, keyframes)
+    for array in (vertices, order, keyframes):
+        array.flags.writeable = False
+    return PentagramDrawing(element, mode, vertices, order, path, keyframes, svg)
@@ -0,0 +1,211 @@
+"""Guided practice: one asyncio scheduler advancing every timed session
+
+A single event loop, running in one daemon thread per process, holds one
+timer handle per running session, so an idle session costs a heap entry
+rather than a thread or a polling rerun. Deadlines are chained from the
+previous deadline, not from when a timer fired, so late wake-ups never
+accumulate into drift.
+
+The public methods are thread-safe and return immediately: state changes
+happen under a lock and timers are (re)armed on the loop thread. When a
+session advances, its ``on_advance(session_id, step)`` callback runs on the
+loop thread and should only hand work off (e.g. request a UI rerun).
+Paused and finished sessions expire after ``PAUSED_TTL`` and
+``FINISHED_TTL``, so a closed tab never holds its entry forever.
+"""
+import asyncio
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+AdvanceCallback = Callable[[str, int], None]
+
+# Finished sessions stay readable this long before they are dropped
+FINISHED_TTL = 300.0
+# Paused sessions left untouched this long are dropped (e.g. their tab was closed)
+PAUSED_TTL = 3600.0
+# Recent timer lateness samples kept per scheduler
+LATENESS_SAMPLES = 10_000
+
+class GuidedState(NamedTuple):
+    """Snapshot of one session's guided progress"""
+    step: int
+    remaining: float  # seconds left on the current step
+    paused: bool
+    finished: bool
+
+class _Session:
+    __slots__ = ("durations", "step", "deadline", "remaining", "paused", "finished",
+                 "generation", "handle", "on_advance")
+
+    def __init__(self, durations: Sequence[float], step: int, on_advance: Optional[AdvanceCallback],
+                 paused: bool = False):
+        self.durations = tuple(durations)
+        self.step = step
+        self.remaining = self.durations[step]
+        self.deadline = time.monotonic() + self.remaining
+        self.paused = paused
+        self.finished = False
+        self.generation = 0
+        self.handle: Optional[asyncio.TimerHandle] = None
+        self.on_advance = on_advance
+
+class GuidedScheduler:
+    """Shared timer service for guided sessions"""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, _Session] = {}
+        self.lateness: List[float] = []
+        self._thread = threading.Thread(target=self._loop.run_forever, name="lbrp-guided", daemon=True)
+        self._thread.start()
+
+    # ---------- control ----------
+    def start(self, session_id: str, durations: Sequence[float], step: int = 0,
+              on_advance: Optional[AdvanceCallback] = None, paused: bool = False) -> None:
+        """Start (or restart) timing a session from ``step``, optionally paused"""
+        step = min(max(step, 0), len(durations) - 1)
+        with self._lock:
+            previous = self._sessions.get(session_id)
+            session = self._sessions[session_id] = _Session(durations, step, on_advance, paused)
+            if previous is not None:
+                session.generation = previous.generation + 1
+                self._cancel(previous)
+        self._rearm(session_id)
+
+    def pause(self, session_id: str) -> None:
+        """Freeze the current step's remaining time"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.paused or session.finished:
+                return
+            session.remaining = max(session.deadline - time.monotonic(), 0.0)
+            session.paused = True
+            session.generation += 1
+        self._rearm(session_id)
+
+    def resume(self, session_id: str) -> None:
+        """Continue a paused session with the time it had left"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or not session.paused:
+                return
+            session.deadline = time.monotonic() + session.remaining
+            session.paused = False
+            session.generation += 1
+        self._rearm(session_id)
+
+    def skip(self, session_id: str) -> Optional[int]:
+        """Advance immediately to the next step; returns the new step"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.finished:
+                return None
+            self._advance(session, time.monotonic())
+            step = session.step
+        self._rearm(session_id)
+        return step
+
+    def seek(self, session_id: str, step: int) -> None:
+        """Move a session to ``step`` with that step's full duration, keeping its pause state"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.step = min(max(step, 0), len(session.durations) - 1)
+            session.remaining = session.durations[session.step]
+            session.deadline = time.monotonic() + session.remaining
+            session.finished = False
+            session.generation += 1
+        self._rearm(session_id)
+
+    def stop(self, session_id: str) -> None:
+        """Forget a session and cancel its timer"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                session.generation += 1
+                self._cancel(session)
+
+    def state(self, session_id: str) -> Optional[GuidedState]:
+        """Current progress of a session, or None if it is not being timed"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.paused or session.finished:
+                remaining = session.remaining if session.paused else 0.0
+            else:
+                remaining = max(session.deadline - time.monotonic(), 0.0)
+            return GuidedState(session.step, remaining, session.paused, session.finished)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    # ---------- loop thread ----------
+    def _cancel(self, session: _Session) -> None:
+        handle = session.handle
+        if handle is not None:
+            self._loop.call_soon_threadsafe(handle.cancel)
+
+    def _rearm(self, session_id: str) -> None:
+        self._loop.call_soon_threadsafe(self._arm, session_id)
+
+    def _arm(self, session_id: str) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            if session.handle is not None:
+                session.handle.cancel()
+                session.handle = None
+            if session.paused:
+                session.handle = self._loop.call_later(PAUSED_TTL, self._expire, session_id, session.generation)
+                return
+            if session.finished:
+                session.handle = self._loop.call_later(FINISHED_TTL, self._expire, session_id, session.generation)
+                return
+            # The loop clock is time.monotonic, so deadlines carry over unchanged
+            session.handle = self._loop.call_at(session.deadline, self._fire, session_id, session.generation)
+
+    def _fire(self, session_id: str, generation: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.generation != generation:
+                return
+            if len(self.lateness) >= LATENESS_SAMPLES:
+                del self.lateness[:LATENESS_SAMPLES // 2]
+            self.lateness.append(now - session.deadline)
+            self._advance(session, session.deadline)
+            step, callback = session.step, session.on_advance
+        self._arm(session_id)
+        if callback is not None:
+            callback(session_id, step)
+
+    def _advance(self, session: _Session, started: float) -> None:
+        """Move to the next step whose timer starts at ``started`` (lock held)"""
+        session.generation += 1
+        if session.step + 1 >= len(session.durations):
+            session.finished = True
+            session.paused = False
+            session.remaining = 0.0
+            return
+        session.step += 1
+        session.remaining = session.durations[session.step]
+        session.deadline = started + session.remaining
+        if session.paused:
+            session.deadline = time.monotonic() + session.remaining
+
+    def _expire(self, session_id: str, generation: int) -> None:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session.generation == generation:
+                del self._sessions[session_id]
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> GuidedScheduler:
+    """Process-wide guided-practice scheduler, started on first use"""
+    return GuidedScheduler()
@@ -0,0 +1,214 @@
+"""Opt-in rerun instrumentation: stage timings, cache counters and slow-rerun profiles
+
+Everything is disabled unless one of these environment variables is set when
+the package is imported:
+
+``LBRP_METRICS_PATH``
+    Write a metrics snapshot here after reruns (at most every
+    ``LBRP_METRICS_INTERVAL`` seconds, default 10). A ``.prom`` or ``.txt``
+    suffix selects the Prometheus text format, anything else JSON.
+``LBRP_PROFILE_DIR``
+    Profile every rerun with cProfile and keep the ``LBRP_PROFILE_KEEP``
+    slowest (default 5) as ``.prof`` dumps in this directory.
+
+When disabled, ``stage()`` and ``rerun()`` hand back a shared no-op context
+manager, so the hot path pays a single function call.
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Tuple
+
+METRICS_PATH = os.environ.get("LBRP_METRICS_PATH", "")
+METRICS_INTERVAL = float(os.environ.get("LBRP_METRICS_INTERVAL", "10"))
+PROFILE_DIR = os.environ.get("LBRP_PROFILE_DIR", "")
+PROFILE_KEEP = int(os.environ.get("LBRP_PROFILE_KEEP", "5"))
+ENABLED = bool(METRICS_PATH or PROFILE_DIR)
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float("inf"))
+
+_NOOP = nullcontext()
+_lock = threading.Lock()
+_profile_lock = threading.Lock()
+_stages: Dict[str, List] = {}
+_caches: Dict[str, Callable] = {}
+_gauges: Dict[str, Callable[[], float]] = {}
+_slow_profiles: List[Tuple[float, str]] = []
+_last_write = 0.0
+
+def register_cache(func: Callable, name: str = "") -> Callable:
+    """Track an ``lru_cache``-wrapped function's hits and misses; returns it unchanged
+
+    Any object with a compatible ``cache_info()`` can be registered under
+    ``name``; ``evictions`` and ``bytes`` are reported when it provides them.
+    """
+    _caches[name or func.__name__] = func
+    return func
+
+def register_gauge(name: str, func: Callable[[], float]) -> None:
+    """Report ``func()`` as the gauge ``lbrp_<name>`` in every snapshot"""
+    _gauges[name] = func
+
+def _record(name: str, elapsed: float) -> None:
+    with _lock:
+        stats = _stages.get(name)
+        if stats is None:
+            stats = _stages[name] = [0, 0.0, 0.0, [0] * len(BUCKETS)]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                stats[3][i] += 1
+                break
+
+@contextmanager
+def _timed(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, time.perf_counter() - start)
+
+def stage(name: str):
+    """Context manager timing one named stage of a rerun"""
+    return _timed(name) if ENABLED else _NOOP
+
+@contextmanager
+def _instrumented_rerun() -> Iterator[None]:
+    profiler = None
+    if PROFILE_DIR and _profile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+            try:
+                _keep_if_slow(profiler, elapsed)
+            finally:
+                _profile_lock.release()
+        _record("rerun", elapsed)
+        if METRICS_PATH:
+            maybe_write_snapshot()
+
+def rerun():
+    """Context manager wrapping a whole script rerun (timing, profiling, snapshots)"""
+    return _instrumented_rerun() if ENABLED else _NOOP
+
+def _keep_if_slow(profiler: cProfile.Profile, elapsed: float) -> None:
+    """Dump the profile if it is among the slowest seen, evicting the fastest kept"""
+    if len(_slow_profiles) >= PROFILE_KEEP and elapsed <= _slow_profiles[0][0]:
+        return
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"rerun_{elapsed * 1e3:09.3f}ms_{time.time_ns()}.prof")
+    profiler.dump_stats(path)
+    _slow_profiles.append((elapsed, path))
+    _slow_profiles.sort()
+    while len(_slow_profiles) > PROFILE_KEEP:
+        _, evicted = _slow_profiles.pop(0)
+        try:
+            os.remove(evicted)
+        except OSError:
+            pass
+
+def snapshot() -> Dict:
+    """Current stage timings, cache statistics and gauges as a JSON-ready dict"""
+    with _lock:
+        stages = {
+            name: {
+                "count": count,
+                "total_seconds": total,
+                "mean_seconds": total / count if count else 0.0,
+                "max_seconds": peak,
+                "buckets": dict(zip(("+Inf" if b == float("inf") else str(b) for b in BUCKETS), buckets))
+            }
+            for name, (count, total, peak, buckets) in _stages.items()
+        }
+    caches = {}
+    for name, func in _caches.items():
+        info = func.cache_info()
+        caches[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+        for field in ("evictions", "bytes"):
+            if hasattr(info, field):
+                caches[name][field] = getattr(info, field)
+    return {
+        "timestamp": time.time(),
+        "stages": stages,
+        "caches": caches,
+        "gauges": {name: func() for name, func in _gauges.items()},
+        "slowest_profiles": [path for _, path in reversed(_slow_profiles)]
+    }
+
+def render_prometheus(data: Dict = None) -> str:
+    """Render a snapshot in the Prometheus text exposition format"""
+    data = data or snapshot()
+    lines = [
+        "# HELP lbrp_stage_seconds Time spent per rerun stage.",
+        "# TYPE lbrp_stage_seconds histogram"
+    ]
+    for name, stats in data["stages"].items():
+        cumulative = 0
+        for bound, count in stats["buckets"].items():
+            cumulative += count
+            lines.append(f'lbrp_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'lbrp_stage_seconds_sum{{stage="{name}"}} {stats["total_seconds"]}')
+        lines.append(f'lbrp_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+    lines += [
+        "# HELP lbrp_cache_hits_total Cache hits per cached function.",
+        "# TYPE lbrp_cache_hits_total counter"
+    ]
+    lines += [f'lbrp_cache_hits_total{{cache="{name}"}} {c["hits"]}' for name, c in data["caches"].items()]
+    lines += [
+        "# HELP lbrp_cache_misses_total Cache misses per cached function.",
+        "# TYPE lbrp_cache_misses_total counter"
+    ]
+    lines += [f'lbrp_cache_misses_total{{cache="{name}"}} {c["misses"]}' for name, c in data["caches"].items()]
+    lines += [
+        "# HELP lbrp_cache_evictions_total Evictions per size-bounded cache.",
+        "# TYPE lbrp_cache_evictions_total counter"
+    ]
+    lines += [
+        f'lbrp_cache_evictions_total{{cache="{name}"}} {c["evictions"]}'
+        for name, c in data["caches"].items() if "evictions" in c
+    ]
+    for name, value in data.get("gauges", {}).items():
+        lines += [f"# TYPE lbrp_{name} gauge", f"lbrp_{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+def write_snapshot(path: str) -> None:
+    """Atomically write a snapshot as Prometheus text (.prom/.txt) or JSON"""
+    data = snapshot()
+    if path.endswith((".prom", ".txt")):
+        payload = render_prometheus(data)
+    else:
+        payload = json.dumps(data, indent=2)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        fp.write(payload)
+    os.replace(tmp_path, path)
+
+def maybe_write_snapshot() -> None:
+    """Write the configured snapshot if the write interval has elapsed"""
+    global _last_write
+    now = time.monotonic()
+    with _lock:
+        if now - _last_write < METRICS_INTERVAL:
+            return
+        _last_write = now
+    write_snapshot(METRICS_PATH)
+
+def reset() -> None:
+    """Clear recorded timings and kept profiles (cache counters are owned by the caches)"""
+    with _lock:
+        _stages.clear()
+    _slow_profiles.clear()
@@ -0,0 +1,214 @@
+"""Durable session journal: batched, append-only SQLite writes with resume
+
+Sessions append navigation events and periodic snapshots with ``record()``,
+which only enqueues; a single writer thread drains the queue and commits in
+batches (``batch_size`` events or every ``flush_interval`` seconds), so the
+render path never waits on disk. Reads such as ``resume()`` borrow a
+connection from a small pool. The database runs in WAL mode, so readers and
+the writer do not block each other.
+
+A batch that fails to commit (e.g. "database is locked" past the busy
+timeout) is logged and retried on the next pass; after ``WRITE_ATTEMPTS``
+failures it is dropped and counted in ``dropped``. Should the writer thread
+die anyway, ``record()`` and ``flush()`` raise instead of queueing forever.
+
+The app journals only when ``LBRP_JOURNAL_PATH`` is set (see ``get_journal``).
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+JOURNAL_PATH = os.environ.get("LBRP_JOURNAL_PATH", "")
+# Commits tried per batch before it is dropped
+WRITE_ATTEMPTS = 5
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    ritual_type TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (session_id, id);
+CREATE INDEX IF NOT EXISTS events_session_kind ON events (session_id, kind, id);
+"""
+
+Event = Tuple[str, float, str, str, int, Optional[str]]
+
+_STOP = object()
+
+class SessionJournal:
+    """Append-only event log of ritual sessions backed by SQLite"""
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.5,
+                 pool_size: int = 4):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self.written = 0
+        self.dropped = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        writer = self._connect()
+        writer.executescript(_SCHEMA)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+
+        self._writer = threading.Thread(target=self._run, args=(writer,), name="lbrp-journal", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # ---------- writes ----------
+    def record(self, session_id: str, kind: str, ritual_type: str, step: int,
+               payload: Optional[Dict] = None) -> None:
+        """Enqueue an event; never blocks on disk"""
+        self._check_writer()
+        encoded = json.dumps(payload, separators=(",", ":")) if payload is not None else None
+        self._queue.put((session_id, time.time(), kind, ritual_type, step, encoded))
+
+    def _check_writer(self) -> None:
+        if not self._writer.is_alive():
+            raise RuntimeError(f"Journal writer for {self.path} has stopped")
+
+    def _run(self, connection: sqlite3.Connection) -> None:
+        try:
+            self._drain(connection)
+        except BaseException:
+            logger.exception("Journal writer for %s died", self.path)
+            raise
+        finally:
+            connection.close()
+            # Nobody will commit for flushes still queued; release them
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _drain(self, connection: sqlite3.Connection) -> None:
+        batch: List[Event] = []
+        waiters: List[threading.Event] = []
+        attempts = 0
+        stopping = False
+        while not stopping:
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+
+            if batch:
+                try:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO events (session_id, ts, kind, ritual_type, step, payload) "
+                            "VALUES (?, ?, ?, ?, ?, ?)", batch
+                        )
+                except sqlite3.Error:
+                    attempts += 1
+                    if attempts < WRITE_ATTEMPTS and not stopping:
+                        logger.warning("Journal batch of %d events failed (attempt %d), retrying",
+                                       len(batch), attempts, exc_info=True)
+                        time.sleep(self.flush_interval)
+                        continue
+                    logger.exception("Dropping journal batch of %d events after %d attempts",
+                                     len(batch), attempts)
+                    self.dropped += len(batch)
+                else:
+                    self.written += len(batch)
+                batch = []
+                attempts = 0
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event recorded before this call is committed (or dropped, see above)"""
+        self._check_writer()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Flush pending events and close every connection"""
+        if self._writer.is_alive():
+            self.flush()
+            self._queue.put(_STOP)
+            self._writer.join()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    # ---------- reads ----------
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled read connection"""
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def resume(self, session_id: str) -> Optional[Dict]:
+        """Last journaled cursor of a session plus its latest snapshot payload, if any"""
+        with self.connection() as connection:
+            last = connection.execute(
+                "SELECT ritual_type, step FROM events WHERE session_id = ? ORDER BY id DESC LIMIT 1",
+                (session_id,)
+            ).fetchone()
+            if last is None:
+                return None
+            snapshot = connection.execute(
+                "SELECT payload FROM events WHERE session_id = ? AND kind = 'snapshot' "
+                "ORDER BY id DESC LIMIT 1",
+                (session_id,)
+            ).fetchone()
+        state = {"ritual_type": last[0], "current_step": last[1]}
+        if snapshot is not None and snapshot[0]:
+            state.update(json.loads(snapshot[0]))
+        return state
+
+    def history(self, session_id: str) -> List[Tuple[float, str, str, int]]:
+        """Every (ts, kind, ritual_type, step) event of a session, oldest first"""
+        with self.connection() as connection:
+            return connection.execute(
+                "SELECT ts, kind, ritual_type, step FROM events WHERE session_id = ? ORDER BY id",
+                (session_id,)
+            ).fetchall()
+
+@lru_cache(maxsize=1)
+def get_journal() -> Optional[SessionJournal]:
+    """Process-wide journal at ``LBRP_JOURNAL_PATH``, or None when journaling is off"""
+    return SessionJournal(JOURNAL_PATH) if JOURNAL_PATH else None
@@ -0,0 +1,164 @@
+"""Absorbing Markov model of ritual progress over the compiled phases
+
+Each compiled phase is a transient state. From a phase, the practitioner
+moves on with the phase's completion probability (the README's state
+transition matrix); otherwise a ``retry`` share of the failures repeats the
+phase and the rest abandons the ritual. ``Complete`` and ``Abandoned`` are
+absorbing. Every visit to a phase costs its number of steps.
+
+``exact_statistics`` solves the chain with the fundamental matrix
+``N = (I - Q)^-1``; ``monte_carlo`` samples paths in batched NumPy arrays,
+chunked across a process pool for large runs, and reduces them to step-count
+histograms so memory stays flat however many paths are drawn.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .compiler import load_compiled_phases
+from .instrumentation import register_cache
+
+# Probability of moving on from each phase (README state transition matrix).
+# The compiled sequences have no hexagram phase, so its row has no state here.
+PHASE_COMPLETION: Dict[str, float] = {
+    "Preparation": 0.95,
+    "Qabalistic Cross": 0.98,
+    "Formulating Pentagrams": 0.99,
+    "Archangel Evocation": 0.97,
+    "Closing Cross": 1.00
+}
+
+DEFAULT_RETRY = 0.5
+OUTCOMES = ("Complete", "Abandoned")
+
+class RitualChain(NamedTuple):
+    """Transient phases, their step costs and the full transition matrix"""
+    phases: Tuple[str, ...]
+    costs: np.ndarray        # steps per visit of each phase
+    transitions: np.ndarray  # row-stochastic; phases first, then OUTCOMES
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_ritual_chain(ritual_type: str = "LBRP", retry: float = DEFAULT_RETRY) -> RitualChain:
+    """Build the phase-level Markov chain of a compiled ritual"""
+    if not 0.0 <= retry < 1.0:
+        raise ValueError(f"retry must be in [0, 1), got {retry}")
+
+    compiled = [steps for _, steps in load_compiled_phases(ritual_type) if steps]
+    phases = [steps[0].phase for steps in compiled]
+    size = len(phases)
+    complete, abandoned = size, size + 1
+
+    transitions = np.zeros((size + 2, size + 2))
+    for index, phase in enumerate(phases):
+        success = PHASE_COMPLETION.get(phase, 1.0)
+        transitions[index, index + 1 if index + 1 < size else complete] = success
+        transitions[index, index] = (1.0 - success) * retry
+        transitions[index, abandoned] = (1.0 - success) * (1.0 - retry)
+    transitions[complete, complete] = transitions[abandoned, abandoned] = 1.0
+
+    costs_array = np.array([len(steps) for steps in compiled], dtype=np.int64)
+    for array in (costs_array, transitions):
+        array.flags.writeable = False
+    return RitualChain(tuple(phases), costs_array, transitions)
+
+def exact_statistics(ritual_type: str = "LBRP", retry: float = DEFAULT_RETRY) -> Dict:
+    """Completion probability and expected step counts from the fundamental matrix"""
+    chain = get_ritual_chain(ritual_type, retry)
+    size = len(chain.phases)
+    transient = chain.transitions[:size, :size]
+    absorbing = chain.transitions[:size, size:]
+
+    fundamental = np.linalg.inv(np.eye(size) - transient)
+    absorption = fundamental @ absorbing
+    expected_steps = fundamental @ chain.costs
+    # Steps spent in each phase on paths that go on to complete
+    completion = absorption[:, 0]
+    completed_steps = fundamental @ (chain.costs * completion)
+
+    return {
+        "ritual_type": ritual_type,
+        "retry": retry,
+        "completion_probability": float(absorption[0, 0]),
+        "abandon_probability": float(absorption[0, 1]),
+        "expected_steps": float(expected_steps[0]),
+        "expected_steps_completed": float(completed_steps[0] / completion[0]) if completion[0] else None,
+        "expected_visits": dict(zip(chain.phases, fundamental[0].tolist()))
+    }
+
+# ==================== MONTE CARLO ====================
+def simulate_chunk(ritual_type: str, paths: int, seed: np.random.SeedSequence,
+                   retry: float = DEFAULT_RETRY) -> Tuple[np.ndarray, np.ndarray]:
+    """Sample ``paths`` paths at once; returns step-count histograms (completed, abandoned)"""
+    chain = get_ritual_chain(ritual_type, retry)
+    rng = np.random.default_rng(seed)
+    size = len(chain.phases)
+    cumulative = np.cumsum(chain.transitions, axis=1)
+    cumulative[:, -1] = 1.0
+
+    state = np.zeros(paths, dtype=np.int64)
+    steps = np.zeros(paths, dtype=np.int64)
+    active = np.arange(paths)
+    while active.size:
+        current = state[active]
+        steps[active] += chain.costs[current]
+        draws = rng.random(active.size)
+        following = np.empty_like(current)
+        for phase in range(size):
+            in_phase = current == phase
+            following[in_phase] = np.searchsorted(cumulative[phase], draws[in_phase], side="right")
+        state[active] = following
+        active = active[following < size]
+
+    completed = state == size
+    return np.bincount(steps[completed]), np.bincount(steps[~completed])
+
+def _merge(total: np.ndarray, histogram: np.ndarray) -> np.ndarray:
+    if histogram.size > total.size:
+        total, histogram = histogram, total
+    total = total.copy()
+    total[:histogram.size] += histogram
+    return total
+
+def _percentile(histogram: np.ndarray, quantile: float) -> int:
+    cdf = np.cumsum(histogram) / histogram.sum()
+    return int(np.searchsorted(cdf, quantile))
+
+def monte_carlo(ritual_type: str = "LBRP", paths: int = 1_000_000, seed: Optional[int] = None,
+                retry: float = DEFAULT_RETRY, workers: int = 1, chunk_size: int = 250_000) -> Dict:
+    """Simulate ``paths`` ritual paths and summarize their outcome and step distributions"""
+    chunks: List[int] = [chunk_size] * (paths // chunk_size)
+    if paths % chunk_size:
+        chunks.append(paths % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    args = ([ritual_type] * len(chunks), chunks, seeds, [retry] * len(chunks))
+
+    if workers <= 1 or len(chunks) <= 1:
+        results = map(simulate_chunk, *args)
+        return _summarize(ritual_type, retry, paths, results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _summarize(ritual_type, retry, paths, pool.map(simulate_chunk, *args))
+
+def _summarize(ritual_type: str, retry: float, paths: int, results) -> Dict:
+    completed = abandoned = np.zeros(0, dtype=np.int64)
+    for chunk_completed, chunk_abandoned in results:
+        completed = _merge(completed, chunk_completed)
+        abandoned = _merge(abandoned, chunk_abandoned)
+    total = _merge(completed, abandoned)
+    lengths = np.arange(total.size)
+    completions = int(completed.sum())
+
+    return {
+        "ritual_type": ritual_type,
+        "retry": retry,
+        "paths": paths,
+        "completion_rate": completions / paths if paths else 0.0,
+        "mean_steps": float(lengths @ total / paths) if paths else 0.0,
+        "mean_steps_completed": float(lengths[:completed.size] @ completed / completions) if completions else None,
+        "steps_p50": _percentile(total, 0.5) if paths else None,
+        "steps_p90": _percentile(total, 0.9) if paths else None,
+        "steps_p99": _percentile(total, 0.99) if paths else None,
+        "steps_histogram": total.tolist()
+    }
@@ -0,0 +1,106 @@
+"""Data models for the LBRP engine"""
+import sys
+from enum import Enum
+from dataclasses import dataclass
+from typing import NamedTuple, Optional, Tuple, Union
+
+class Direction(Enum):
+    EAST = ("East", "⬟", "#87ceeb")
+    SOUTH = ("South", "⬠", "#ff4500")
+    WEST = ("West", "⬟", "#1e90ff")
+    NORTH = ("North", "⬠", "#8b4513")
+    
+    def __init__(self, display_name: str, symbol: str, color: str):
+        self.display_name = display_name
+        self.symbol = symbol
+        self.color = color
+
+class Element(Enum):
+    AIR = "Air"
+    FIRE = "Fire"
+    WATER = "Water"
+    EARTH = "Earth"
+    SPIRIT = "Spirit"
+
+class Sephira(Enum):
+    KETER = "Keter"
+    CHESED = "Chesed"
+    GEVURAH = "Gevurah"
+    TIFERET = "Tiferet"
+    MALKUTH = "Malkuth"
+
+@dataclass
+class KabbalisticEntity:
+    """Data container for Kabbalistic correspondences"""
+    name: str
+    sephira: Sephira
+    divine_name: str
+    element: Element
+    direction: Direction
+    hebrew_letter: str = ""
+    
+    @property
+    def color(self) -> str:
+        return self.direction.color
+
+# A step's markup: literal HTML, or a reference ("kind", *args) that
+# ``rendering.resolve_html`` turns into markup on demand
+HtmlRef = Union[str, Tuple]
+
+class _RitualStepFields(NamedTuple):
+    phase: str
+    number: int
+    title: str
+    description: str
+    vibration: str = ""
+    gesture: str = ""
+    visualization: str = ""
+    sephira: Optional[Sephira] = None
+    html: HtmlRef = ""
+    duration: float = 0.0  # seconds allotted in guided practice
+
+class RitualStep(_RitualStepFields):
+    """Immutable, compact ritual step shared read-only by every session
+    
+    Steps are plain tuples (no per-instance ``__dict__``). The short labels
+    repeated across steps and rituals (phase, title, gesture, visualization)
+    are interned. Descriptions and vibrations are not: interned strings are
+    immortal on CPython 3.12+, and custom sequences create unique ones that
+    must be freed when their cache entry is evicted.
+
+    Generated markup is referenced rather than embedded: ``html`` holds the
+    generator call that produces it, and ``html_content`` renders it through
+    a bounded cache shared by every step and ritual.
+    """
+    __slots__ = ()
+    
+    def __new__(cls, phase: str, number: int, title: str, description: str,
+                vibration: str = "", gesture: str = "", visualization: str = "",
+                sephira: Optional[Sephira] = None, html: HtmlRef = "", duration: float = 0.0):
+        intern = sys.intern
+        return super().__new__(
+            cls, intern(phase), number, intern(title), description,
+            vibration, intern(gesture), intern(visualization),
+            sephira, html, float(duration)
+        )
+    
+    @property
+    def html_content(self) -> str:
+        if isinstance(self.html, str):
+            return self.html
+        from .rendering import resolve_html
+        return resolve_html(self.html)
+    
+    def to_dict(self):
+        return {
+            "phase": self.phase,
+            "number": self.number,
+            "title": self.title,
+            "description": self.description,
+            "vibration": self.vibration,
+            "gesture": self.gesture,
+            "visualization": self.visualization,
+            "sephira": self.sephira.value if self.sephira else None,
+            "html_content": self.html_content,
+            "duration": self.duration
+        }
@@ -0,0 +1,78 @@
+"""Pre-rendered markup fragments shared by every session"""
+import json
+import re
+from functools import lru_cache
+from typing import Tuple
+
+from .compiler import HTML_SOURCES, PRERENDERED_HTML
+from .generators import CSS_STYLES, HTMLGenerator
+from .instrumentation import register_cache
+from .models import RitualStep
+from .simulator import get_step_catalog
+
+_PRE_BLOCK = re.compile(r"(<pre\b.*?</pre>)", re.IGNORECASE | re.DOTALL)
+
+def compact_markup(html: str) -> str:
+    """Flatten indented markup so markdown never mistakes it for a code block
+
+    ``<pre>`` blocks keep their line breaks and indentation.
+    """
+    return "".join(
+        part if index % 2 else "".join(line.strip() for line in part.splitlines())
+        for index, part in enumerate(_PRE_BLOCK.split(html))
+    )
+
+@register_cache
+@lru_cache(maxsize=1024)
+def resolve_html(ref: tuple) -> str:
+    """Markup behind a step's HTML reference, generated on first use"""
+    markup = PRERENDERED_HTML.get(ref)
+    if markup is None:
+        kind, *args = ref
+        markup = HTML_SOURCES[kind](*args)
+    return markup
+
+@register_cache
+@lru_cache(maxsize=None)
+def render_step_fragment(step: RitualStep, pentagram_index: int = -1) -> str:
+    """Render one step's main-region markup; steps shared between rituals render once"""
+    html = HTMLGenerator.generate_step(step)
+    if step.phase == "Formulating Pentagrams":
+        html += HTMLGenerator.generate_direction_indicator(pentagram_index % 4)
+    elif step.phase == "Archangel Evocation":
+        html += HTMLGenerator.generate_archangel_correspondences()
+    return compact_markup(html)
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_step_fragments(ritual_type: str = "LBRP") -> Tuple[str, ...]:
+    """Pre-render the main-region markup of every step once per process"""
+    fragments = []
+    pentagram_index = 0
+    for step in get_step_catalog(ritual_type):
+        if step.phase == "Formulating Pentagrams":
+            fragments.append(render_step_fragment(step, pentagram_index))
+            pentagram_index += 1
+        else:
+            fragments.append(render_step_fragment(step))
+    return tuple(fragments)
+
+@register_cache
+@lru_cache(maxsize=1024)
+def get_panel_fragment(balance: Tuple[int, ...]) -> str:
+    """Pre-render the elemental balance panel for a balance (the Tree of Life is a plotly figure)"""
+    return "<h3>⚖️ Elemental Balance</h3>" + compact_markup(HTMLGenerator.generate_balance(balance))
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_navigation_bundle(ritual_type: str = "LBRP") -> str:
+    """Serialize the compiled sequence, fragments and CSS for client-side navigation"""
+    steps = get_step_catalog(ritual_type)
+    return json.dumps({
+        "ritual_type": ritual_type,
+        "css": CSS_STYLES,
+        "steps": [
+            {"phase": step.phase, "title": step.title, "html": html}
+            for step, html in zip(steps, get_step_fragments(ritual_type))
+        ]
+    }, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,264 @@
+"""Per-session memory accounting and an idle-session compaction/eviction policy
+
+Streamlit keeps a session's state for as long as its tab stays open, even if
+nobody looks at it again. ``SessionRegistry`` tracks every session's state
+(through a weak reference, so closed sessions disappear by themselves) and
+the time of its last rerun. Sweeps run at most every ``sweep_interval``
+seconds, piggybacking on whichever session reruns next, and:
+
+* measure the approximate bytes each session holds in state,
+* compact sessions idle for ``compact_after`` seconds by dropping the
+  policy's ``heavy_keys`` (caches that rebuild lazily, e.g. the balance
+  model or a prepared export),
+* evict sessions idle for ``evict_after`` seconds down to the policy's
+  ``cursor_keys``, the few small values needed to resume where they were
+  (widget values stay: the browser owns them and resends them anyway).
+
+A sweep runs on another session's thread, so each session's own script run
+holds it (``running``): sessions mid-run are skipped and picked up by a
+later sweep, and a session that starts a run waits for a sweep working on
+its state to finish. Listeners (``add_listener``) hear of every session
+evicted or released, to drop what they keep for it outside session state.
+
+Both thresholds come from ``LBRP_SESSION_COMPACT_SECONDS`` (default 600) and
+``LBRP_SESSION_EVICT_SECONDS`` (default 3600); 0 disables a tier.
+"""
+import os
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from enum import Enum
+from functools import lru_cache
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .instrumentation import register_gauge
+
+COMPACT_SECONDS = float(os.environ.get("LBRP_SESSION_COMPACT_SECONDS", "600"))
+EVICT_SECONDS = float(os.environ.get("LBRP_SESSION_EVICT_SECONDS", "3600"))
+SWEEP_SECONDS = float(os.environ.get("LBRP_SESSION_SWEEP_SECONDS", "30"))
+
+_LEAVES = (str, bytes, bytearray, int, float, complex, bool, type(None), range)
+# Code and enum members are shared by every session and not counted
+_SHARED = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType, Enum)
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate bytes reachable from ``obj``, counting each object once
+
+    Containers, ``__dict__`` and ``__slots__`` attributes are followed; NumPy
+    views count the array owning their data.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, _LEAVES):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            stack.extend(getattr(item, "__dict__", {}).values())
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+            base = getattr(item, "base", None)
+            if base is not None:
+                stack.append(base)
+    return total
+
+def _items(state) -> Dict[str, Any]:
+    """Keyed values of a session state (Streamlit's state or a plain mapping)"""
+    filtered = getattr(type(state), "filtered_state", None)
+    return dict(state.filtered_state if filtered is not None else state.items())
+
+def _widget_keys(state) -> set:
+    """Keys of widget values in a Streamlit session state (the browser owns and resends them)
+
+    Read from a private attribute; if it is missing or unreadable, no key
+    is treated as a widget and widget-key accounting is skipped.
+    """
+    try:
+        return set(getattr(state, "_key_id_mapping", None) or ())
+    except Exception:
+        return set()
+
+def state_footprint(state) -> Dict[str, int]:
+    """Approximate bytes held per key of a session state"""
+    return {key: deep_sizeof(value) for key, value in _items(state).items()}
+
+class SessionPolicy(NamedTuple):
+    """When idle sessions are compacted or evicted, and what each step keeps"""
+    heavy_keys: Tuple[str, ...]      # dropped on compaction; must rebuild lazily
+    cursor_keys: Tuple[str, ...]     # the only keys an evicted session keeps
+    compact_after: float = COMPACT_SECONDS
+    evict_after: float = EVICT_SECONDS
+
+class SessionFootprint(NamedTuple):
+    session_id: str
+    bytes: int
+    idle_seconds: float
+    status: str  # "active", "compacted" or "evicted"
+
+class SweepReport(NamedTuple):
+    sessions: int
+    compacted: int
+    evicted: int
+    released: int  # sessions whose state was garbage collected since the last sweep
+
+class _Tracked:
+    __slots__ = ("state", "last_seen", "status", "bytes", "lock")
+
+    def __init__(self, state, last_seen: float):
+        self.state = weakref.ref(state)
+        self.last_seen = last_seen
+        self.status = "active"
+        self.bytes = 0
+        self.lock = threading.Lock()  # held by the session's script run, or by a sweep
+
+class SessionRegistry:
+    """Idle-time policy and memory accounting over every live session's state"""
+
+    def __init__(self, policy: SessionPolicy, sweep_interval: float = SWEEP_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sweep_lock = threading.Lock()
+        self._sessions: Dict[str, _Tracked] = {}
+        self._last_sweep = clock()
+        self._listeners: Dict[str, Callable[[str], None]] = {}
+        self.compacted = 0
+        self.evicted = 0
+
+    def touch(self, session_id: str, state) -> None:
+        """Record a rerun of ``session_id``; sweeps if the interval has elapsed"""
+        # Streamlit wraps the session's state in a new SafeSessionState per rerun
+        state = getattr(state, "_state", state)
+        now = self._clock()
+        with self._lock:
+            tracked = self._sessions.get(session_id)
+            if tracked is None or tracked.state() is not state:
+                self._sessions[session_id] = _Tracked(state, now)
+            else:
+                tracked.last_seen = now
+                tracked.status = "active"
+            due = now - self._last_sweep >= self.sweep_interval
+            if due:
+                self._last_sweep = now
+        if due:
+            self.sweep()
+
+    @contextmanager
+    def running(self, session_id: str, state) -> Iterator[None]:
+        """Touch ``session_id`` and hold it for one script run, so sweeps leave its state alone"""
+        self.touch(session_id, state)
+        with self._lock:
+            tracked = self._sessions[session_id]
+        with tracked.lock:
+            yield
+
+    def add_listener(self, name: str, callback: Callable[[str], None]) -> None:
+        """Call ``callback(session_id)`` after a sweep evicts or releases a session (replaces ``name``)"""
+        with self._lock:
+            self._listeners[name] = callback
+
+    def forget(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def sweep(self) -> SweepReport:
+        """Compact or evict idle sessions and re-measure every session"""
+        if not self._sweep_lock.acquire(blocking=False):
+            return SweepReport(len(self._sessions), 0, 0, 0)
+        try:
+            compacted = evicted = released = 0
+            dropped = []
+            with self._lock:
+                tracked_sessions = list(self._sessions.items())
+            for session_id, tracked in tracked_sessions:
+                state = tracked.state()
+                if state is None:
+                    self.forget(session_id)
+                    dropped.append(session_id)
+                    released += 1
+                    continue
+                if not tracked.lock.acquire(blocking=False):
+                    continue  # mid-run, so not idle; measured by a later sweep
+                try:
+                    idle = self._clock() - tracked.last_seen
+                    evict_after, compact_after = self.policy.evict_after, self.policy.compact_after
+                    if evict_after > 0 and idle >= evict_after and tracked.status != "evicted":
+                        keep = set(self.policy.cursor_keys) | _widget_keys(state)
+                        self._drop(state, set(_items(state)) - keep)
+                        tracked.status = "evicted"
+                        dropped.append(session_id)
+                        evicted += 1
+                    elif compact_after > 0 and idle >= compact_after and tracked.status == "active":
+                        self._drop(state, self.policy.heavy_keys)
+                        tracked.status = "compacted"
+                        compacted += 1
+                    tracked.bytes = sum(state_footprint(state).values())
+                finally:
+                    tracked.lock.release()
+            self.compacted += compacted
+            self.evicted += evicted
+            with self._lock:
+                listeners = list(self._listeners.values())
+            for session_id in dropped:
+                for callback in listeners:
+                    callback(session_id)
+            return SweepReport(len(tracked_sessions) - released, compacted, evicted, released)
+        finally:
+            self._sweep_lock.release()
+
+    @staticmethod
+    def _drop(state, keys: Iterable[str]) -> None:
+        for key in keys:
+            try:
+                del state[key]
+            except KeyError:
+                pass
+
+    # ---------- accounting ----------
+    def footprints(self) -> List[SessionFootprint]:
+        """Each live session's bytes in state (as of the last sweep), largest first"""
+        now = self._clock()
+        with self._lock:
+            footprints = [
+                SessionFootprint(session_id, tracked.bytes, now - tracked.last_seen, tracked.status)
+                for session_id, tracked in self._sessions.items() if tracked.state() is not None
+            ]
+        return sorted(footprints, key=lambda footprint: footprint.bytes, reverse=True)
+
+    def summary(self) -> Dict[str, float]:
+        footprints = self.footprints()
+        statuses = [footprint.status for footprint in footprints]
+        return {
+            "sessions": len(footprints),
+            "sessions_compacted": statuses.count("compacted"),
+            "sessions_evicted": statuses.count("evicted"),
+            "session_state_bytes": sum(footprint.bytes for footprint in footprints),
+            "session_state_bytes_max": max((footprint.bytes for footprint in footprints), default=0)
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+@lru_cache(maxsize=None)
+def get_session_registry(policy: SessionPolicy) -> SessionRegistry:
+    """Process-wide registry for a policy; its summary is exported as metrics gauges"""
+    registry = SessionRegistry(policy)
+    for name in registry.summary():
+        register_gauge(name, lambda name=name: registry.summary()[name])
+    return registry
@@ -0,0 +1,28 @@
+"""Process-wide step catalog and per-session simulator views"""
+from functools import lru_cache
+from typing import Tuple
+
+from .compiler import load_compiled
+from .instrumentation import register_cache
+from .models import RitualStep
+
+RITUAL_TYPES = ("LBRP", "LIRP")
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_step_catalog(ritual_type: str = "LBRP") -> Tuple[RitualStep, ...]:
+    """Load a ritual's compiled step sequence once per process, shared by all sessions"""
+    return load_compiled(ritual_type)
+
+class LBRPSimulator:
+    """Lightweight view over the shared step catalog for one ritual type"""
+    
+    __slots__ = ("ritual_type",)
+    
+    def __init__(self, ritual_type: str = "LBRP"):
+        self.ritual_type = ritual_type
+    
+    @property
+    def steps(self) -> Tuple[RitualStep, ...]:
+        """Shared, immutable steps for this ritual type"""
+        return get_step_catalog(self.ritual_type)
@@ -0,0 +1,190 @@
+"""Static, pre-rendered walkthrough of every ritual for serving from a CDN
+
+``build_static_site`` writes a self-contained bundle::
+
+    index.html                   ritual chooser
+    lbrp.html, lirp.html, ...    every step pre-rendered, one page per ritual
+    assets/lbrp.<hash>.css       CSS_STYLES plus the page layout
+    assets/navigator.<hash>.js   step navigation (buttons, arrow keys, #step-N)
+    manifest.json                logical asset names -> hashed files, sizes
+
+Asset names carry a hash of their content, so they can be served with
+``Cache-Control: immutable`` and never need invalidating; only the small
+HTML entry points should be revalidated. Without JavaScript every step is
+shown in order. Anonymous readers never touch Python; interactive sessions
+(guided practice, journaling, balance) stay on the Streamlit app.
+"""
+import glob
+import gzip
+import hashlib
+import html
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .compiler import load_definition
+from .fragments import render_fragment
+from .generators import CSS_STYLES, TREE_OF_LIFE_HTML
+from .rendering import compact_markup, get_step_fragments
+from .simulator import RITUAL_TYPES, get_step_catalog
+
+ASSETS_DIR = "assets"
+HASH_LENGTH = 12
+
+_LAYOUT_CSS = """
+body { font-family: "Source Sans Pro", sans-serif; background: #0e1117; color: #fafafa; margin: 0; }
+.page { display: flex; gap: 2rem; max-width: 1200px; margin: 0 auto; padding: 1rem; }
+.page main { flex: 2; min-width: 0; }
+.page aside { flex: 1; min-width: 0; }
+.nav { display: flex; align-items: center; justify-content: space-between; gap: 1rem; }
+.nav button { background: transparent; color: inherit; border: 1px solid rgba(250, 250, 250, 0.2);
+              border-radius: 0.5rem; padding: 0.4rem 0.9rem; cursor: pointer; font-size: 1rem; }
+.nav button:disabled { opacity: 0.4; cursor: default; }
+.nav, .progress-container { display: none; }
+.js .nav { display: flex; }
+.js .progress-container { display: block; }
+.js .step { display: none; }
+.js .step.current { display: block; }
+a { color: #ffd700; }
+"""
+
+# Shows one step at a time; the address hash (#step-N) makes every step linkable
+_NAVIGATOR_JS = """
+(function () {
+    document.documentElement.classList.add("js");
+    var steps = document.querySelectorAll(".step");
+    var position = document.getElementById("position");
+    var progress = document.getElementById("progress");
+    var prev = document.getElementById("prev");
+    var next = document.getElementById("next");
+    var cursor = -1;
+
+    function fromHash() {
+        var match = /^#step-(\\d+)$/.exec(location.hash);
+        return match ? Number(match[1]) - 1 : 0;
+    }
+
+    function show(step) {
+        step = Math.min(Math.max(step, 0), steps.length - 1);
+        if (step === cursor) return;
+        if (cursor >= 0) steps[cursor].classList.remove("current");
+        cursor = step;
+        steps[cursor].classList.add("current");
+        position.textContent = "Step " + (cursor + 1) + " of " + steps.length;
+        progress.style.width = (cursor / steps.length * 100) + "%";
+        prev.disabled = cursor === 0;
+        next.disabled = cursor >= steps.length - 1;
+        if (fromHash() !== cursor) history.replaceState(null, "", "#step-" + (cursor + 1));
+    }
+
+    prev.addEventListener("click", function () { show(cursor - 1); });
+    next.addEventListener("click", function () { show(cursor + 1); });
+    document.addEventListener("keydown", function (event) {
+        if (event.key === "ArrowLeft") show(cursor - 1);
+        if (event.key === "ArrowRight") show(cursor + 1);
+    });
+    window.addEventListener("hashchange", function () { show(fromHash()); });
+    show(fromHash());
+})();
+"""
+
+def _css() -> str:
+    styles = CSS_STYLES.strip()
+    styles = styles[len("<style>"):-len("</style>")] if styles.startswith("<style>") else styles
+    return styles.strip() + "\n" + _LAYOUT_CSS.lstrip()
+
+def _hashed_name(stem: str, suffix: str, payload: bytes) -> str:
+    return f"{ASSETS_DIR}/{stem}.{hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]}{suffix}"
+
+def _page(title: str, assets: Dict[str, str], body: str, navigator: bool = True) -> str:
+    script = f"<script defer src='{assets['navigator.js']}'></script>" if navigator else ""
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        "<meta name='viewport' content='width=device-width, initial-scale=1'>"
+        f"<title>{html.escape(title)}</title>"
+        f"<link rel='stylesheet' href='{assets['lbrp.css']}'>{script}"
+        f"</head><body>{body}</body></html>\n"
+    )
+
+def _ritual_page(ritual_type: str, assets: Dict[str, str]) -> str:
+    title = load_definition(ritual_type).get("title", ritual_type)
+    steps = "".join(
+        f"<section class='step' id='step-{number}' aria-label='Step {number}: {html.escape(step.title)}'>"
+        f"{fragment}</section>"
+        for number, (step, fragment) in enumerate(
+            zip(get_step_catalog(ritual_type), get_step_fragments(ritual_type)), 1
+        )
+    )
+    body = (
+        f"<div class='page'><main>"
+        f"<h1 class='main-header'>🔯 {html.escape(title)}</h1>"
+        f"<p><a href='index.html'>All rituals</a></p>"
+        f"<div class='nav'><button id='prev' type='button'>◀️ Previous</button>"
+        f"<span id='position'></span><button id='next' type='button'>Next ▶️</button></div>"
+        f"<div class='progress-container'><div class='progress-bar' id='progress' style='width: 0%;'></div></div>"
+        f"{steps}</main>"
+        f"<aside><h3>🌳 Tree of Life</h3>{compact_markup(TREE_OF_LIFE_HTML)}"
+        f"<details><summary>📜 Reference</summary>"
+        f"{render_fragment('elemental-table')}{render_fragment('pentagram-guide')}</details>"
+        f"</aside></div>"
+    )
+    return _page(title, assets, body)
+
+def _index_page(ritual_types: Iterable[str], assets: Dict[str, str]) -> str:
+    links = "".join(
+        f"<li><a href='{ritual_type.lower()}.html'>{html.escape(load_definition(ritual_type).get('title', ritual_type))}"
+        f"</a> ({len(get_step_catalog(ritual_type))} steps)</li>"
+        for ritual_type in ritual_types
+    )
+    body = f"<div class='page'><main><h1 class='main-header'>🔯 LBRP Algorithm Simulator</h1><ul>{links}</ul></main></div>"
+    return _page("LBRP Algorithm Simulator", assets, body, navigator=False)
+
+def _write(output_dir: str, name: str, payload: bytes) -> Dict:
+    path = os.path.join(output_dir, name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(payload)
+    os.replace(tmp_path, path)
+    return {"path": name, "bytes": len(payload), "gzip_bytes": len(gzip.compress(payload, 9))}
+
+def build_static_site(output_dir: str, ritual_types: Optional[Iterable[str]] = None, clean: bool = False) -> Dict:
+    """Write the static bundle to ``output_dir`` and return a size and build-time report
+
+    Hashed assets of earlier builds are kept, so pages still cached at the
+    edge keep resolving, unless ``clean`` removes them.
+    """
+    start = time.perf_counter()
+    ritual_types = list(ritual_types or RITUAL_TYPES)
+    os.makedirs(os.path.join(output_dir, ASSETS_DIR), exist_ok=True)
+
+    files: List[Dict] = []
+    assets: Dict[str, str] = {}
+    for logical, payload in (("lbrp.css", _css()), ("navigator.js", _NAVIGATOR_JS.lstrip())):
+        data = payload.encode("utf-8")
+        stem, suffix = os.path.splitext(logical)
+        assets[logical] = _hashed_name(stem, suffix, data)
+        files.append(_write(output_dir, assets[logical], data))
+
+    pages = {f"{ritual_type.lower()}.html": _ritual_page(ritual_type, assets) for ritual_type in ritual_types}
+    pages["index.html"] = _index_page(ritual_types, assets)
+    for name, markup in pages.items():
+        files.append(_write(output_dir, name, markup.encode("utf-8")))
+
+    if clean:
+        current = set(assets.values())
+        for stale in glob.glob(os.path.join(output_dir, ASSETS_DIR, "*")):
+            if f"{ASSETS_DIR}/{os.path.basename(stale)}" not in current:
+                os.remove(stale)
+
+    report = {
+        "ritual_types": ritual_types,
+        "assets": assets,
+        "files": files,
+        "total_bytes": sum(entry["bytes"] for entry in files),
+        "total_gzip_bytes": sum(entry["gzip_bytes"] for entry in files),
+        "build_seconds": time.perf_counter() - start
+    }
+    manifest = {key: report[key] for key in ("ritual_types", "assets", "files")}
+    _write(output_dir, "manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+    return report
@@ -0,0 +1,213 @@
+"""Interactive Tree of Life figure (plotly) highlighting a ritual's progress
+
+The ten sephirot and twenty-two paths have a fixed layout, so the node and
+path coordinates are computed once. The base figure (all paths dimmed, the
+sephirot in their colours, and two empty overlay traces) is built and
+serialized once per process.
+
+A step's highlight is the sephira it works with, plus every path traversed
+so far. Moving between sephirot that share no path follows the shortest
+route through the tree. ``traverse`` computes the highlights of a whole
+sequence in one pass. Each distinct highlight becomes a small delta (the
+coordinates of the two overlay traces), applied to a copy of the base figure
+once and cached. A rerun only looks up the figure for its step, so the cost
+does not grow with the length of the sequence or with the step reached.
+
+Steps without a sephira keep the previous path. Archangels stand at their
+quarter's sephira.
+"""
+import json
+from collections import deque
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple
+
+import plotly.graph_objects as go
+
+from .correspondence_index import get_correspondence_index
+from .correspondences import SEPHIRA_COLORS
+from .instrumentation import register_cache
+from .models import RitualStep
+from .simulator import get_step_catalog
+
+# The pillar of severity on the right, as projected onto the practitioner in
+# the Qabalistic Cross (Gevurah at the right shoulder, Chesed at the left)
+SEPHIROT = {
+    # name: (x, y, hebrew, meaning)
+    "Keter": (0.0, 10.0, "כֶּתֶר", "Crown"),
+    "Chokmah": (-1.6, 9.0, "חָכְמָה", "Wisdom"),
+    "Binah": (1.6, 9.0, "בִּינָה", "Understanding"),
+    "Chesed": (-1.6, 6.6, "חֶסֶד", "Mercy"),
+    "Gevurah": (1.6, 6.6, "גְּבוּרָה", "Severity"),
+    "Tiferet": (0.0, 5.4, "תִּפְאֶרֶת", "Beauty"),
+    "Netzach": (-1.6, 3.6, "נֶצַח", "Victory"),
+    "Hod": (1.6, 3.6, "הוֹד", "Glory"),
+    "Yesod": (0.0, 2.2, "יְסוֹד", "Foundation"),
+    "Malkuth": (0.0, 0.0, "מַלְכוּת", "Kingdom")
+}
+NODE_COLORS = {
+    **{sephira.value: color for sephira, color in SEPHIRA_COLORS.items()},
+    "Chokmah": "#a9a9a9",
+    "Binah": "#6a0dad",
+    "Netzach": "#2e8b57",
+    "Hod": "#ff8c00",
+    "Yesod": "#9370db"
+}
+# The 22 paths (11-32) with their Hebrew letters
+PATHS = (
+    ("Keter", "Chokmah", "א"), ("Keter", "Binah", "ב"), ("Keter", "Tiferet", "ג"),
+    ("Chokmah", "Binah", "ד"), ("Chokmah", "Tiferet", "ה"), ("Chokmah", "Chesed", "ו"),
+    ("Binah", "Tiferet", "ז"), ("Binah", "Gevurah", "ח"), ("Chesed", "Gevurah", "ט"),
+    ("Chesed", "Tiferet", "י"), ("Chesed", "Netzach", "כ"), ("Gevurah", "Tiferet", "ל"),
+    ("Gevurah", "Hod", "מ"), ("Tiferet", "Netzach", "נ"), ("Tiferet", "Yesod", "ס"),
+    ("Tiferet", "Hod", "ע"), ("Netzach", "Hod", "פ"), ("Netzach", "Yesod", "צ"),
+    ("Netzach", "Malkuth", "ק"), ("Hod", "Yesod", "ר"), ("Hod", "Malkuth", "ש"),
+    ("Yesod", "Malkuth", "ת")
+)
+HIGHLIGHT_COLOR = "#ffd700"
+FIGURE_HEIGHT = 460
+
+# Overlay traces of the base figure that a highlight fills in
+TRAVERSED_TRACE = 1
+CURRENT_TRACE = 3
+
+Path = Tuple[str, str]
+
+class TreeHighlight(NamedTuple):
+    """What one step lights up: its sephira and the paths traversed so far"""
+    sephira: Optional[str]
+    paths: FrozenSet[Path]
+
+_PATH_INDEX = {(a, b): position for position, (a, b, _) in enumerate(PATHS)}
+# Neighbours nearest the middle pillar first, so routes prefer it (Keter to Malkuth via Tiferet and Yesod)
+_NEIGHBOURS = {
+    name: sorted((b if a == name else a for a, b, _ in PATHS if name in (a, b)), key=lambda n: abs(SEPHIROT[n][0]))
+    for name in SEPHIROT
+}
+
+def _path_key(a: str, b: str) -> Path:
+    return (a, b) if (a, b) in _PATH_INDEX else (b, a)
+
+@lru_cache(maxsize=None)
+def route(start: str, end: str) -> Tuple[Path, ...]:
+    """Paths along the shortest route between two sephirot"""
+    previous = {start: start}
+    queue = deque([start])
+    while queue and end not in previous:
+        node = queue.popleft()
+        for neighbour in _NEIGHBOURS[node]:
+            if neighbour not in previous:
+                previous[neighbour] = node
+                queue.append(neighbour)
+    paths = []
+    node = end
+    while node != start:
+        paths.append(_path_key(previous[node], node))
+        node = previous[node]
+    return tuple(reversed(paths))
+
+def step_sephira(step: RitualStep) -> Optional[str]:
+    """The sephira a step works with; archangels stand at their quarter's"""
+    if step.sephira is not None:
+        return step.sephira.value
+    if step.vibration:
+        index = get_correspondence_index()
+        archangel = index.first("name", step.vibration, kind="archangel")
+        if archangel is not None:
+            quarter = index.first("direction", archangel.direction, kind="quarter")
+            if quarter is not None and quarter.sephira is not None:
+                return quarter.sephira.value
+    return None
+
+def traverse(steps: Iterable[RitualStep]) -> Tuple[TreeHighlight, ...]:
+    """Highlight of every step of a sequence, in one pass"""
+    highlights = []
+    paths: FrozenSet[Path] = frozenset()
+    last = None
+    for step in steps:
+        sephira = step_sephira(step)
+        if sephira is not None and last is not None and sephira != last:
+            added = set(route(last, sephira)) - paths
+            if added:
+                paths = paths | added
+        last = sephira or last
+        highlights.append(TreeHighlight(sephira, paths))
+    return tuple(highlights)
+
+@register_cache
+@lru_cache(maxsize=None)
+def get_tree_highlights(ritual_type: str = "LBRP") -> Tuple[TreeHighlight, ...]:
+    return traverse(get_step_catalog(ritual_type))
+
+def _line(paths: Iterable[Path]) -> Tuple[list, list]:
+    """Coordinates of path segments as one line trace (segments split by None)"""
+    xs, ys = [], []
+    for a, b in sorted(paths, key=_PATH_INDEX.__getitem__):
+        xs += [SEPHIROT[a][0], SEPHIROT[b][0], None]
+        ys += [SEPHIROT[a][1], SEPHIROT[b][1], None]
+    return xs, ys
+
+@lru_cache(maxsize=1)
+def get_base_figure() -> go.Figure:
+    """The Tree with nothing highlighted, built once per process"""
+    names = list(SEPHIROT)
+    path_x, path_y = _line(_PATH_INDEX)
+    midpoints = [((SEPHIROT[a][0] + SEPHIROT[b][0]) / 2, (SEPHIROT[a][1] + SEPHIROT[b][1]) / 2)
+                 for a, b, _ in PATHS]
+    figure = go.Figure([
+        go.Scatter(x=path_x, y=path_y, mode="lines", line={"color": "#444", "width": 2}, hoverinfo="skip"),
+        go.Scatter(x=[], y=[], mode="lines", line={"color": HIGHLIGHT_COLOR, "width": 5}, hoverinfo="skip"),
+        go.Scatter(
+            x=[SEPHIROT[name][0] for name in names], y=[SEPHIROT[name][1] for name in names],
+            mode="markers+text", text=names, textposition="bottom center",
+            textfont={"color": "#ddd", "size": 11},
+            marker={"size": 30, "color": [NODE_COLORS[name] for name in names], "line": {"color": "#222", "width": 1}},
+            customdata=[[SEPHIROT[name][2], SEPHIROT[name][3]] for name in names],
+            hovertemplate="<b>%{text}</b> %{customdata[0]}<br>%{customdata[1]}<extra></extra>"
+        ),
+        go.Scatter(x=[], y=[], mode="markers", hoverinfo="skip",
+                   marker={"size": 46, "symbol": "circle-open", "color": HIGHLIGHT_COLOR, "line": {"width": 4}}),
+        go.Scatter(
+            x=[x for x, _ in midpoints], y=[y for _, y in midpoints], mode="markers",
+            marker={"size": 10, "opacity": 0}, text=[letter for _, _, letter in PATHS],
+            customdata=[[number, f"{a} – {b}"] for number, (a, b, _) in enumerate(PATHS, 11)],
+            hovertemplate="Path %{customdata[0]} (%{text})<br>%{customdata[1]}<extra></extra>"
+        )
+    ])
+    figure.update_layout(
+        height=FIGURE_HEIGHT, showlegend=False, margin={"l": 0, "r": 0, "t": 0, "b": 0},
+        paper_bgcolor="#000", plot_bgcolor="#000", dragmode=False,
+        xaxis={"visible": False, "range": [-2.6, 2.6], "fixedrange": True},
+        yaxis={"visible": False, "range": [-0.9, 10.8], "fixedrange": True}
+    )
+    return figure
+
+@lru_cache(maxsize=1)
+def get_base_figure_json() -> str:
+    """The base figure serialized once"""
+    return get_base_figure().to_json()
+
+@register_cache
+@lru_cache(maxsize=1024)
+def highlight_delta(highlight: TreeHighlight) -> Tuple[Tuple[int, Dict], ...]:
+    """Trace updates that turn the base figure into a highlight"""
+    path_x, path_y = _line(highlight.paths)
+    current = SEPHIROT.get(highlight.sephira)
+    return (
+        (TRAVERSED_TRACE, {"x": path_x, "y": path_y}),
+        (CURRENT_TRACE, {"x": [current[0]] if current else [], "y": [current[1]] if current else []})
+    )
+
+@register_cache
+@lru_cache(maxsize=256)
+def highlight_figure(highlight: TreeHighlight) -> go.Figure:
+    """The base figure with a highlight's delta applied, built once per distinct highlight"""
+    figure = go.Figure(json.loads(get_base_figure_json()))
+    with figure.batch_update():
+        for trace, update in highlight_delta(highlight):
+            figure.data[trace].update(update)
+    return figure
+
+def get_tree_figure(ritual_type: str, step: int) -> go.Figure:
+    """Figure for a session's step; shared between sessions, so do not mutate it"""
+    highlights = get_tree_highlights(ritual_type)
+    return highlight_figure(highlights[min(max(step, 0), len(highlights) - 1)])
@@ -1,406 +1,115 @@
 import streamlit as st
-import json
-from enum import Enum
-from dataclasses import dataclass
-import random
+import streamlit.components.v1 as components
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import os
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
-from functools import lru_cache
 
-# ==================== CONSTANTS ====================
-CSS_STYLES = """
-<style>
-    :root {
-        --keter-color: #ffffff;
-        --chesed-color: #4169e1;
-        --gevurah-color: #dc143c;
-        --tiferet-color: #ffd700;
-        --malkuth-color: #228b22;
-    }
-    
-    .main-header {
-        background: linear-gradient(90deg, #000428 0%, #004e92 100%);
-        color: white;
-        padding: 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-        text-align: center;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-    }
-    
-    .ritual-phase-card {
-        background: rgba(255, 255, 255, 0.05);
-        border-left: 4px solid var(--tiferet-color);
-        padding: 1.5rem;
-        margin: 1rem 0;
-        border-radius: 8px;
-        transition: all 0.3s ease;
-    }
-    
-    .ritual-phase-card:hover {
-        background: rgba(255, 215, 0, 0.1);
-        transform: translateX(5px);
-    }
-    
-    .vibration-text {
-        animation: vibrate 0.5s linear infinite;
-        font-weight: bold;
-        color: #ffd700;
-    }
-    
-    .progress-container {
-        height: 20px;
-        background: rgba(255,255,255,0.1);
-        border-radius: 10px;
-        margin: 1rem 0;
-        overflow: hidden;
-    }
-    
-    .progress-bar {
-        height: 100%;
-        background: linear-gradient(90deg, #ffd700, #ff8c00);
-        transition: width 0.5s ease;
-    }
-</style>
-"""
-
-TREE_OF_LIFE_HTML = """
-<div style='font-family: monospace; background: #000; color: #ffd700; padding: 2rem; border-radius: 10px; margin: 1rem 0; border: 1px solid #444;'>
-<pre style='text-align: center; margin: 0;'>
-               ╭────────── KETER ───────────╮
-               │         (ATEH)              │
-               │          Divine Will        │
-               ╰─────────────┬──────────────╯
-                             │
-                             ▼
-                          DA'AT
-                             │
-               ╭─────────────┴─────────────╮
-               │                           │
-               ▼                           ▼
-          CHESED (Mercy)           GEVURAH (Severity)
-          (VE-GEDULAH)             (VE-GEBURAH)
-                             │
-                             ▼
-                         TIFERET (Beauty)
-                             │
-               ╭─────────────┴─────────────╮
-               │                           │
-               ▼                           ▼
-            HOD (Glory)                NETZACH (Victory)
-                             │
-                             ▼
-                         YESOD (Foundation)
-                             │
-                             ▼
-                        MALKUTH (Kingdom)
-</pre>
-</div>
-"""
-
-# ==================== DATA MODELS ====================
-class Direction(Enum):
-    EAST = ("East", "⬟", "#87ceeb")
-    SOUTH = ("South", "⬠", "#ff4500")
-    WEST = ("West", "⬟", "#1e90ff")
-    NORTH = ("North", "⬠", "#8b4513")
-    
-    def __init__(self, display_name: str, symbol: str, color: str):
-        self.display_name = display_name
-        self.symbol = symbol
-        self.color = color
-
-class Element(Enum):
-    AIR = "Air"
-    FIRE = "Fire"
-    WATER = "Water"
-    EARTH = "Earth"
-    SPIRIT = "Spirit"
-
-class Sephira(Enum):
-    KETER = "Keter"
-    CHESED = "Chesed"
-    GEVURAH = "Gevurah"
-    TIFERET = "Tiferet"
-    MALKUTH = "Malkuth"
-
-@dataclass
-class KabbalisticEntity:
-    """Data container for Kabbalistic correspondences"""
-    name: str
-    sephira: Sephira
-    divine_name: str
-    element: Element
-    direction: Direction
-    hebrew_letter: str = ""
-    
-    @property
-    def color(self) -> str:
-        return self.direction.color
-
-@dataclass
-class RitualStep:
-    """Data container for ritual steps with serialization support"""
-    phase: str
-    number: int
-    title: str
-    description: str
-    vibration: str = ""
-    gesture: str = ""
-    visualization: str = ""
-    sephira: Optional[Sephira] = None
-    html_content: str = ""
-    
-    def to_dict(self):
-        return {
-            "phase": self.phase,
-            "number": self.number,
-            "title": self.title,
-            "description": self.description,
-            "vibration": self.vibration,
-            "gesture": self.gesture,
-            "visualization": self.visualization,
-            "sephira": self.sephira.value if self.sephira else None,
-            "html_content": self.html_content
-        }
-
-# ==================== CACHED DATA ====================
-@lru_cache(maxsize=1)
-def get_correspondences() -> Dict[Direction, KabbalisticEntity]:
-    """Cache correspondences to avoid recreation"""
-    return {
-        Direction.EAST: KabbalisticEntity(
-            "Air", Sephira.KETER, "YHVH (יהוה)", Element.AIR, Direction.EAST, "י"
-        ),
-        Direction.SOUTH: KabbalisticEntity(
-            "Fire", Sephira.GEVURAH, "ADONAI (אדני)", Element.FIRE, Direction.SOUTH, "ה"
-        ),
-        Direction.WEST: KabbalisticEntity(
-            "Water", Sephira.CHESED, "EHEIEH (אהיה)", Element.WATER, Direction.WEST, "ו"
-        ),
-        Direction.NORTH: KabbalisticEntity(
-            "Earth", Sephira.MALKUTH, "AGLA (אגלא)", Element.EARTH, Direction.NORTH, "ה"
-        )
-    }
-
-@lru_cache(maxsize=1)
-def get_archangels() -> Dict[Direction, Dict]:
-    """Cache archangel data"""
-    return {
-        Direction.EAST: {
-            "name": "Raphael",
-            "colors": "Yellow-Purple",
-            "attributes": "Healing, Wisdom, Air",
-            "hebrew": "רפאל",
-            "symbol": "⚗️"
-        },
-        Direction.SOUTH: {
-            "name": "Michael",
-            "colors": "Red-Green",
-            "attributes": "Protection, Fire, Strength",
-            "hebrew": "מיכאל",
-            "symbol": "⚔️"
-        },
-        Direction.WEST: {
-            "name": "Gabriel",
-            "colors": "Blue-Orange",
-            "attributes": "Strength, Water, Revelation",
-            "hebrew": "גבריאל",
-            "symbol": "🕊️"
-        },
-        Direction.NORTH: {
-            "name": "Uriel",
-            "colors": "Green-Brown",
-            "attributes": "Light, Earth, Wisdom",
-            "hebrew": "אוריאל",
-            "symbol": "🔥"
-        }
-    }
-
-@lru_cache(maxsize=1)
-def get_cross_steps() -> List[Tuple]:
-    """Cache cross ritual steps"""
-    return [
-        ("ATEH (אַתָּה)", "Touch forehead", "Keter - Divine Will", 
-         "Visualize white light descending", Sephira.KETER),
-        ("MALKUTH (מַלְכוּת)", "Point downward", "Malkuth - Kingdom", 
-         "Draw light to feet, connecting heaven and earth", Sephira.MALKUTH),
-        ("VE-GEBURAH (וְגבוּרָה)", "Touch right shoulder", "Gevurah - Severity/Power", 
-         "Red pillar of strength", Sephira.GEVURAH),
-        ("VE-GEDULAH (וְגדוּלָה)", "Touch left shoulder", "Chesed - Mercy/Glory", 
-         "Blue pillar of mercy", Sephira.CHESED),
-        ("LE-OLAM, AMEN (לעולם, אמן)", "Clasp hands at chest", "Tiferet - Beauty/Harmony", 
-         "Golden glow at heart center", Sephira.TIFERET)
-    ]
+import lbrp_engine
+from lbrp_engine import (
+    CSS_STYLES,
+    EXPORT_FORMATS,
+    LBRPSimulator,
+    encode_export,
+    get_navigation_bundle,
+    get_panel_fragment,
+    get_correspondence_index,
+    get_step_fragments,
+    render_fragment,
+)
+from lbrp_engine import instrumentation
+from lbrp_engine.instrumentation import stage
+from lbrp_engine.sessions import SessionPolicy, get_session_registry
+# Audio, balance, the Tree of Life figure, guided practice and the journal are
+# reached through lbrp_engine's lazy exports, so importing the app stays cheap
 
-# ==================== HTML GENERATORS ====================
-class HTMLGenerator:
-    """Static HTML generator methods"""
-    
-    @staticmethod
-    def generate_preparation() -> str:
-        return """
-        <div style='text-align: center; padding: 20px; background: linear-gradient(135deg, #000428 0%, #004e92 100%); color: white; border-radius: 10px;'>
-            <div style='font-size: 3rem; margin-bottom: 1rem;'>✡️</div>
-            <h3 style='color: #ffd700;'>Preparation Phase</h3>
-            <p>Microcosm aligning with Macrocosm</p>
-        </div>
-        """
-    
-    @staticmethod
-    def generate_cross_step(step_num: int, vibration: str, sephira: Sephira) -> str:
-        colors = {
-            Sephira.KETER: "#ffffff",
-            Sephira.CHESED: "#4169e1",
-            Sephira.GEVURAH: "#dc143c",
-            Sephira.TIFERET: "#ffd700",
-            Sephira.MALKUTH: "#228b22"
-        }
-        color = colors.get(sephira, "#ffffff")
-        
-        return f"""
-        <div style='border-left: 4px solid {color}; padding-left: 1rem; margin: 1rem 0;'>
-            <div style='display: flex; align-items: center; gap: 10px;'>
-                <div style='background: {color}; color: white; width: 30px; height: 30px; border-radius: 50%; display: flex; align-items: center; justify-content: center;'>
-                    {step_num}
-                </div>
-                <h4 style='color: {color}; margin: 0;'>{vibration.split(' ')[0]}</h4>
-            </div>
-            <p style='margin: 0.5rem 0;'><strong>Sephira:</strong> {sephira.value}</p>
-            <p class='vibration-text' style='font-size: 1.2rem;'>{vibration}</p>
-        </div>
-        """
-    
-    @staticmethod
-    def generate_pentagram(direction: Direction, entity: KabbalisticEntity, step_num: int) -> str:
-        rgb = ','.join(str(int(entity.color.lstrip('#')[i:i+2], 16)) for i in (0, 2, 4))
-        progress = (step_num / 4) * 100
-        
-        return f"""
-        <div style='background: rgba({rgb}, 0.1); padding: 1.5rem; border-radius: 10px; text-align: center;'>
-            <div style='font-size: 3rem; color: {entity.color};'>{direction.symbol}</div>
-            <h4 style='color: {entity.color};'>{direction.display_name} - {entity.element.value}</h4>
-            <p><strong>Divine Name:</strong> {entity.divine_name}</p>
-            <p><strong>Hebrew Letter:</strong> {entity.hebrew_letter}</p>
-            <div class='progress-container'>
-                <div class='progress-bar' style='width: {progress}%;'></div>
-            </div>
-        </div>
-        """
-    
-    @staticmethod
-    def generate_archangel(direction: Direction, archangel: Dict) -> str:
-        return f"""
-        <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 1rem; border-radius: 10px; margin: 0.5rem; text-align: center; min-height: 150px; display: flex; flex-direction: column; justify-content: center;'>
-            <div style='font-size: 2rem;'>{archangel['symbol']}</div>
-            <h4>{archangel['name']}</h4>
-            <p style='font-size: 1.5rem; margin: 0.5rem 0;'>{archangel['hebrew']}</p>
-            <p><small>{archangel['attributes']}</small></p>
-        </div>
-        """
+# ==================== STREAMLIT APP ====================
+_navigator = components.declare_component(
+    "lbrp_navigator",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "navigator")
+)
 
-# ==================== MAIN SIMULATOR ====================
-class LBRPSimulator:
-    """Optimized LBRP simulator with lazy loading"""
-    
-    def __init__(self):
-        self._steps = None
-        self.current_step = 0
-        self.ritual_type = "LBRP"
-    
-    @property
-    def steps(self) -> List[RitualStep]:
-        """Lazy load steps"""
-        if self._steps is None:
-            self._steps = self._generate_steps()
-        return self._steps
-    
-    def _generate_steps(self) -> List[RitualStep]:
-        """Generate ritual steps"""
-        steps = []
-        
-        # Preparation
-        steps.append(RitualStep(
-            "Preparation", 1, "Centering & Intention",
-            "Take three deep breaths. Visualize expanding to cosmic scale. Set intention for purification and protection.",
-            visualization="White light expanding from your center",
-            html_content=HTMLGenerator.generate_preparation()
-        ))
-        
-        # Qabalistic Cross
-        steps.extend(self._add_cross_phase("Qabalistic Cross", amplified=False))
-        
-        # Pentagrams
-        correspondences = get_correspondences()
-        for i, direction in enumerate(Direction, 1):
-            entity = correspondences[direction]
-            steps.append(RitualStep(
-                "Formulating Pentagrams", len(steps) + 1,
-                f"{direction.display_name} Pentagram",
-                f"Drawing {entity.element.value} pentagram with divine name {entity.divine_name}",
-                vibration=entity.divine_name,
-                gesture="Sign of Enterer → Sign of Silence",
-                visualization=f"{entity.color} flame forming pentagram",
-                sephira=entity.sephira,
-                html_content=HTMLGenerator.generate_pentagram(direction, entity, i)
-            ))
-        
-        # Archangels
-        archangels = get_archangels()
-        positions = {
-            Direction.EAST: "Before me",
-            Direction.WEST: "Behind me",
-            Direction.SOUTH: "On my right",
-            Direction.NORTH: "On my left"
-        }
-        
-        for direction in Direction:
-            archangel = archangels[direction]
-            steps.append(RitualStep(
-                "Archangel Evocation", len(steps) + 1,
-                f"{archangel['name']} ({archangel['hebrew']})",
-                f"{positions[direction]}, {archangel['name']}: {archangel['attributes']}",
-                vibration=archangel['name'],
-                visualization=f"Visualize {archangel['name']} in {archangel['colors']} light",
-                html_content=HTMLGenerator.generate_archangel(direction, archangel)
-            ))
-        
-        # Closing Cross
-        steps.extend(self._add_cross_phase("Closing Cross", amplified=True))
-        
-        return steps
-    
-    def _add_cross_phase(self, phase_name: str, amplified: bool) -> List[RitualStep]:
-        """Generate cross phase steps"""
-        steps = []
-        cross_steps = get_cross_steps()
-        
-        for i, (vibration, gesture, sephira_desc, visualization, sephira) in enumerate(cross_steps, 1):
-            vis = f"{visualization} - Amplified" if amplified else visualization
-            title = f"{vibration.split(' ')[0]} (Closing)" if amplified else vibration.split(' ')[0]
-            desc = f"Repeating {vibration} with enhanced resonance" if amplified else f"{sephira_desc}: {vibration}"
-            
-            steps.append(RitualStep(
-                phase_name, len(steps) + 1, title, desc,
-                vibration=vibration, gesture=gesture, visualization=vis,
-                sephira=sephira,
-                html_content=HTMLGenerator.generate_cross_step(i, vibration, sephira)
-            ))
-        
-        return steps
+RITUAL_TYPE_LABELS = {"LBRP": "LBRP (Banishing)", "LIRP": "LIRP (Invoking)"}
+SNAPSHOT_INTERVAL = 30.0  # seconds between journal snapshots of an active session
+SEARCH_LIMIT = 12  # correspondences and steps listed per search
+# Idle sessions drop their rebuildable caches, then everything but the cursor
+SESSION_POLICY = SessionPolicy(
+    heavy_keys=("balance_model", "export"),
+    cursor_keys=("ritual_type", "current_step", "cursor_epoch", "balance_seed", "journal_id", "journal_cursor",
+                 "navigator_report")
+)
 
-# ==================== STREAMLIT APP ====================
 def initialize_session_state():
     """Initialize all session state variables"""
     defaults = {
-        'simulator': LBRPSimulator(),
+        'ritual_type': "LBRP",
         'current_step': 0,
-        'balance': [random.randint(70, 100) for _ in range(5)]
+        'cursor_epoch': 0,
+        'balance_seed': lbrp_engine.new_balance_seed()
     }
+    if 'journal_id' not in st.session_state:
+        _resume_from_journal(defaults)
     
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
+    
+    if 'ritual_type_choice' not in st.session_state:
+        st.session_state.ritual_type_choice = RITUAL_TYPE_LABELS[st.session_state.ritual_type]
+
+@contextmanager
+def tracked_session():
+    """Mark this session active for the run; idle sessions are compacted or evicted along the way"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        yield
+        return
+    registry = get_session_registry(SESSION_POLICY)
+    with registry.running(ctx.session_id, ctx.session_state):
+        yield
+
+def _resume_from_journal(defaults: dict) -> None:
+    """Identify the session by its URL token and restore its last journaled cursor"""
+    journal = lbrp_engine.get_journal()
+    if journal is None:
+        st.session_state.journal_id = None
+        return
+    
+    token = st.experimental_get_query_params().get("session", [None])[0] or uuid.uuid4().hex
+    st.experimental_set_query_params(session=token)
+    st.session_state.journal_id = token
+    
+    state = journal.resume(token)
+    if state is not None:
+        defaults.update(state)
+        st.session_state.journal_cursor = (state["ritual_type"], state["current_step"])
+
+def journal_session() -> None:
+    """Append navigation events and periodic snapshots to the session journal"""
+    journal = lbrp_engine.get_journal()
+    if journal is None:
+        return
+    
+    session_id = st.session_state.journal_id
+    cursor = (st.session_state.ritual_type, st.session_state.current_step)
+    if cursor != st.session_state.get("journal_cursor"):
+        st.session_state.journal_cursor = cursor
+        journal.record(session_id, "navigate", *cursor)
+    
+    seed = st.session_state.balance_seed
+    now = time.monotonic()
+    if (seed != st.session_state.get("journal_balance_seed")
+            or now - st.session_state.get("journal_snapshot_at", 0.0) >= SNAPSHOT_INTERVAL):
+        st.session_state.journal_balance_seed = seed
+        st.session_state.journal_snapshot_at = now
+        journal.record(session_id, "snapshot", *cursor, {"balance_seed": seed})
+
+def get_simulator() -> LBRPSimulator:
+    """Return a view of the shared catalog for this session's ritual type"""
+    return LBRPSimulator(st.session_state.ritual_type)
 
 def create_sidebar() -> None:
     """Create sidebar controls"""
@@ -410,16 +119,16 @@ def create_sidebar() -> None:
         # Ritual type selection
         ritual_type = st.radio(
             "Ritual Type",
-            ["LBRP (Banishing)", "LIRP (Invoking)"],
-            index=0
+            list(RITUAL_TYPE_LABELS.values()),
+            key="ritual_type_choice"
         )
-        st.session_state.simulator.ritual_type = ritual_type.split(" ")[0]
+        st.session_state.ritual_type = ritual_type.split(" ")[0]
         
         st.markdown("---")
         st.markdown("### 📊 Progress")
         
         # Progress display
-        total_steps = len(st.session_state.simulator.steps)
+        total_steps = len(get_simulator().steps)
         progress = (st.session_state.current_step / total_steps * 100) if total_steps else 0
         
         st.markdown(f"""
@@ -429,139 +138,257 @@ def create_sidebar() -> None:
         <p style='text-align: center;'>Step {min(st.session_state.current_step + 1, total_steps)} of {total_steps}</p>
         """, unsafe_allow_html=True)
         
-        # Navigation buttons
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("◀️ Previous", disabled=st.session_state.current_step == 0):
-                st.session_state.current_step = max(0, st.session_state.current_step - 1)
-                st.rerun()
+        # Client-side mode navigates in the browser; the server only persists the cursor
+        st.toggle("⚡ Client-side navigation", key="client_navigation")
+        
+        # Navigation buttons (callbacks update state before the single rerun)
+        if not st.session_state.client_navigation:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button(
+                    "◀️ Previous", disabled=st.session_state.current_step == 0,
+                    on_click=_go_to_step, args=(st.session_state.current_step - 1, total_steps)
+                )
+            
+            with col2:
+                st.button(
+                    "Next ▶️", disabled=st.session_state.current_step >= total_steps - 1,
+                    on_click=_go_to_step, args=(st.session_state.current_step + 1, total_steps)
+                )
+        
+        st.toggle("🔊 Vibration audio", key="vibration_audio")
         
-        with col2:
-            if st.button("Next ▶️", disabled=st.session_state.current_step >= total_steps - 1):
-                st.session_state.current_step = min(total_steps - 1, st.session_state.current_step + 1)
-                st.rerun()
+        # Guided practice advances on the shared scheduler's timers
+        st.toggle("⏱️ Guided practice", key="guided_mode")
+        if st.session_state.guided_mode:
+            render_guided_controls()
         
         # Reset button
-        if st.button("🔁 Reset Ritual"):
-            st.session_state.current_step = 0
-            st.session_state.simulator = LBRPSimulator()
-            st.session_state.balance = [random.randint(70, 100) for _ in range(5)]
-            st.rerun()
+        st.button("🔁 Reset Ritual", on_click=_reset_ritual)
+        
+        st.markdown("---")
+        render_correspondence_search(total_steps)
 
-def render_step_content(current_step: RitualStep) -> None:
-    """Render the current step content"""
-    # Step header
-    st.markdown(f"""
-    <div class='ritual-phase-card'>
-        <h3>Phase: {current_step.phase}</h3>
-        <h2 style='color: #ffd700;'>{current_step.title}</h2>
-        <p>{current_step.description}</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Step details in columns
+def render_correspondence_search(total_steps: int) -> None:
+    """Search box over the correspondence index, with links to matching steps"""
+    query = st.text_input(
+        "🔎 Search correspondences", key="correspondence_query",
+        placeholder="Gevurah, ה, Raphael, south fire…"
+    )
+    if not query.strip():
+        return
+    
+    result = get_correspondence_index().search(query, st.session_state.ritual_type)
+    if not result.records:
+        st.caption("No correspondences found")
+        return
+    
+    lines = []
+    for record in result.records[:SEARCH_LIMIT]:
+        facets = [
+            value for value in (
+                record.direction.display_name if record.direction else "",
+                record.element.value if record.element else "",
+                record.sephira.value if record.sephira else "",
+                record.letter
+            ) if value
+        ]
+        hebrew = f" ({record.hebrew})" if record.hebrew else ""
+        lines.append(f"- **{record.name}**{hebrew} · {record.kind}" + (f" · {', '.join(facets)}" if facets else ""))
+    st.markdown("\n".join(lines))
+    
+    steps = get_simulator().steps
+    for position in result.steps[:SEARCH_LIMIT]:
+        st.button(
+            f"Step {position + 1}: {steps[position].title}", key=f"search_step_{position}",
+            on_click=_go_to_step, args=(position, total_steps)
+        )
+
+def _go_to_step(step: int, total_steps: int) -> None:
+    """Move the session cursor, clamped to the sequence"""
+    st.session_state.current_step = min(max(step, 0), total_steps - 1)
+    st.session_state.cursor_epoch += 1
+    _seek_guided()
+
+def _reset_ritual() -> None:
+    """Return to the first step with a fresh elemental balance"""
+    st.session_state.current_step = 0
+    st.session_state.cursor_epoch += 1
+    st.session_state.balance_seed = lbrp_engine.new_balance_seed()
+    _seek_guided()
+
+# ==================== GUIDED PRACTICE ====================
+def _session_id() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "local"
+
+def _wake_session(session_id: str, step: int) -> None:
+    """Scheduler callback: rerun the session's script so the new step is shown
+
+    Streamlit has no public API to rerun another session, so this reaches
+    into its internals (pinned in requirements.txt). Without them the step
+    is still adopted, on the session's next rerun.
+    """
+    try:
+        info = Runtime.instance()._session_mgr.get_active_session_info(session_id)
+        # AppSession is owned by the server's event loop
+        info.session._event_loop.call_soon_threadsafe(info.session.request_rerun, None)
+    except Exception:  # internals moved, session gone or loop closed: fall back to the next rerun
+        return
+
+def _seek_guided() -> None:
+    """Keep the scheduler on a cursor the user moved by hand"""
+    if st.session_state.get("guided_ritual") is not None:
+        lbrp_engine.get_scheduler().seek(_session_id(), st.session_state.current_step)
+
+def apply_guided_cursor() -> None:
+    """Start or stop guided timing, and adopt the step the scheduler has reached"""
+    ritual_type = st.session_state.ritual_type
+    guided_ritual = st.session_state.get("guided_ritual")
+    
+    if not st.session_state.get("guided_mode"):
+        if guided_ritual is not None:
+            lbrp_engine.get_scheduler().stop(_session_id())
+            st.session_state.guided_ritual = None
+        return
+    
+    # The scheduler (and its timer thread) only exists once someone practises guided
+    scheduler = lbrp_engine.get_scheduler()
+    state = scheduler.state(_session_id())
+    if guided_ritual != ritual_type or state is None:
+        # Closed or evicted sessions stop their guided timer
+        get_session_registry(SESSION_POLICY).add_listener("guided", scheduler.stop)
+        # A session the scheduler dropped after idling comes back paused
+        durations = [step.duration for step in get_simulator().steps]
+        scheduler.start(_session_id(), durations, st.session_state.current_step, on_advance=_wake_session,
+                        paused=guided_ritual == ritual_type)
+        st.session_state.guided_ritual = ritual_type
+        return
+    
+    if state.step != st.session_state.current_step:
+        st.session_state.current_step = state.step
+        st.session_state.cursor_epoch += 1
+
+def render_guided_controls() -> None:
+    """Remaining time plus pause/resume and skip for the guided session"""
+    state = lbrp_engine.get_scheduler().state(_session_id())
+    if state is None:
+        return
+    if state.finished:
+        st.caption("⏱️ Guided practice complete")
+        return
+    
+    status = "paused" if state.paused else "left on this step"
+    st.caption(f"⏱️ {state.remaining:.0f}s {status}")
     col1, col2 = st.columns(2)
     with col1:
-        if current_step.vibration:
-            st.markdown("### 🔊 Vibration")
-            st.markdown(f"<h2 class='vibration-text'>{current_step.vibration}</h2>", unsafe_allow_html=True)
-    
+        st.button("▶️ Resume" if state.paused else "⏸️ Pause", on_click=_toggle_guided_pause)
     with col2:
-        if current_step.gesture:
-            st.markdown("### 👐 Gesture")
-            st.info(current_step.gesture)
-    
-    # Visualization
-    if current_step.visualization:
-        st.markdown("### 👁️ Visualization")
-        st.markdown(f"*{current_step.visualization}*")
-    
-    # Custom HTML content
-    if current_step.html_content:
-        st.markdown(current_step.html_content, unsafe_allow_html=True)
-    
-    # Special phase handling
-    if current_step.phase == "Formulating Pentagrams":
-        _render_direction_indicator()
-    elif current_step.phase == "Archangel Evocation":
-        _render_archangel_correspondences()
+        st.button("⏭️ Skip", on_click=_skip_guided_step)
 
-def _render_direction_indicator():
-    """Render directional sequence indicator"""
-    st.markdown("### 🗺️ Directional Sequence")
-    cols = st.columns(4)
-    for i, direction in enumerate(Direction):
-        with cols[i]:
-            is_active = i == (st.session_state.current_step - 6) % 4
-            color = "#ffd700" if is_active else "#666"
-            st.markdown(f"""
-            <div style='text-align: center; padding: 10px; border: 2px solid {color}; border-radius: 5px;'>
-                <div style='font-size: 1.5rem;'>{direction.symbol}</div>
-                <strong style='color: {color};'>{direction.name}</strong>
-            </div>
-            """, unsafe_allow_html=True)
+def _toggle_guided_pause() -> None:
+    scheduler = lbrp_engine.get_scheduler()
+    state = scheduler.state(_session_id())
+    if state is not None and state.paused:
+        scheduler.resume(_session_id())
+    else:
+        scheduler.pause(_session_id())
 
-def _render_archangel_correspondences():
-    """Render archangel correspondences"""
-    st.markdown("### 👼 Archangel Correspondences")
-    archangel_data = {
-        "Raphael": {"element": "Air", "color": "#87ceeb", "planet": "Mercury"},
-        "Michael": {"element": "Fire", "color": "#ff4500", "planet": "Sun"},
-        "Gabriel": {"element": "Water", "color": "#1e90ff", "planet": "Moon"},
-        "Uriel": {"element": "Earth", "color": "#8b4513", "planet": "Venus"}
-    }
-    
-    cols = st.columns(4)
-    for i, (name, data) in enumerate(archangel_data.items()):
-        with cols[i]:
-            st.markdown(f"""
-            <div style='background: {data["color"]}20; padding: 10px; border-radius: 10px; text-align: center;'>
-                <h4>{name}</h4>
-                <p><strong>Element:</strong> {data["element"]}</p>
-                <p><strong>Planet:</strong> {data["planet"]}</p>
-            </div>
-            """, unsafe_allow_html=True)
+def _skip_guided_step() -> None:
+    step = lbrp_engine.get_scheduler().skip(_session_id())
+    if step is not None:
+        st.session_state.current_step = step
+        st.session_state.cursor_epoch += 1
+
+def get_balance_model() -> "lbrp_engine.BalanceModel":
+    """This session's balance model, rebuilt whenever its seed changes"""
+    model = st.session_state.get("balance_model")
+    if model is None or model.seed != st.session_state.balance_seed:
+        model = st.session_state.balance_model = lbrp_engine.BalanceModel(st.session_state.balance_seed)
+    return model
+
+def _navigator_key() -> str:
+    return f"navigator_{st.session_state.ritual_type}"
+
+def apply_navigator_cursor() -> None:
+    """Adopt the cursor last persisted by the client-side navigator, once per report"""
+    value = st.session_state.get(_navigator_key())
+    if not value:
+        return
+    report = (value["token"], value["seq"])
+    if report != st.session_state.get("navigator_report"):
+        st.session_state.navigator_report = report
+        st.session_state.current_step = value["step"]
+        _seek_guided()
+
+def render_client_navigator() -> None:
+    """Ship the whole compiled sequence to the browser for round-trip-free navigation"""
+    _navigator(
+        bundle=get_navigation_bundle(st.session_state.ritual_type),
+        step=st.session_state.current_step,
+        epoch=st.session_state.cursor_epoch,
+        key=_navigator_key(),
+        default=None
+    )
+
+def render_step_content(step_index: int) -> None:
+    """Render the current step from its pre-rendered fragment"""
+    fragments = get_step_fragments(st.session_state.ritual_type)
+    st.markdown(fragments[step_index], unsafe_allow_html=True)
+    
+    # The cached WAV bytes are handed over as-is; Streamlit dedupes identical media
+    if st.session_state.get("vibration_audio"):
+        audio = lbrp_engine.get_vibration_audio(get_simulator().steps[step_index])
+        if audio is not None:
+            st.audio(audio, format="audio/wav")
 
 def render_sidebar_panel() -> None:
     """Render the right sidebar panel"""
-    # Tree of Life
-    st.markdown("### 🌳 Tree of Life")
-    st.markdown(TREE_OF_LIFE_HTML, unsafe_allow_html=True)
-    
-    # Elemental Balance
-    st.markdown("### ⚖️ Elemental Balance")
-    elements = ["Air", "Fire", "Water", "Earth", "Spirit"]
-    balance = st.session_state.balance
-    colors = ["#87ceeb", "#ff4500", "#1e90ff", "#8b4513", "#9370db"]
+    # Tree of Life (a cached figure per highlight) and Elemental Balance
+    st.markdown("<h3>🌳 Tree of Life</h3>", unsafe_allow_html=True)
+    st.plotly_chart(
+        lbrp_engine.get_tree_figure(st.session_state.ritual_type, st.session_state.current_step),
+        use_container_width=True, config={"displayModeBar": False}
+    )
+    balance = get_balance_model().balance(st.session_state.ritual_type, st.session_state.current_step)
+    st.markdown(get_panel_fragment(balance), unsafe_allow_html=True)
     
-    for element, value, color in zip(elements, balance, colors):
-        st.markdown(f"""
-        <div style='margin: 10px 0;'>
-            <div style='display: flex; justify-content: space-between;'>
-                <span>{element}</span>
-                <span>{value}%</span>
-            </div>
-            <div class='progress-container'>
-                <div class='progress-bar' style='width: {value}%; background: {color};'></div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    with st.expander("📜 Reference"):
+        st.markdown(render_fragment("elemental-table"), unsafe_allow_html=True)
+        st.markdown(render_fragment("pentagram-guide"), unsafe_allow_html=True)
     
-    # Download button
+    # Export is only serialized when the user asks for it
     st.markdown("---")
-    ritual_data = {
-        "timestamp": datetime.now().isoformat(),
-        "ritual_type": st.session_state.simulator.ritual_type,
-        "steps_completed": st.session_state.current_step + 1,
-        "steps": [step.to_dict() for step in st.session_state.simulator.steps[:st.session_state.current_step + 1]]
-    }
-    
-    st.download_button(
-        label="📥 Download Ritual Data",
-        data=json.dumps(ritual_data, indent=2, default=str),
-        file_name=f"lbrp_ritual_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-        mime="application/json"
-    )
+    export_format = st.selectbox("Export Format", list(EXPORT_FORMATS), key="export_format")
+    export_key = (export_format, st.session_state.ritual_type, st.session_state.current_step)
+    
+    prepared = st.session_state.get("export")
+    if prepared is not None and prepared[0] != export_key:
+        prepared = None
+        _discard_export()
+    
+    if prepared is None and st.button("📦 Prepare Ritual Data"):
+        extension = EXPORT_FORMATS[export_format][1]
+        prepared = (
+            export_key,
+            encode_export(st.session_state.ritual_type, st.session_state.current_step, export_format),
+            f"lbrp_ritual_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        )
+        st.session_state.export = prepared
+    
+    if prepared is not None:
+        _, data, file_name = prepared
+        st.download_button(
+            label="📥 Download Ritual Data",
+            data=data,
+            file_name=file_name,
+            mime=EXPORT_FORMATS[export_format][0],
+            on_click=_discard_export
+        )
+
+def _discard_export() -> None:
+    """Drop a prepared export payload from session state"""
+    st.session_state.pop("export", None)
 
 def main():
     """Main application entry point"""
@@ -577,8 +404,10 @@ def main():
     st.markdown(CSS_STYLES, unsafe_allow_html=True)
     
     # Initialize session state
-    random.seed(42)  # For reproducible random balance
-    initialize_session_state()
+    with stage("initialize_session_state"):
+        initialize_session_state()
+        apply_navigator_cursor()
+        apply_guided_cursor()
     
     # Header
     st.markdown("""
@@ -589,17 +418,22 @@ def main():
     """, unsafe_allow_html=True)
     
     # Sidebar
-    create_sidebar()
+    with stage("create_sidebar"):
+        create_sidebar()
     
     # Main content area
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        simulator = st.session_state.simulator
+        simulator = get_simulator()
         current_step_idx = st.session_state.current_step
         
-        if current_step_idx < len(simulator.steps):
-            render_step_content(simulator.steps[current_step_idx])
+        if st.session_state.client_navigation:
+            with stage("render_client_navigator"):
+                render_client_navigator()
+        elif current_step_idx < len(simulator.steps):
+            with stage("render_step_content"):
+                render_step_content(current_step_idx)
         else:
             # Ritual Complete
             st.markdown("""
@@ -622,7 +456,12 @@ def main():
                 st.markdown(f"**{i}.** {output}")
     
     with col2:
-        render_sidebar_panel()
+        with stage("render_sidebar_panel"):
+            render_sidebar_panel()
+    
+    # Persist progress without blocking the render path
+    journal_session()
 
 if __name__ == "__main__":
-    main()
+    with instrumentation.rerun(), tracked_session():
+        main()
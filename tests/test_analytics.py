@@ -0,0 +1,50 @@
+"""Export ingestion into Parquet parts and the completion funnel"""
+import gzip
+import io
+
+import pytest
+
+from lbrp_engine import analytics, export
+from lbrp_engine.simulator import get_step_catalog
+
+CURSORS = [18, 18, 0, 7]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    exports = tmp_path / "exports"
+    (exports / "nested").mkdir(parents=True)
+    buffer = io.BytesIO()
+    export.stream_export([("LBRP", step) for step in CURSORS[:3]], buffer, timestamp="2024-01-01T00:00:00")
+    (exports / "sessions.ndjson.gz").write_bytes(gzip.compress(buffer.getvalue()))
+    (exports / "nested" / "lbrp_ritual_1.json").write_bytes(export.encode_export("LBRP", CURSORS[3], "JSON"))
+    (exports / "broken.ndjson").write_text("{not json\n", encoding="utf-8")
+    (exports / "notes.txt").write_text("ignored", encoding="utf-8")
+    return exports
+
+
+def test_ingest_counts_records_rows_and_parts(corpus, tmp_path):
+    totals = analytics.ingest([str(corpus)], str(tmp_path / "dataset"), files_per_task=1, batch_rows=10)
+    assert totals["files"] == 3 and totals["errors"] == 1
+    assert totals["records"] == len(CURSORS)
+    assert totals["rows"] == sum(step + 1 for step in CURSORS)
+    steps = analytics.load_steps(str(tmp_path / "dataset"))
+    assert len(steps) == totals["rows"] and "html_content" not in steps.columns
+    assert totals["parts"] > 2  # the 19-step records never share a part
+
+
+def test_completion_funnel_counts(corpus, tmp_path):
+    analytics.ingest([str(corpus)], str(tmp_path / "dataset"), batch_rows=10)
+    funnel = analytics.completion_funnel(str(tmp_path / "dataset"))
+
+    phases = {}
+    for index, step in enumerate(get_step_catalog("LBRP")):
+        phases.setdefault(step.phase, []).append(index)
+    assert funnel["phase"].tolist() == list(phases)
+    for row in funnel.itertuples():
+        indexes = phases[row.phase]
+        assert row.started == sum(step >= indexes[0] for step in CURSORS), row.phase
+        assert row.completed == sum(step >= indexes[-1] for step in CURSORS), row.phase
+        assert row.reach_rate == row.started / len(CURSORS)
+    pentagrams = funnel.set_index("phase").loc["Formulating Pentagrams"]
+    assert (pentagrams.started, pentagrams.completed) == (3, 2)
@@ -0,0 +1,94 @@
+"""HTTP API responses, ETags and conditional requests"""
+import asyncio
+import gzip
+import json
+
+from lbrp_engine import api
+from lbrp_engine.simulator import get_step_catalog
+
+
+def _parse(response: bytes):
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return status, headers, body
+
+
+def test_step_body_and_etag():
+    status, headers, body = _parse(api.respond("GET", "/rituals/lbrp/steps/0", {}))
+    assert status == 200
+    assert json.loads(body)["title"] == get_step_catalog("LBRP")[0].title
+    assert headers["ETag"].startswith('"') and headers["Content-Length"] == str(len(body))
+
+
+def test_matching_etag_gets_304():
+    _, headers, _ = _parse(api.respond("GET", "/rituals/LBRP", {}))
+    etag = headers["ETag"]
+    for condition in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        status, not_modified, body = _parse(api.respond("GET", "/rituals/LBRP", {"if-none-match": condition}))
+        assert (status, body) == (304, b"")
+        assert not_modified["ETag"] == etag
+    status, _, _ = _parse(api.respond("GET", "/rituals/LBRP", {"if-none-match": '"stale"'}))
+    assert status == 200
+
+
+def test_gzip_has_its_own_etag():
+    _, identity, plain = _parse(api.respond("GET", "/rituals/LBRP/steps", {}))
+    _, encoded, body = _parse(api.respond("GET", "/rituals/LBRP/steps", {"accept-encoding": "br, gzip"}))
+    assert encoded["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == plain
+    assert encoded["ETag"] != identity["ETag"]
+    _, refused, _ = _parse(api.respond("GET", "/rituals/LBRP/steps", {"accept-encoding": "gzip;q=0"}))
+    assert "Content-Encoding" not in refused
+    status, _, _ = _parse(api.respond("GET", "/rituals/LBRP/steps",
+                                      {"accept-encoding": "gzip", "if-none-match": identity["ETag"]}))
+    assert status == 200
+
+
+def test_head_has_headers_only():
+    _, get_headers, _ = _parse(api.respond("GET", "/rituals", {}))
+    status, headers, body = _parse(api.respond("HEAD", "/rituals", {}))
+    assert (status, body) == (200, b"")
+    assert headers == get_headers
+
+
+def test_step_ranges_are_clamped():
+    total = len(get_step_catalog("LBRP"))
+    _, _, body = _parse(api.respond("GET", "/rituals/LBRP/steps?start=-5&stop=3", {}))
+    assert len(json.loads(body)) == 3
+    _, _, body = _parse(api.respond("GET", f"/rituals/LBRP/steps?start={total - 1}&stop={total + 10}", {}))
+    assert len(json.loads(body)) == 1
+
+
+def test_errors():
+    assert _parse(api.respond("GET", "/rituals/XYZ", {}))[0] == 404
+    assert _parse(api.respond("GET", "/rituals/LBRP/steps/999", {}))[0] == 404
+    assert _parse(api.respond("GET", "/rituals/LBRP/steps?start=a", {}))[0] == 400
+    status, headers, _ = _parse(api.respond("POST", "/rituals", {}))
+    assert status == 405 and headers["Allow"] == "GET, HEAD"
+    assert headers["Connection"] == "close"
+
+
+def test_gzip_quality_is_read_from_every_entry():
+    cases = {"*;q=0, gzip": True, "gzip;q=0, *": False, "identity, *;q=0.5": True,
+             "br, gzip;q=0.0": False, "gzip;q=x": False, "identity": False}
+    for accept, expected in cases.items():
+        assert api._accepts_gzip({"accept-encoding": accept}) is expected, accept
+
+
+def test_rejected_body_is_not_parsed_as_a_request():
+    async def exchange() -> bytes:
+        server = await api.start_server(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        smuggled = b"GET /rituals HTTP/1.1\r\n\r\n"
+        writer.write(b"POST /rituals HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(smuggled) + smuggled)
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    response = asyncio.run(exchange())
+    assert response.count(b"HTTP/1.1") == 1 and response.startswith(b"HTTP/1.1 405")
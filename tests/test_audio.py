@@ -0,0 +1,35 @@
+"""Vibration tones and their shared WAV buffers"""
+import io
+import struct
+import wave
+
+from lbrp_engine import audio
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_wav_header_and_length():
+    spec = audio.ToneSpec(220.0, 0.5, "ao")
+    wav = audio.wav_bytes(audio.synthesize(spec), audio.SAMPLE_RATE)
+    samples = int(spec.seconds * audio.SAMPLE_RATE)
+    assert len(wav) == audio.WAV_HEADER_BYTES + 2 * samples
+    riff, riff_size, wave_id = struct.unpack_from("<4sI4s", wav)
+    assert (riff, riff_size, wave_id) == (b"RIFF", len(wav) - 8, b"WAVE")
+    with wave.open(io.BytesIO(wav)) as reader:
+        assert (reader.getnchannels(), reader.getsampwidth(), reader.getframerate()) == (1, 2, audio.SAMPLE_RATE)
+        assert reader.getnframes() == samples
+        pcm = struct.unpack(f"<{samples}h", reader.readframes(samples))
+    assert 0.7 * 32767 < max(map(abs, pcm)) <= 0.8 * 32767 + 1  # normalized to 0.8 of full scale
+
+
+def test_steps_share_cached_tones():
+    lbrp, lirp = get_step_catalog("LBRP"), get_step_catalog("LIRP")
+    assert audio.get_vibration_audio(next(step for step in lbrp if not step.vibration)) is None
+    first = next(step for step in lbrp if step.vibration)
+    same = next(step for step in lirp if audio.tone_spec(step) == audio.tone_spec(first))
+    assert audio.get_vibration_audio(first) is audio.get_vibration_audio(same)
+
+
+def test_tone_length_is_capped():
+    step = next(step for step in get_step_catalog("LBRP") if step.vibration)
+    spec = audio.tone_spec(step._replace(duration=600.0))
+    assert spec.seconds == audio.MAX_TONE_SECONDS
@@ -0,0 +1,36 @@
+"""Elemental balance transforms and trajectories"""
+import numpy as np
+import pytest
+
+from lbrp_engine import balance
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_one_read_only_transform_per_step():
+    matrices, offsets = balance.get_balance_transforms("LBRP")
+    steps = len(get_step_catalog("LBRP"))
+    assert matrices.shape == (steps, 5, 5) and offsets.shape == (steps, 5)
+    with pytest.raises(ValueError):
+        matrices[0, 0, 0] = 2.0
+
+
+def test_model_is_reproducible_from_its_seed_in_any_order():
+    forward = balance.BalanceModel(seed=42)
+    states = [forward.state("LBRP", step).copy() for step in range(len(get_step_catalog("LBRP")))]
+    backward = balance.BalanceModel(seed=42)
+    assert np.array_equal(backward.state("LBRP", 10), states[10])
+    assert np.array_equal(backward.state("LBRP", 3), states[3])
+    assert np.array_equal(backward.state("LBRP", 999), states[-1])  # clamped to the sequence
+    assert all(0 <= value <= 100 for value in forward.balance("LBRP", 5))
+
+
+def test_batched_simulation_matches_the_transforms():
+    rng = np.random.default_rng(1)
+    initial = balance.initial_balance(rng, sessions=64)
+    trajectory = balance.simulate_balance("LIRP", initial, rng)
+    assert trajectory.shape == (64, len(get_step_catalog("LIRP")), 5)
+    assert trajectory.min() >= 0 and trajectory.max() <= 100
+
+    matrices, offsets = balance.get_balance_transforms("LIRP")
+    noiseless = balance._advance(initial, matrices[0], offsets[0], 0.0)
+    assert np.abs(trajectory[:, 0] - noiseless).max() < 8 * balance.NOISE
@@ -0,0 +1,28 @@
+"""Bulk-export configuration files"""
+import json
+
+import pytest
+
+from lbrp_engine import cli
+
+
+def _write(tmp_path, *configs):
+    path = tmp_path / "configs.jsonl"
+    path.write_text("".join(json.dumps(config) + "\n" for config in configs), encoding="utf-8")
+    return str(path)
+
+
+def test_configurations_are_read_in_order(tmp_path):
+    path = _write(tmp_path, {"ritual_type": "LIRP", "current_step": 3}, {"current_step": 0})
+    assert list(cli.read_configurations(path)) == [("LIRP", 3), ("LBRP", 0)]
+
+
+@pytest.mark.parametrize("config, message", [
+    ({"ritual_type": "XYZ", "current_step": 0}, "unknown ritual type 'XYZ'"),
+    ({"ritual_type": "LBRP", "current_step": -1}, "step -1 is outside LBRP"),
+    ({"ritual_type": "LBRP", "current_step": 999}, "step 999 is outside LBRP"),
+])
+def test_invalid_configurations_name_their_line(tmp_path, config, message):
+    path = _write(tmp_path, {"current_step": 0}, config)
+    with pytest.raises(ValueError, match=f":2: {message}"):
+        list(cli.read_configurations(path))
@@ -0,0 +1,106 @@
+"""Ritual compilation and the on-disk bundle cache"""
+import json
+import os
+import shutil
+
+import pytest
+
+from lbrp_engine import compiler, rendering, simulator
+
+
+@pytest.fixture
+def rituals_dir(tmp_path, monkeypatch):
+    """A private copy of the ritual definitions and an empty bundle cache"""
+    rituals = tmp_path / "rituals"
+    shutil.copytree(compiler.RITUALS_DIR, rituals)
+    monkeypatch.setattr(compiler, "RITUALS_DIR", str(rituals))
+    monkeypatch.setattr(compiler, "CACHE_DIR", str(tmp_path / "cache"))
+    compiler._read_definition.cache_clear()
+    compiler.load_compiled_phases.cache_clear()
+    yield rituals
+    compiler._read_definition.cache_clear()
+    compiler.load_compiled_phases.cache_clear()
+    simulator.get_step_catalog.cache_clear()  # rebuilt from the same bundle objects as later compiles
+
+
+def _bundles(name: str):
+    return sorted(f for f in os.listdir(compiler.CACHE_DIR) if f.startswith(f"{name}-"))
+
+
+def _reload(name: str):
+    compiler._read_definition.cache_clear()
+    compiler.load_compiled_phases.cache_clear()
+    return compiler.load_compiled(name)
+
+
+def test_bundle_is_written_then_loaded_without_compiling(rituals_dir, monkeypatch):
+    steps = compiler.load_compiled("LBRP")
+    assert len(_bundles("lbrp")) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("compiled despite a fresh bundle")
+
+    monkeypatch.setattr(compiler, "compile_phases", fail)
+    assert _reload("LBRP") == steps
+
+
+def test_definition_change_invalidates_bundle(rituals_dir):
+    compiler.load_compiled("LBRP")
+    path = rituals_dir / "lbrp.json"
+    definition = json.loads(path.read_text(encoding="utf-8"))
+    definition["phases"][0]["steps"][0]["title"] = "Grounding"
+    path.write_text(json.dumps(definition), encoding="utf-8")
+
+    assert _reload("LBRP")[0].title == "Grounding"
+    assert len(_bundles("lbrp")) == 1  # the stale bundle is removed
+
+
+def test_source_change_invalidates_bundle(rituals_dir, monkeypatch):
+    compiler.load_compiled("LBRP")
+    before = _bundles("lbrp")
+    monkeypatch.setattr(compiler, "_sources_digest", lambda: "changed engine code")
+    _reload("LBRP")
+    assert _bundles("lbrp") != before
+
+
+def test_engine_edit_invalidates_bundle(tmp_path, monkeypatch):
+    package = tmp_path / "lbrp_engine"
+    shutil.copytree(os.path.dirname(compiler.__file__), package, ignore=shutil.ignore_patterns("__pycache__"))
+    monkeypatch.setattr(compiler, "__file__", str(package / "compiler.py"))
+    compiler._sources_digest.cache_clear()
+    before = compiler._sources_digest()
+    with open(package / "audio.py", "a", encoding="utf-8") as fp:
+        fp.write("# edited\n")
+    compiler._sources_digest.cache_clear()
+    try:
+        assert compiler._sources_digest() != before
+    finally:
+        monkeypatch.undo()
+        compiler._sources_digest.cache_clear()
+
+
+@pytest.mark.parametrize("name", ["../lbrp", "rituals/lbrp", "/etc/passwd", "Nonexistent"])
+def test_unknown_or_path_like_names_are_rejected(rituals_dir, name):
+    with pytest.raises(ValueError, match="Unknown ritual type"):
+        compiler.load_definition(name)
+
+
+def test_derived_ritual_shares_unchanged_phases(rituals_dir):
+    base = dict(compiler.load_compiled_phases("LBRP"))
+    derived = dict(compiler.load_compiled_phases("LIRP"))
+    shared = set(base) & set(derived)
+    assert shared
+    assert all(derived[key] is base[key] for key in shared)
+    assert list(_reload("LIRP")) == compiler.compile_ritual(compiler.load_definition("LIRP"))
+
+
+def test_loaded_bundle_resolves_html_without_generators(rituals_dir, monkeypatch):
+    markup = [step.html_content for step in compiler.load_compiled("LBRP")]
+    compiler.PRERENDERED_HTML.clear()
+    monkeypatch.setattr(compiler, "HTML_SOURCES", {})
+    monkeypatch.setattr(rendering, "HTML_SOURCES", {})
+    rendering.resolve_html.cache_clear()
+    try:
+        assert [step.html_content for step in _reload("LBRP")] == markup
+    finally:
+        rendering.resolve_html.cache_clear()
@@ -0,0 +1,60 @@
+"""Correspondence index: folded keys, lookups and step search"""
+import pytest
+
+from lbrp_engine.correspondence_index import fold, fold_hebrew, fold_latin, get_correspondence_index
+from lbrp_engine.models import Direction, Element
+from lbrp_engine.simulator import get_step_catalog
+
+
+@pytest.fixture(scope="module")
+def index():
+    return get_correspondence_index()
+
+
+def _steps_with_vibration(ritual_type, name):
+    return tuple(i for i, step in enumerate(get_step_catalog(ritual_type)) if step.vibration.startswith(name))
+
+
+def test_folding_merges_spelling_variants():
+    assert fold_hebrew("אַתָּה") == fold_hebrew("אתה")
+    assert fold_hebrew("לעולם") == fold_hebrew("לעולמ")  # final mem
+    assert fold_latin("Geburah") == fold_latin("Gevurah")
+    assert fold_latin("YHWH") == fold_latin("yhvh")
+    assert fold_latin("Le-Olam") == fold_latin("leolam")
+    assert fold(Direction.EAST) == fold("east") and fold(Element.AIR) == fold("AIR")
+
+
+@pytest.mark.parametrize("query", ["YHWH", "יְהוָה", "יהוה", "yhvh"])
+def test_divine_name_hits_in_either_script(index, query):
+    result = index.search(query, "LBRP")
+    assert [record.name for record in result.records] == ["YHVH"]
+    assert result.steps == _steps_with_vibration("LBRP", "YHVH")
+
+
+@pytest.mark.parametrize("query", ["Raphael", "רָפָאֵל", "rafael"])
+def test_archangel_hits_in_either_script(index, query):
+    result = index.search(query, "LBRP")
+    assert [record.name for record in result.records] == ["Raphael"]
+    assert result.steps == _steps_with_vibration("LBRP", "Raphael")
+
+
+def test_cross_word_hits_both_crosses(index):
+    result = index.search("אַתָּה", "LBRP")
+    assert [record.kind for record in result.records] == ["cross"]
+    assert len(result.steps) == 2 and result.steps == _steps_with_vibration("LBRP", "ATEH")
+
+
+def test_every_word_must_match(index):
+    assert {record.name for record in index.search("east air").records} == {"YHVH", "Raphael"}
+    assert index.search("east fire").records == ()
+    assert index.search("   ").records == ()
+
+
+def test_lookups_and_step_fields(index):
+    assert index.first("direction", "North", kind="archangel").name == "Uriel"
+    assert {record.name for record in index.lookup("element", Element.WATER)} == {"EHEIEH", "Gabriel"}
+    assert index.steps("LBRP", "direction", "South") == (
+        _steps_with_vibration("LBRP", "ADONAI") + _steps_with_vibration("LBRP", "Michael")
+    )
+    with pytest.raises(ValueError):
+        index.lookup("colour", "red")
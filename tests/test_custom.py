@@ -0,0 +1,60 @@
+"""Custom sequence specs and the byte-bounded sequence cache"""
+import pytest
+
+from lbrp_engine import custom
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_defaults_are_dropped_and_specs_normalized():
+    assert custom.canonical_spec({"archangel_order": ["east", "south", "west", "north"]}) == '{"base":"LBRP"}'
+    assert custom.canonical_spec({"divine_names": {"east": "  MY   NAME "}}) == \
+        custom.canonical_spec({"base": "lbrp", "divine_names": {"EAST": "MY NAME"}})
+
+
+@pytest.mark.parametrize("spec", [
+    {"colour": "red"},
+    {"base": "NOPE"},
+    {"archangel_order": ["EAST", "EAST", "WEST", "NORTH"]},
+    {"divine_names": {"UP": "IAO"}},
+    {"divine_names": {"EAST": "<script>"}},
+    {"divine_names": {"EAST": "X" * (custom.MAX_DIVINE_NAME + 1)}},
+    {"divine_names": {"EAST": "   "}},
+    {"skip_phases": ["Dancing"]},
+    {"skip_phases": ["Preparation", "Qabalistic Cross", "Formulating Pentagrams", "Archangel Evocation",
+                     "Closing Cross"]}
+])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        custom.canonical_spec(spec)
+
+
+def test_uncustomized_spec_is_the_catalog():
+    assert custom.get_custom_sequence({"base": "LBRP", "skip_phases": []}) is get_step_catalog("LBRP")
+
+
+def test_custom_sequence_reuses_unchanged_steps():
+    base = get_step_catalog("LBRP")
+    steps = custom.get_custom_sequence({"divine_names": {"EAST": "IAO"}, "skip_phases": ["Closing Cross"]})
+    assert custom.get_custom_sequence({"divine_names": {"EAST": "IAO"}, "skip_phases": ["Closing Cross"]}) is steps
+    assert "IAO" in {step.vibration for step in steps}
+    assert "Closing Cross" not in {step.phase for step in steps}
+    base_ids = {id(step) for step in base}
+    reused = {step.phase for step in steps if id(step) in base_ids}
+    assert reused == {"Preparation", "Qabalistic Cross", "Archangel Evocation"}
+
+
+def test_skipped_phase_recompiles_the_phases_after_it():
+    base_ids = {id(step) for step in get_step_catalog("LBRP")}
+    steps = custom.get_custom_sequence({"skip_phases": ["Qabalistic Cross"]})
+    assert [step.number for step in steps if step.phase == "Formulating Pentagrams"][0] == 2
+    assert {step.phase for step in steps if id(step) in base_ids} == {"Preparation"}
+
+
+def test_cache_stays_within_its_byte_limit():
+    cache = custom.ByteLRUCache(100)
+    for key in range(10):
+        cache.get_or_build(key, lambda: key, lambda value: 30)
+    info = cache.cache_info()
+    assert info.bytes <= info.max_bytes == 100 and info.currsize == 3 and info.evictions == 7
+    assert cache.get_or_build("huge", lambda: "value", lambda value: 1000) == "value"
+    assert cache.cache_info().currsize == 3
@@ -0,0 +1,40 @@
+"""Ritual record serialization and streamed exports"""
+import gzip
+import io
+import json
+
+from lbrp_engine import export
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_ndjson_matches_the_json_record():
+    record = json.loads(export.encode_export("LBRP", 4, "JSON"))
+    line = json.loads(export.encode_export("LBRP", 4, "NDJSON"))
+    assert line["steps_completed"] == record["steps_completed"] == 5
+    assert line["steps"] == record["steps"]
+    assert [step["title"] for step in line["steps"]] == [step.title for step in get_step_catalog("LBRP")[:5]]
+
+
+def test_stream_export_writes_one_line_per_session():
+    buffer = io.BytesIO()
+    sessions = [("LBRP", 0), ("LIRP", 2), ("LBRP", 18)]
+    written = export.stream_export(sessions, buffer, timestamp="2024-01-01T00:00:00")
+    lines = buffer.getvalue().decode("utf-8").splitlines()
+    assert written == len(buffer.getvalue())
+    assert [(json.loads(line)["ritual_type"], len(json.loads(line)["steps"])) for line in lines] == [
+        ("LBRP", 1), ("LIRP", 3), ("LBRP", 19)
+    ]
+
+
+def test_gzip_export_is_reproducible():
+    def compressed() -> bytes:
+        buffer = io.BytesIO()
+        export.stream_export([("LBRP", 3)], buffer, compress=True, timestamp="2024-01-01T00:00:00")
+        return buffer.getvalue()
+
+    first = compressed()
+    assert first[4:8] == b"\0\0\0\0"  # no modification time in the gzip header
+    assert compressed() == first
+    plain = io.BytesIO()
+    export.stream_export([("LBRP", 3)], plain, timestamp="2024-01-01T00:00:00")
+    assert gzip.decompress(first) == plain.getvalue()
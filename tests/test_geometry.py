@@ -0,0 +1,50 @@
+"""Pentagram stroke orders and their animated SVG"""
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from lbrp_engine import geometry
+from lbrp_engine.models import Direction, Element
+
+SPIRIT, WATER, FIRE, EARTH, AIR = range(5)
+
+
+def _edges(order):
+    return {frozenset(pair) for pair in zip(order[:-1], order[1:])}
+
+
+def test_earth_pentagrams_follow_the_golden_dawn_strokes():
+    # Banishing: lower left to the top; invoking: the top to lower left
+    assert geometry.stroke_order(Element.EARTH, "banishing").tolist() == [EARTH, SPIRIT, FIRE, AIR, WATER, EARTH]
+    assert geometry.stroke_order(Element.EARTH, "invoking").tolist() == [SPIRIT, EARTH, WATER, AIR, FIRE, SPIRIT]
+
+
+@pytest.mark.parametrize("element", list(geometry.INVOKING_FROM))
+def test_banishing_retraces_the_invoking_star_from_the_element(element):
+    invoking = geometry.stroke_order(element, "invoking").tolist()
+    banishing = geometry.stroke_order(element, "banishing").tolist()
+    point = geometry.PENTAGRAM_POINTS.index(element)
+    assert invoking[1] == point and banishing[0] == point
+    assert sorted(invoking[:-1]) == sorted(banishing[:-1]) == list(range(5))
+    assert _edges(invoking) == _edges(banishing)
+    assert banishing[1] == invoking[0]  # the same stroke, drawn the other way
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        geometry.stroke_order(Element.FIRE, "sideways")
+
+
+def test_drawing_svg_and_keyframes():
+    drawing = geometry.get_pentagram_drawing(Direction.EAST, "banishing", 200)
+    root = ET.fromstring(drawing.svg)
+    assert (root.get("width"), root.get("viewBox")) == ("200", "0 0 200 200")
+    paths = root.findall("path")
+    assert len(paths) == 2 and all(path.get("d") == drawing.path for path in paths)
+    assert drawing.path.count("L") == 4 and drawing.path.endswith("Z")
+    assert [text.text for text in root.findall("text")] == ["1", "2", "3", "4", "5"]
+    # Every stroke of a regular pentagram is as long as the others
+    assert np.allclose(drawing.keyframes[:, 0], [0, 20, 40, 60, 80, 100])
+    assert np.allclose(drawing.keyframes[0, 1:], drawing.vertices[drawing.order[0]])
+    assert geometry.get_pentagram_drawing(Direction.EAST, "banishing", 200) is drawing
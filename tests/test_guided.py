@@ -0,0 +1,106 @@
+"""Guided practice scheduler: advancing, pause/resume and expiry"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from lbrp_engine import guided
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def scheduler():
+    return guided.GuidedScheduler()
+
+
+def test_steps_advance_and_notify(scheduler):
+    advanced = []
+    scheduler.start("s", [0.02, 0.02, 60], on_advance=lambda session_id, step: advanced.append(step))
+    assert _wait_for(lambda: advanced == [1, 2])
+    state = scheduler.state("s")
+    assert state.step == 2 and not state.paused and not state.finished
+
+
+def test_pause_freezes_remaining_time_and_resume_continues(scheduler):
+    scheduler.start("s", [0.2, 60])
+    scheduler.pause("s")
+    paused = scheduler.state("s")
+    assert paused.paused
+    time.sleep(0.3)
+    assert scheduler.state("s") == paused
+    scheduler.resume("s")
+    assert not scheduler.state("s").paused
+    assert _wait_for(lambda: scheduler.state("s").step == 1)
+
+
+def test_skip_seek_and_finish(scheduler):
+    scheduler.start("s", [60, 60, 60])
+    assert scheduler.skip("s") == 1
+    scheduler.seek("s", 2)
+    assert scheduler.state("s").step == 2
+    scheduler.skip("s")
+    assert scheduler.state("s").finished
+    assert scheduler.skip("s") is None
+
+
+def test_finished_sessions_expire(scheduler, monkeypatch):
+    monkeypatch.setattr(guided, "FINISHED_TTL", 0.05)
+    scheduler.start("s", [0.01])
+    assert _wait_for(lambda: scheduler.state("s") is None)
+    assert len(scheduler) == 0
+
+
+def test_paused_sessions_expire_unless_touched(scheduler, monkeypatch):
+    monkeypatch.setattr(guided, "PAUSED_TTL", 0.2)
+    scheduler.start("s", [60, 60], paused=True)
+    assert scheduler.state("s").paused
+    time.sleep(0.1)
+    scheduler.seek("s", 1)  # touching the session restarts its idle time
+    time.sleep(0.15)
+    assert scheduler.state("s") is not None
+    assert _wait_for(lambda: scheduler.state("s") is None)
+
+
+def test_stop_cancels_the_timer(scheduler):
+    advanced = []
+    scheduler.start("s", [0.05, 60], on_advance=lambda session_id, step: advanced.append(step))
+    scheduler.stop("s")
+    time.sleep(0.15)
+    assert advanced == [] and scheduler.state("s") is None
+
+
+def test_app_leaves_the_scheduler_alone_until_guided_mode(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    import lbrp_engine
+
+    def fail():
+        raise AssertionError("scheduler started without guided mode")
+
+    monkeypatch.setattr(lbrp_engine, "get_scheduler", fail, raising=False)
+    at = AppTest.from_file("../lbrp_streamlit_app.py", default_timeout=60).run()
+    at.run()
+    assert not at.exception
+
+
+def test_wake_session_degrades_when_the_loop_is_gone(monkeypatch):
+    import lbrp_streamlit_app
+
+    def closed(*args):
+        raise RuntimeError("Event loop is closed")
+
+    session = SimpleNamespace(_event_loop=SimpleNamespace(call_soon_threadsafe=closed), request_rerun=None)
+    manager = SimpleNamespace(get_active_session_info=lambda session_id: SimpleNamespace(session=session))
+    runtime = SimpleNamespace(instance=lambda: SimpleNamespace(_session_mgr=manager))
+    monkeypatch.setattr(lbrp_streamlit_app, "Runtime", runtime)
+    lbrp_streamlit_app._wake_session("s", 1)  # the step is adopted on the next rerun instead
+    monkeypatch.setattr(lbrp_streamlit_app, "Runtime", None)
+    lbrp_streamlit_app._wake_session("s", 1)
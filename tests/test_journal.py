@@ -0,0 +1,57 @@
+"""Session journal writes, resume and writer failures"""
+import sqlite3
+
+import pytest
+
+from lbrp_engine import journal
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "journal.sqlite3")
+
+
+def test_resume_returns_last_cursor_and_snapshot(db_path):
+    store = journal.SessionJournal(db_path, flush_interval=0.01)
+    store.record("a", "navigate", "LBRP", 1)
+    store.record("a", "snapshot", "LBRP", 2, {"balance_seed": 5})
+    store.record("a", "navigate", "LIRP", 3)
+    store.record("b", "navigate", "LBRP", 9)
+    assert store.flush(5)
+    assert store.written == 4
+    assert store.resume("a") == {"ritual_type": "LIRP", "current_step": 3, "balance_seed": 5}
+    assert [event[1:] for event in store.history("a")] == [
+        ("navigate", "LBRP", 1), ("snapshot", "LBRP", 2), ("navigate", "LIRP", 3)
+    ]
+    assert store.resume("missing") is None
+    store.close()
+
+
+def test_failed_batches_are_dropped_and_the_writer_survives(db_path, monkeypatch):
+    monkeypatch.setattr(journal, "WRITE_ATTEMPTS", 2)
+    store = journal.SessionJournal(db_path, flush_interval=0.01)
+    connection = sqlite3.connect(db_path)
+    connection.execute("ALTER TABLE events RENAME TO hidden")
+    connection.commit()
+    store.record("a", "navigate", "LBRP", 1)
+    assert store.flush(5)
+    assert (store.written, store.dropped) == (0, 1)
+
+    connection.execute("ALTER TABLE hidden RENAME TO events")
+    connection.commit()
+    connection.close()
+    store.record("a", "navigate", "LBRP", 2)
+    assert store.flush(5)
+    assert store.written == 1
+    assert store.resume("a")["current_step"] == 2
+    store.close()
+
+
+def test_stopped_writer_fails_fast(db_path):
+    store = journal.SessionJournal(db_path, flush_interval=0.01)
+    store.close()
+    with pytest.raises(RuntimeError):
+        store.record("a", "navigate", "LBRP", 1)
+    with pytest.raises(RuntimeError):
+        store.flush(1)
+    store.close()  # closing twice is harmless
@@ -0,0 +1,36 @@
+"""Phase-level Markov chain: exact solution against Monte Carlo"""
+import pytest
+
+from lbrp_engine import markov
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_chain_rows_are_stochastic_and_cost_every_step():
+    chain = markov.get_ritual_chain("LBRP")
+    assert chain.transitions.sum(axis=1) == pytest.approx(1.0)
+    assert chain.costs.sum() == len(get_step_catalog("LBRP"))
+    with pytest.raises(ValueError):
+        markov.get_ritual_chain("LBRP", retry=1.0)
+
+
+def test_without_failures_the_whole_sequence_completes():
+    exact = markov.exact_statistics("LBRP", retry=0.0)
+    assert exact["completion_probability"] + exact["abandon_probability"] == pytest.approx(1.0)
+    product = 1.0
+    for phase in markov.get_ritual_chain("LBRP").phases:
+        product *= markov.PHASE_COMPLETION.get(phase, 1.0)
+    assert exact["completion_probability"] == pytest.approx(product)
+
+
+@pytest.mark.parametrize("ritual_type", ["LBRP", "LIRP"])
+def test_monte_carlo_matches_the_fundamental_matrix(ritual_type):
+    exact = markov.exact_statistics(ritual_type)
+    simulated = markov.monte_carlo(ritual_type, paths=200_000, seed=7, chunk_size=50_000)
+    assert simulated["completion_rate"] == pytest.approx(exact["completion_probability"], abs=0.005)
+    assert simulated["mean_steps"] == pytest.approx(exact["expected_steps"], rel=0.01)
+    assert simulated["mean_steps_completed"] == pytest.approx(exact["expected_steps_completed"], rel=0.01)
+    assert sum(simulated["steps_histogram"]) == simulated["paths"]
+
+
+def test_monte_carlo_is_reproducible_for_a_seed():
+    assert markov.monte_carlo("LBRP", paths=10_000, seed=3) == markov.monte_carlo("LBRP", paths=10_000, seed=3)
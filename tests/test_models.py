@@ -0,0 +1,32 @@
+"""Compact ritual steps and their referenced markup"""
+import pickle
+
+from lbrp_engine.models import RitualStep
+from lbrp_engine.rendering import resolve_html
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_generated_markup_is_referenced_not_embedded():
+    pentagram = next(step for step in get_step_catalog("LBRP") if step.phase == "Formulating Pentagrams")
+    assert isinstance(pentagram.html, tuple) and pentagram.html[0] == "pentagram"
+    assert "<svg" in pentagram.html_content
+    assert pentagram.html_content is resolve_html(pentagram.html)
+    assert pentagram.to_dict()["html_content"] == pentagram.html_content
+
+
+def test_literal_markup_and_defaults():
+    step = RitualStep("Phase", 1, "Title", "Text", html="<p>inline</p>", duration=5)
+    assert step.html_content == "<p>inline</p>"
+    assert step.duration == 5.0 and step.sephira is None
+    assert not hasattr(step, "__dict__")
+
+
+def test_steps_round_trip_through_pickle():
+    steps = get_step_catalog("LIRP")
+    assert pickle.loads(pickle.dumps(steps)) == steps
+
+
+def test_short_labels_are_shared():
+    steps = get_step_catalog("LBRP")
+    rebuilt = RitualStep("".join(list(steps[1].phase)), 1, "x", "y")
+    assert rebuilt.phase is steps[1].phase
@@ -0,0 +1,117 @@
+"""Session compaction, eviction and resumption"""
+import time
+
+import pytest
+
+from lbrp_engine.sessions import SessionPolicy, SessionRegistry, deep_sizeof
+
+POLICY = SessionPolicy(heavy_keys=("model",), cursor_keys=("step",), compact_after=10, evict_after=100)
+
+
+class _State(dict):
+    """A session state that can be held weakly"""
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def registry(clock):
+    return SessionRegistry(POLICY, sweep_interval=float("inf"), clock=clock)
+
+
+def test_idle_sessions_are_compacted_then_evicted(registry, clock):
+    state = _State(step=4, model=list(range(1000)), scratch="x" * 100)
+    registry.touch("a", state)
+    clock.now = 20
+    assert registry.sweep().compacted == 1
+    assert state == {"step": 4, "scratch": "x" * 100}
+    clock.now = 200
+    assert registry.sweep().evicted == 1
+    assert state == {"step": 4}
+    assert registry.footprints()[0].status == "evicted"
+    registry.touch("a", state)
+    assert registry.footprints()[0].status == "active"
+
+
+def test_widget_keys_survive_eviction_unless_unreadable(registry, clock):
+    class WidgetState(_State):
+        _key_id_mapping = {"toggle": "widget-id"}
+
+    class BrokenState(_State):
+        @property
+        def _key_id_mapping(self):
+            raise RuntimeError("internals changed")
+
+    widgets, broken = WidgetState(step=1, toggle=True, model=[1]), BrokenState(step=2, toggle=True)
+    registry.touch("widgets", widgets)
+    registry.touch("broken", broken)
+    clock.now = 200
+    assert registry.sweep().evicted == 2
+    assert widgets == {"step": 1, "toggle": True}
+    assert broken == {"step": 2}
+
+
+def test_sessions_mid_run_are_left_alone(registry, clock):
+    state = _State(step=1, model=[1])
+    with registry.running("a", state):
+        clock.now = 200
+        assert registry.sweep().evicted == 0
+        assert "model" in state
+    clock.now = 400
+    assert registry.sweep().evicted == 1
+
+
+def test_listeners_hear_of_evicted_and_released_sessions(registry, clock):
+    dropped = []
+    registry.add_listener("test", dropped.append)
+    registry.add_listener("test", dropped.append)  # replaced, not added twice
+    kept, closed = _State(step=1), _State(step=2)
+    registry.touch("kept", kept)
+    registry.touch("closed", closed)
+    del closed
+    clock.now = 200
+    report = registry.sweep()
+    assert (report.evicted, report.released) == (1, 1)
+    assert sorted(dropped) == ["closed", "kept"]
+    assert len(registry) == 1
+
+
+def test_accounting_counts_shared_objects_once():
+    shared = list(range(100))
+    assert deep_sizeof([shared, shared]) < 2 * deep_sizeof(shared)
+
+
+def test_evicted_app_session_resumes_its_cursor(monkeypatch):
+    """An evicted session comes back at its step, even with a stale navigator report"""
+    from streamlit.testing.v1 import AppTest
+
+    from lbrp_engine.sessions import get_session_registry
+    from lbrp_streamlit_app import SESSION_POLICY
+
+    at = AppTest.from_file("../lbrp_streamlit_app.py", default_timeout=60).run()
+    at.session_state["navigator_LBRP"] = {"token": "t", "seq": 1, "step": 3}
+    at.run()
+    assert at.session_state["current_step"] == 3
+    at.session_state["current_step"] = 7
+    at.run()
+
+    registry = get_session_registry(SESSION_POLICY)
+    monkeypatch.setattr(registry, "_clock", lambda: time.monotonic() + SESSION_POLICY.evict_after + 1)
+    assert registry.sweep().evicted >= 1
+    assert "balance_model" not in at.session_state
+    monkeypatch.undo()
+
+    at.run()
+    assert not at.exception
+    assert at.session_state["current_step"] == 7
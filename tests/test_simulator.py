@@ -0,0 +1,19 @@
+"""Shared step catalog and per-session simulator views"""
+from lbrp_engine.simulator import LBRPSimulator, get_step_catalog
+
+
+def test_sessions_share_one_catalog():
+    first, second = LBRPSimulator("LBRP"), LBRPSimulator("LBRP")
+    assert first.steps is second.steps is get_step_catalog("LBRP")
+    assert isinstance(first.steps, tuple)
+
+
+def test_catalog_is_numbered_per_phase():
+    steps = get_step_catalog("LBRP")
+    assert steps[0].phase == "Preparation" and steps[0].number == 1
+    assert [step.phase for step in steps][-1] == "Closing Cross"
+
+
+def test_ritual_types_have_their_own_catalog():
+    assert LBRPSimulator("LIRP").steps is not LBRPSimulator("LBRP").steps
+    assert len(LBRPSimulator("LIRP").steps) == len(get_step_catalog("LBRP"))
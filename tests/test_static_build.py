@@ -0,0 +1,46 @@
+"""Static site bundle"""
+import json
+import os
+import re
+
+import pytest
+
+from lbrp_engine.generators import TREE_OF_LIFE_HTML
+from lbrp_engine.simulator import get_step_catalog
+from lbrp_engine.static_build import build_static_site
+
+_PRE = re.compile(r"<pre\b.*?</pre>", re.DOTALL)
+
+
+@pytest.fixture(scope="module")
+def site(tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp("site")
+    return str(output_dir), build_static_site(str(output_dir), ["LBRP"])
+
+
+def _read(output_dir: str, name: str) -> str:
+    with open(os.path.join(output_dir, name), encoding="utf-8") as fp:
+        return fp.read()
+
+
+def test_manifest_lists_hashed_assets(site):
+    output_dir, report = site
+    with open(os.path.join(output_dir, "manifest.json"), encoding="utf-8") as fp:
+        manifest = json.load(fp)
+    assert manifest["assets"] == report["assets"]
+    for logical, path in manifest["assets"].items():
+        assert re.fullmatch(r"assets/\w+\.[0-9a-f]{12}\.\w+", path)
+        assert os.path.exists(os.path.join(output_dir, path))
+        assert path in _read(output_dir, "lbrp.html")
+
+
+def test_every_step_is_prerendered(site):
+    page = _read(site[0], "lbrp.html")
+    for step in get_step_catalog("LBRP"):
+        assert step.title.split(" (")[0].replace("&", "&amp;") in page
+
+
+def test_tree_of_life_layout_is_intact(site):
+    expected = _PRE.findall(TREE_OF_LIFE_HTML)
+    assert expected and "\n" in expected[0]
+    assert _PRE.findall(_read(site[0], "lbrp.html")) == expected
@@ -0,0 +1,45 @@
+"""Tree of Life highlights and the cached per-highlight figures"""
+import json
+
+from lbrp_engine import tree_of_life
+from lbrp_engine.simulator import get_step_catalog
+
+
+def test_routes_follow_the_shortest_path():
+    assert tree_of_life.route("Keter", "Chokmah") == (("Keter", "Chokmah"),)
+    assert tree_of_life.route("Keter", "Malkuth") == (
+        ("Keter", "Tiferet"), ("Tiferet", "Yesod"), ("Yesod", "Malkuth")
+    )
+    assert tree_of_life.route("Malkuth", "Keter") == tuple(reversed(tree_of_life.route("Keter", "Malkuth")))
+
+
+def test_highlights_accumulate_traversed_paths():
+    steps = get_step_catalog("LBRP")
+    highlights = tree_of_life.get_tree_highlights("LBRP")
+    assert len(highlights) == len(steps)
+    assert highlights[0] == tree_of_life.TreeHighlight(None, frozenset())  # preparation has no sephira
+    assert highlights[1].sephira == "Keter" and highlights[2].sephira == "Malkuth"
+    assert highlights[2].paths == frozenset(tree_of_life.route("Keter", "Malkuth"))
+    for before, after in zip(highlights, highlights[1:]):
+        assert before.paths <= after.paths
+    # Archangels stand at their quarter's sephira (Raphael in the East, with YHVH at Keter)
+    raphael = next(step for step in steps if step.vibration == "Raphael")
+    assert tree_of_life.step_sephira(raphael) == "Keter"
+
+
+def test_figures_are_shared_and_leave_the_base_untouched():
+    base = tree_of_life.get_base_figure_json()
+    figure = tree_of_life.get_tree_figure("LBRP", 2)
+    assert tree_of_life.get_tree_figure("LBRP", 2) is figure
+    current = figure.data[tree_of_life.CURRENT_TRACE]
+    assert (list(current.x), list(current.y)) == ([0.0], [0.0])  # Malkuth
+    traversed = figure.data[tree_of_life.TRAVERSED_TRACE]
+    assert sum(x is None for x in traversed.x) == 3  # one segment per path
+    assert tree_of_life.get_base_figure_json() == base
+    assert json.loads(base)["data"][tree_of_life.CURRENT_TRACE]["x"] == []
+
+
+def test_steps_are_clamped():
+    last = len(get_step_catalog("LBRP")) - 1
+    assert tree_of_life.get_tree_figure("LBRP", 999) is tree_of_life.get_tree_figure("LBRP", last)
+    assert tree_of_life.get_tree_figure("LBRP", -3) is tree_of_life.get_tree_figure("LBRP", 0)